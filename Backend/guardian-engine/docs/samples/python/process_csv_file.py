@@ -12,6 +12,9 @@ This example shows how to use the Presidio Analyzer and Anonymizer
 to detect and anonymize PII in a CSV file.
 It uses the BatchAnalyzerEngine to analyze the CSV file, and 
 BatchAnonymizerEngine to anonymize the requested columns.
+It loads the whole file in memory; to redact large CSV, JSONL or Parquet files
+in bounded batches, with checkpoints to resume from, use:
+python -m guardian_analyzer.batch_file_redactor input.csv output.csv
 
 Content of csv file:
 id,name,city,comments
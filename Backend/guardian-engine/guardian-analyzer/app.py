@@ -2,8 +2,11 @@
 
 import json
 import logging
+import multiprocessing
 import os
+import tempfile
 import time
+from contextlib import contextmanager
 from logging.config import fileConfig
 from pathlib import Path
 from typing import Tuple
@@ -12,19 +15,23 @@ import numpy as np
 from flask import Flask, Response, jsonify, request, send_file
 from flask_cors import CORS
 from guardian_analyzer import AnalyzerEngine, AnalyzerEngineProvider, AnalyzerRequest
+from guardian_analyzer.nlp_engine import MicroBatchingNlpEngine
 from werkzeug.exceptions import HTTPException
 
 from werkzeug.utils import secure_filename
 
-from new_pdf_redactor import GuardianPDFRedactor
+from new_pdf_redactor import GuardianPDFRedactor, open_pdf
 
 # from adv_pdf_redactor import AdvancedPDFRedactor
 from image_redactor import PresidioImageRedactor
 
-import fitz
 
 PORT = "3000"
 
+# Uploads and outputs up to this size are kept in memory, larger ones
+# are spilled to a temporary file private to the request
+IN_MEMORY_FILE_LIMIT = 20 * 1024 * 1024
+
 LOGGING_CONF_FILE = "logging.ini"
 
 WELCOME_MESSAGE = r"""
@@ -41,6 +48,7 @@ class Server:
     """HTTP Server for calling Presidio Analyzer."""
 
     def __init__(self):
+        start_time = time.perf_counter()
         fileConfig(Path(Path(__file__).parent, LOGGING_CONF_FILE))
         self.logger = logging.getLogger("guardian-analyzer")
         self.logger.setLevel(os.environ.get("LOG_LEVEL", self.logger.level))
@@ -53,18 +61,53 @@ class Server:
         analyzer_conf_file = os.environ.get("ANALYZER_CONF_FILE")
         nlp_engine_conf_file = os.environ.get("NLP_CONF_FILE")
         recognizer_registry_conf_file = os.environ.get("RECOGNIZER_REGISTRY_CONF_FILE")
+        recognizer_registry_snapshot_file = os.environ.get(
+            "RECOGNIZER_REGISTRY_SNAPSHOT_FILE"
+        )
 
         self.logger.info("Starting analyzer engine")
-        self.engine: AnalyzerEngine = AnalyzerEngineProvider(
+        engine_provider = AnalyzerEngineProvider(
             analyzer_engine_conf_file=analyzer_conf_file,
             nlp_engine_conf_file=nlp_engine_conf_file,
             recognizer_registry_conf_file=recognizer_registry_conf_file,
-        ).create_engine()
-        self.pdf_redactor = GuardianPDFRedactor(analyzer_engine=self.engine)
+            recognizer_registry_snapshot_file=recognizer_registry_snapshot_file,
+        )
+        self.engine: AnalyzerEngine = engine_provider.create_engine()
+        # PDF page workers are forked with the engine loaded where possible,
+        # else they load their own
+        pdf_engine_provider = (
+            None
+            if "fork" in multiprocessing.get_all_start_methods()
+            else engine_provider
+        )
+        self.pdf_redactor = GuardianPDFRedactor(
+            analyzer_engine=self.engine,
+            n_process=int(os.environ.get("PDF_REDACTION_PROCESSES", 1)),
+            pages_per_chunk=int(os.environ.get("PDF_PAGES_PER_CHUNK", 25)),
+            analyzer_engine_provider=pdf_engine_provider,
+        )
+
+        # Batch the NLP processing of concurrent requests together
+        analyze_batch_size = int(os.environ.get("ANALYZE_BATCH_SIZE", 1))
+        if analyze_batch_size > 1:
+            self.engine.nlp_engine = MicroBatchingNlpEngine(
+                self.engine.nlp_engine,
+                max_batch_size=analyze_batch_size,
+                max_wait_ms=float(os.environ.get("ANALYZE_BATCH_WAIT_MS", 5)),
+            )
+
+        self.analyze_chunk_size = int(os.environ.get("ANALYZE_CHUNK_SIZE", 100000))
+        self.analyze_chunk_overlap = int(os.environ.get("ANALYZE_CHUNK_OVERLAP", 200))
+        self.in_memory_file_limit = int(
+            os.environ.get("IN_MEMORY_FILE_LIMIT", IN_MEMORY_FILE_LIMIT)
+        )
         # self.pdf_redactor = AdvancedPDFRedactor()
         print(WELCOME_MESSAGE)
 
         self.image_redactor = PresidioImageRedactor()
+        self.logger.info(
+            f"Analyzer server started in {time.perf_counter() - start_time:.2f}s"
+        )
 
         @self.app.route("/health")
         def health() -> str:
@@ -259,48 +302,35 @@ class Server:
                 additional_keywords = request.form.getlist("additional_keywords")
                 custom_regex = request.form.getlist("custom_regex")
 
-                # Create unique filenames
-                timestamp = int(time.time())
                 input_filename = secure_filename(file.filename)
-                input_path = os.path.join("temp/input", f"{timestamp}_{input_filename}")
-                output_filename = f"redacted_{timestamp}_{input_filename}"
-                output_path = os.path.join("temp/output", output_filename)
-
-                # Save uploaded file
-                file.save(input_path)
+                output_filename = f"redacted_{input_filename}"
+                output = self._output_file()
 
                 try:
-                    # Process the PDF
-                    result = self.pdf_redactor.redact_pdf(
-                        pdf_path=input_path,
-                        output_path=output_path,
-                        language=language,
-                        additional_keywords=additional_keywords,
-                        custom_regex=custom_regex,
-                        entities=entities,
-                        redaction_style=redaction_style,
-                    )
-
-                    self.logger.info(f"Redaction completed: {result}")
-
-                    # Return the redacted PDF
-                    return send_file(
-                        output_path,
-                        as_attachment=True,
-                        download_name=output_filename,
-                        mimetype="application/pdf",
-                    )
+                    with self._upload_source(file) as pdf_source:
+                        # Process the PDF
+                        result = self.pdf_redactor.redact_pdf(
+                            pdf_path=pdf_source,
+                            output_path=output,
+                            language=language,
+                            additional_keywords=additional_keywords,
+                            custom_regex=custom_regex,
+                            entities=entities,
+                            redaction_style=redaction_style,
+                        )
+                except Exception:
+                    output.close()
+                    raise
+
+                self.logger.info(
+                    f"Redaction completed: {len(result['detected_entities'])} "
+                    f"entities detected"
+                )
 
-                finally:
-                    # Cleanup temporary files
-                    try:
-                        if os.path.exists(input_path):
-                            os.remove(input_path)
-                        if os.path.exists(output_path):
-                            # Only remove after sending file
-                            pass
-                    except Exception as e:
-                        self.logger.warning(f"Error cleaning up temporary files: {e}")
+                # Stream the redacted PDF back
+                return self._send_output(
+                    output, download_name=output_filename, mimetype="application/pdf"
+                )
 
             except Exception as e:
                 print(f"Error processing PDF: {e}")
@@ -326,45 +356,26 @@ class Server:
                 # Optional owner password
                 owner_password = request.form.get("owner_password")
 
-                # Create unique filenames
-                timestamp = int(time.time())
                 input_filename = secure_filename(file.filename)
-                input_path = os.path.join("temp/input", f"{timestamp}_{input_filename}")
                 output_filename = f"encrypted_{input_filename}"
-                output_path = os.path.join(
-                    "temp/output", f"encrypted_{timestamp}_{input_filename}"
-                )
-
-                # Save uploaded file
-                os.makedirs(os.path.dirname(input_path), exist_ok=True)
-                file.save(input_path)
+                output = self._output_file()
 
                 try:
-                    # Encrypt the PDF
-                    result = self.pdf_redactor.encrypt_pdf(
-                        input_path=input_path,
-                        output_path=output_path,
-                        password=password,
-                        owner_password=owner_password,
-                    )
-
-                    return send_file(
-                        output_path,
-                        as_attachment=True,
-                        download_name=output_filename,
-                        mimetype="application/pdf",
-                    )
-
-                finally:
-                    # Cleanup temporary files
-                    try:
-                        if os.path.exists(input_path):
-                            os.remove(input_path)
-                        if os.path.exists(output_path):
-                            # Only remove after sending file
-                            pass
-                    except Exception as e:
-                        print(f"Error cleaning up temporary files: {e}")
+                    with self._upload_source(file) as pdf_source:
+                        # Encrypt the PDF
+                        self.pdf_redactor.encrypt_pdf(
+                            input_path=pdf_source,
+                            output_path=output,
+                            password=password,
+                            owner_password=owner_password,
+                        )
+                except Exception:
+                    output.close()
+                    raise
+
+                return self._send_output(
+                    output, download_name=output_filename, mimetype="application/pdf"
+                )
 
             except Exception as e:
                 print(f"Error encrypting PDF: {e}")
@@ -458,47 +469,33 @@ class Server:
                 except json.JSONDecodeError:
                     return jsonify({"error": "Invalid entities JSON"}), 400
 
-                # Create unique filenames
-                timestamp = int(time.time())
                 input_filename = secure_filename(file.filename)
-                input_path = os.path.join("temp/input", f"{timestamp}_{input_filename}")
-                output_filename = f"redacted_{timestamp}_{input_filename}"
-                output_path = os.path.join("temp/output", output_filename)
-
-                # Ensure directories exist
-                os.makedirs(os.path.dirname(input_path), exist_ok=True)
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-                # Save uploaded file
-                file.save(input_path)
+                output_filename = f"redacted_{input_filename}"
+                image_format = output_filename.split(".")[-1].lower()
+                # PIL names the JPEG format "jpeg" only
+                pil_format = "jpeg" if image_format == "jpg" else image_format
+                output = self._output_file()
 
                 try:
-                    # Process the image
-                    result = self.image_redactor.redact_image(
-                        image_path=input_path,
-                        output_path=output_path,
-                        language=language,
-                        entities=entities,
-                    )
-
-                    # Return the redacted image
-                    return send_file(
-                        output_path,
-                        as_attachment=True,
-                        download_name=output_filename,
-                        mimetype=f"image/{output_filename.split('.')[-1].lower()}",
-                    )
-
-                finally:
-                    # Cleanup temporary files
-                    try:
-                        if os.path.exists(input_path):
-                            os.remove(input_path)
-                        if os.path.exists(output_path):
-                            # Only remove after sending file
-                            pass
-                    except Exception as e:
-                        self.logger.warning(f"Error cleaning up temporary files: {e}")
+                    with self._upload_source(file) as image_source:
+                        # Process the image
+                        self.image_redactor.redact_image(
+                            image_path=image_source,
+                            output_path=output,
+                            language=language,
+                            entities=entities,
+                            image_format=pil_format,
+                        )
+                except Exception:
+                    output.close()
+                    raise
+
+                # Stream the redacted image back
+                return self._send_output(
+                    output,
+                    download_name=output_filename,
+                    mimetype=f"image/{image_format}",
+                )
 
             except Exception as e:
                 self.logger.error(f"Error processing image: {e}")
@@ -527,63 +524,49 @@ class Server:
                 except json.JSONDecodeError:
                     return jsonify({"error": "Invalid entities JSON"}), 400
 
-                # Create temporary file
-                timestamp = int(time.time())
-                input_filename = secure_filename(file.filename)
-                input_path = os.path.join("temp/input", f"{timestamp}_{input_filename}")
-
-                # Save uploaded file
-                os.makedirs(os.path.dirname(input_path), exist_ok=True)
-                file.save(input_path)
-
-                try:
-                    # Extract text from PDF
-                    doc = fitz.open(input_path)
-                    full_text = ""
-                    for page_num in range(len(doc)):
-                        page = doc[page_num]
-                        full_text += page.get_text() + "\n"
+                # Extract text from PDF
+                with self._upload_source(file) as pdf_source:
+                    doc = open_pdf(pdf_source)
+                    page_texts = [page.get_text() + "\n" for page in doc]
                     doc.close()
-
-                    # Analyze the extracted text
-                    analyzer_results = self.engine.analyze(
-                        text=full_text,
+                full_text = "".join(page_texts)
+
+                # Analyze the extracted text a chunk at a time, so the NLP
+                # engine never holds the whole document
+                analyzer_results = [
+                    result
+                    for chunk_results in self.engine.analyze_chunked(
+                        text=page_texts,
                         language=language,
                         entities=entities,
+                        chunk_size=self.analyze_chunk_size,
+                        chunk_overlap=self.analyze_chunk_overlap,
                     )
+                    for result in chunk_results
+                ]
 
-                    # Format results similar to /analyze endpoint
-                    pii_entities = [
-                        {
-                            "entity_type": entity.entity_type,
-                            "text_snippet": full_text[entity.start : entity.end],
-                            "score": entity.score,
-                            "start": entity.start,
-                            "end": entity.end,
-                        }
-                        for entity in analyzer_results
-                    ]
-
-                    return Response(
-                        json.dumps(
-                            pii_entities,
-                            default=lambda o: (
-                                float(o)
-                                if isinstance(o, (np.float32, np.float64))
-                                else o
-                            ),
-                            sort_keys=True,
-                        ),
-                        content_type="application/json",
-                    )
+                # Format results similar to /analyze endpoint
+                pii_entities = [
+                    {
+                        "entity_type": entity.entity_type,
+                        "text_snippet": full_text[entity.start : entity.end],
+                        "score": entity.score,
+                        "start": entity.start,
+                        "end": entity.end,
+                    }
+                    for entity in analyzer_results
+                ]
 
-                finally:
-                    # Cleanup temporary files
-                    try:
-                        if os.path.exists(input_path):
-                            os.remove(input_path)
-                    except Exception as e:
-                        self.logger.warning(f"Error cleaning up temporary files: {e}")
+                return Response(
+                    json.dumps(
+                        pii_entities,
+                        default=lambda o: (
+                            float(o) if isinstance(o, (np.float32, np.float64)) else o
+                        ),
+                        sort_keys=True,
+                    ),
+                    content_type="application/json",
+                )
 
             except Exception as e:
                 self.logger.error(f"Error analyzing PDF: {e}")
@@ -615,47 +598,27 @@ class Server:
                 if redaction_style not in ["blackbox", "label"]:
                     return jsonify({"error": "Invalid redaction style"}), 400
 
-                # Create unique filenames
-                timestamp = int(time.time())
                 input_filename = secure_filename(file.filename)
-                input_path = os.path.join("temp/input", f"{timestamp}_{input_filename}")
-                output_filename = f"redacted_{timestamp}_{input_filename}"
-                output_path = os.path.join("temp/output", output_filename)
-
-                # Ensure directories exist
-                os.makedirs(os.path.dirname(input_path), exist_ok=True)
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-                # Save uploaded file
-                file.save(input_path)
+                output_filename = f"redacted_{input_filename}"
+                output = self._output_file()
 
                 try:
-                    # Process the PDF with only string redaction
-                    result = self.pdf_redactor.redact_strings_only(
-                        pdf_path=input_path,
-                        output_path=output_path,
-                        strings_to_redact=strings_to_redact,
-                        redaction_style=redaction_style,
-                    )
-
-                    # Return the redacted PDF file
-                    return send_file(
-                        output_path,
-                        as_attachment=True,
-                        download_name=output_filename,
-                        mimetype="application/pdf",
-                    )
-
-                finally:
-                    # Cleanup temporary files
-                    try:
-                        if os.path.exists(input_path):
-                            os.remove(input_path)
-                        if os.path.exists(output_path):
-                            # Only remove after sending file
-                            pass
-                    except Exception as e:
-                        self.logger.warning(f"Error cleaning up temporary files: {e}")
+                    with self._upload_source(file) as pdf_source:
+                        # Process the PDF with only string redaction
+                        self.pdf_redactor.redact_strings_only(
+                            pdf_path=pdf_source,
+                            output_path=output,
+                            strings_to_redact=strings_to_redact,
+                            redaction_style=redaction_style,
+                        )
+                except Exception:
+                    output.close()
+                    raise
+
+                # Stream the redacted PDF back
+                return self._send_output(
+                    output, download_name=output_filename, mimetype="application/pdf"
+                )
 
             except Exception as e:
                 self.logger.error(f"Error redacting strings from PDF: {e}")
@@ -679,28 +642,26 @@ class Server:
                 if expiry_date:
                     expiry_datetime = datetime.fromisoformat(expiry_date)
 
-                # Create temporary file
-                timestamp = int(time.time())
                 input_filename = secure_filename(file.filename)
-                input_path = os.path.join("temp/input", f"{timestamp}_{input_filename}")
-                output_path = os.path.join("temp/output", f"drm_{timestamp}_{input_filename}")
-
-                os.makedirs(os.path.dirname(input_path), exist_ok=True)
-                file.save(input_path)
-
-                # Create DRM PDF
-                result = self.drm_manager.create_drm_pdf(
-                    input_path=input_path,
-                    output_path=output_path,
-                    owner_id=owner_id,
-                    expiry_date=expiry_datetime
-                )
+                output = self._output_file()
 
-                return send_file(
-                    result['output_path'],
-                    as_attachment=True,
+                try:
+                    with self._upload_source(file) as pdf_source:
+                        # Create DRM PDF
+                        self.drm_manager.create_drm_pdf(
+                            input_path=pdf_source,
+                            output_path=output,
+                            owner_id=owner_id,
+                            expiry_date=expiry_datetime,
+                        )
+                except Exception:
+                    output.close()
+                    raise
+
+                return self._send_output(
+                    output,
                     download_name=f"drm_{input_filename}",
-                    mimetype="application/drmpdf"
+                    mimetype="application/drmpdf",
                 )
 
             except Exception as e:
@@ -755,8 +716,61 @@ class Server:
         def http_exception(e):
             return jsonify(error=e.description), e.code
 
+    def start(self) -> None:
+        """
+        Start the worker processes of the server, before serving requests.
+
+        Workers are forked, so this is called while no other thread is running.
+        """
+        self.pdf_redactor.start()
+
+    def close(self) -> None:
+        """Stop the worker processes of the server."""
+        self.pdf_redactor.close()
+
+    @contextmanager
+    def _upload_source(self, file):
+        """
+        Yield an uploaded file as bytes, or as a path when it is too big for memory.
+
+        Uploads larger than the in-memory limit are written to a temporary file
+        private to the request, removed once the block exits.
+        """
+        file.stream.seek(0, os.SEEK_END)
+        size = file.stream.tell()
+        file.stream.seek(0)
+
+        if size <= self.in_memory_file_limit:
+            yield file.read()
+            return
+
+        _, extension = os.path.splitext(secure_filename(file.filename))
+        fd, path = tempfile.mkstemp(suffix=extension)
+        try:
+            with os.fdopen(fd, "wb") as temp_file:
+                file.save(temp_file)
+            yield path
+        finally:
+            os.remove(path)
+
+    def _output_file(self) -> tempfile.SpooledTemporaryFile:
+        """Return a buffer for a generated file, spilling to disk above the limit."""
+        return tempfile.SpooledTemporaryFile(max_size=self.in_memory_file_limit)
+
+    @staticmethod
+    def _send_output(output, download_name: str, mimetype: str) -> Response:
+        """Stream a generated file back in chunks, closing it once sent."""
+        output.seek(0)
+        return send_file(
+            output,
+            as_attachment=True,
+            download_name=download_name,
+            mimetype=mimetype,
+        )
+
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", PORT))
     server = Server()
+    server.start()
     server.app.run(host="0.0.0.0", port=port, debug=True)
@@ -0,0 +1,135 @@
+"""ASGI entry point for the analyzer REST API.
+
+Serves the routes of the Flask app in app.py with bounded concurrency:
+requests run in fixed size thread pools, one for the file endpoints
+(PDF and image processing) and one for everything else, so a slow document
+can't hold up /analyze calls. Once a pool's workers are busy and its queue
+is full, requests are rejected with HTTP 429.
+
+Run with: uvicorn asgi:app --host 0.0.0.0 --port 3000 --workers 2
+"""
+
+import json
+import logging
+import os
+from typing import Optional
+
+from a2wsgi import WSGIMiddleware
+
+from app import Server
+
+logger = logging.getLogger("guardian-analyzer")
+
+# Endpoints doing heavy file processing, served by their own pool
+FILE_ROUTES = frozenset(
+    (
+        "/analyze-pdf",
+        "/redact-pdf",
+        "/encrypt-pdf",
+        "/redact-image",
+        "/redact-from-strings",
+        "/create-drm-pdf",
+    )
+)
+
+
+class BoundedWorkerPool:
+    """
+    Run a WSGI app in a fixed size thread pool, rejecting requests beyond a limit.
+
+    :param wsgi_app: The WSGI app to serve
+    :param workers: Number of threads handling requests concurrently
+    :param max_queued: Number of requests waiting for a free worker,
+    past which new requests get an HTTP 429 response
+    """
+
+    def __init__(self, wsgi_app, workers: int, max_queued: int):
+        self.app = WSGIMiddleware(wsgi_app, workers=workers)
+        self.workers = workers
+        self.max_queued = max_queued
+        self.active = 0
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Serve a request in the pool, or reject it if the pool is full."""
+        if self.active >= self.workers + self.max_queued:
+            logger.warning(f"Rejecting request to {scope['path']}, server is busy")
+            await self._send_too_many_requests(send)
+            return
+
+        self.active += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.active -= 1
+
+    @staticmethod
+    async def _send_too_many_requests(send) -> None:
+        body = json.dumps({"error": "Too many requests, try again later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", b"1"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+class GuardianAsgiApp:
+    """
+    ASGI app dispatching requests to the worker pool of their route.
+
+    :param server: The Server holding the Flask app, created if not provided
+    :param analyze_workers: Threads serving /analyze and the other light routes
+    :param file_workers: Threads serving the file processing routes
+    :param max_queued: Requests allowed to wait for a worker, per pool
+    """
+
+    def __init__(
+        self,
+        server: Optional[Server] = None,
+        analyze_workers: int = 8,
+        file_workers: int = 2,
+        max_queued: int = 32,
+    ):
+        self.server = server if server else Server()
+        self.analyze_pool = BoundedWorkerPool(
+            self.server.app, workers=analyze_workers, max_queued=max_queued
+        )
+        self.file_pool = BoundedWorkerPool(
+            self.server.app, workers=file_workers, max_queued=max_queued
+        )
+
+    async def __call__(self, scope, receive, send) -> None:
+        """Dispatch a request to the worker pool of its route."""
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if scope["path"] in FILE_ROUTES:
+            await self.file_pool(scope, receive, send)
+        else:
+            await self.analyze_pool(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Before any request thread exists, as the server forks workers
+                self.server.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.server.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+app = GuardianAsgiApp(
+    analyze_workers=int(os.environ.get("ANALYZE_WORKERS", 8)),
+    file_workers=int(os.environ.get("FILE_WORKERS", 2)),
+    max_queued=int(os.environ.get("MAX_QUEUED_REQUESTS", 32)),
+)
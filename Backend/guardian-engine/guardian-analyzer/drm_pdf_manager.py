@@ -4,7 +4,7 @@ import os
 import uuid
 import requests
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import BinaryIO, Dict, Any, Optional, Union
 from cryptography.fernet import Fernet
 import logging
 
@@ -19,8 +19,8 @@ class DRMPDFManager:
         
     def create_drm_pdf(
         self,
-        input_path: str,
-        output_path: str,
+        input_path: Union[str, bytes],
+        output_path: Union[str, BinaryIO],
         owner_id: str,
         expiry_date: Optional[datetime] = None,
     ) -> Dict[str, Any]:
@@ -46,7 +46,10 @@ class DRMPDFManager:
             """
             
             # Open and modify the PDF
-            doc = fitz.open(input_path)
+            if isinstance(input_path, bytes):
+                doc = fitz.open(stream=input_path, filetype="pdf")
+            else:
+                doc = fitz.open(input_path)
             
             # Add JavaScript to be executed when document opens
             doc.js_onCreate = verify_script
@@ -55,13 +58,16 @@ class DRMPDFManager:
             doc.js_onIdle = verify_script
             
             # Encrypt the document with standard protection
-            doc.save(
-                output_path,
+            save_options = dict(
                 encryption=fitz.PDF_ENCRYPT_AES_256,
                 owner_pw=self.key.decode(),  # Owner password
                 user_pw="",                  # Empty user password for automatic checks
                 permissions=fitz.PDF_PERM_ACCESSIBILITY  # Minimal permissions
             )
+            if isinstance(output_path, str):
+                doc.save(output_path, **save_options)
+            else:
+                output_path.write(doc.tobytes(**save_options))
             
             # Store DRM metadata in our system
             drm_metadata = {
@@ -9,9 +9,13 @@ from guardian_analyzer.dict_analyzer_result import DictAnalyzerResult
 from guardian_analyzer.entity_recognizer import EntityRecognizer
 from guardian_analyzer.local_recognizer import LocalRecognizer
 from guardian_analyzer.pattern import Pattern
+from guardian_analyzer.pattern_prefilter import PatternPrefilter
 from guardian_analyzer.pattern_recognizer import PatternRecognizer
 from guardian_analyzer.remote_recognizer import RemoteRecognizer
+from guardian_analyzer.fused_pattern_matcher import FusedPatternMatcher
+from guardian_analyzer.text_chunker import TextChunker
 from guardian_analyzer.recognizer_registry import RecognizerRegistry
+from guardian_analyzer.analyzer_result_cache import AnalyzerResultCache
 from guardian_analyzer.analyzer_engine import AnalyzerEngine
 from guardian_analyzer.batch_analyzer_engine import BatchAnalyzerEngine
 from guardian_analyzer.analyzer_request import AnalyzerRequest
@@ -38,6 +42,7 @@ decision_process_logger.addHandler(ch)
 decision_process_logger.setLevel("INFO")
 __all__ = [
     "Pattern",
+    "PatternPrefilter",
     "AnalysisExplanation",
     "RecognizerResult",
     "DictAnalyzerResult",
@@ -45,7 +50,10 @@ __all__ = [
     "LocalRecognizer",
     "PatternRecognizer",
     "RemoteRecognizer",
+    "FusedPatternMatcher",
+    "TextChunker",
     "RecognizerRegistry",
+    "AnalyzerResultCache",
     "AnalyzerEngine",
     "AnalyzerRequest",
     "ContextAwareEnhancer",
@@ -1,13 +1,20 @@
+import concurrent.futures
 import json
 import logging
+import os
+import threading
 from collections import Counter
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Union
 
 import regex as re
 
 from guardian_analyzer import (
+    AnalyzerResultCache,
     EntityRecognizer,
+    FusedPatternMatcher,
+    PatternRecognizer,
     RecognizerResult,
+    TextChunker,
 )
 from guardian_analyzer.app_tracer import AppTracer
 from guardian_analyzer.context_aware_enhancers import (
@@ -43,6 +50,18 @@ class AnalyzerEngine:
     :param context_aware_enhancer: instance of type ContextAwareEnhancer for enhancing
     confidence score based on context words, (LemmaContextAwareEnhancer will be created
     by default if None passed)
+    :param fused_pattern_matching: Whether to match the patterns of all
+    PatternRecognizers together, running each distinct regex once per text
+    instead of once per recognizer. Results are identical either way.
+    :param result_cache: instance of type AnalyzerResultCache, used to return
+    the results of previously analyzed texts without running the NLP engine and
+    recognizers again. Requests with ad hoc recognizers or precomputed
+    nlp artifacts are never cached.
+    :param n_threads: Number of threads running the recognizers of a text
+    in parallel, on a thread pool shared by all calls. Regex matching releases
+    the GIL meanwhile, so a single large text uses several cores.
+    Results are identical to running the recognizers one after the other.
+    Custom recognizers have to be thread safe, as the predefined ones are.
     """
 
     def __init__(
@@ -54,6 +73,9 @@ class AnalyzerEngine:
         default_score_threshold: float = 0,
         supported_languages: List[str] = None,
         context_aware_enhancer: Optional[ContextAwareEnhancer] = None,
+        fused_pattern_matching: bool = False,
+        result_cache: Optional[AnalyzerResultCache] = None,
+        n_threads: int = 1,
     ):
         if not supported_languages:
             supported_languages = ["en"]
@@ -110,6 +132,17 @@ class AnalyzerEngine:
 
         self.context_aware_enhancer = context_aware_enhancer
 
+        self.pattern_matcher = (
+            FusedPatternMatcher() if fused_pattern_matching else None
+        )
+
+        self.result_cache = result_cache
+
+        self.n_threads = n_threads
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+
     def get_recognizers(self, language: Optional[str] = None) -> List[EntityRecognizer]:
         """
         Return a list of PII recognizers currently loaded.
@@ -138,12 +171,12 @@ class AnalyzerEngine:
         :param language: Return only entities supported in a specific language.
         :return: List of entity names
         """
-        recognizers = self.get_recognizers(language=language)
-        supported_entities = []
-        for recognizer in recognizers:
-            supported_entities.extend(recognizer.get_supported_entities())
+        if not language:
+            languages = self.supported_languages
+        else:
+            languages = [language]
 
-        return list(set(supported_entities))
+        return self.registry.get_supported_entities(languages=languages)
 
     def analyze(
         self,
@@ -199,6 +232,30 @@ class AnalyzerEngine:
         [type: PHONE_NUMBER, start: 19, end: 31, score: 0.85]
         """  # noqa: E501
 
+        cache_key = None
+        if (
+            self.result_cache is not None
+            and not ad_hoc_recognizers
+            and not nlp_artifacts
+        ):
+            cache_key = self.result_cache.get_key(
+                text,
+                language,
+                tuple(entities) if entities else None,
+                score_threshold
+                if score_threshold is not None
+                else self.default_score_threshold,
+                return_decision_process,
+                tuple(context) if context else None,
+                tuple(allow_list) if allow_list else None,
+                allow_list_match,
+                regex_flags,
+                self.registry.version,
+            )
+            cached_results = self.result_cache.get(cache_key)
+            if cached_results is not None:
+                return cached_results
+
         all_fields = not entities
 
         recognizers = self.registry.get_recognizers(
@@ -214,32 +271,75 @@ class AnalyzerEngine:
             entities = self.get_supported_entities(language=language)
 
         # run the nlp pipeline over the given text, store the results in
-        # a NlpArtifacts instance
+        # a NlpArtifacts instance. Only the pipeline parts the recognizers
+        # need are run, none if they only match patterns
+        nlp_artifacts_produced = None
         if not nlp_artifacts:
-            nlp_artifacts = self.nlp_engine.process_text(text, language)
+            nlp_artifacts_produced = self._get_nlp_artifacts_needed(recognizers)
+            nlp_artifacts = self._process_text(
+                text, language, nlp_artifacts_produced
+            )
 
         if self.log_decision_process:
             self.app_tracer.trace(
                 correlation_id, "nlp artifacts:" + nlp_artifacts.to_json()
             )
 
-        results = []
+        # Lazy loading of the relevant recognizers
         for recognizer in recognizers:
-            # Lazy loading of the relevant recognizers
             if not recognizer.is_loaded:
                 recognizer.load()
                 recognizer.is_loaded = True
 
-            # analyze using the current recognizer and append the results
-            current_results = recognizer.analyze(
-                text=text, entities=entities, nlp_artifacts=nlp_artifacts
+        executor = self._get_executor() if self.n_threads > 1 else None
+        results = []
+        fused_results = (
+            self.pattern_matcher.analyze(
+                text=text, recognizers=recognizers, executor=executor
             )
+            if self.pattern_matcher
+            else {}
+        )
+        threaded_results = (
+            self._analyze_in_threads(
+                executor,
+                text,
+                entities,
+                nlp_artifacts,
+                [rec for rec in recognizers if rec.id not in fused_results],
+            )
+            if executor
+            else {}
+        )
+        for recognizer in recognizers:
+            # analyze using the current recognizer and append the results
+            if recognizer.id in fused_results:
+                current_results = fused_results[recognizer.id]
+            elif recognizer.id in threaded_results:
+                current_results = threaded_results[recognizer.id]
+            else:
+                current_results = recognizer.analyze(
+                    text=text, entities=entities, nlp_artifacts=nlp_artifacts
+                )
             if current_results:
                 # add recognizer name to recognition metadata inside results
                 # if not exists
                 self.__add_recognizer_id_if_not_exists(current_results, recognizer)
                 results.extend(current_results)
 
+        # the context enhancement may need artifacts the recognizers didn't,
+        # e.g. lemmas around pattern matches
+        if nlp_artifacts_produced is not None:
+            enhancement_needed = self.context_aware_enhancer.get_nlp_artifacts_needed(
+                results, recognizers
+            )
+            if enhancement_needed is None:
+                nlp_artifacts = self._process_text(text, language, None)
+            elif not enhancement_needed <= nlp_artifacts_produced:
+                nlp_artifacts = self._process_text(
+                    text, language, nlp_artifacts_produced | enhancement_needed
+                )
+
         results = self._enhance_using_context(
             text, results, nlp_artifacts, recognizers, context
         )
@@ -262,8 +362,146 @@ class AnalyzerEngine:
         if not return_decision_process:
             results = self.__remove_decision_process(results)
 
+        if cache_key is not None:
+            self.result_cache.put(cache_key, results)
+
         return results
 
+    def analyze_chunked(
+        self,
+        text: Union[str, Iterable[str]],
+        language: str,
+        chunk_size: int = 100000,
+        chunk_overlap: int = 200,
+        **kwargs,
+    ) -> Iterator[List[RecognizerResult]]:
+        """
+        Find PII entities in a large text, analyzing one chunk of it at a time.
+
+        The text is split into overlapping chunks at paragraph or sentence
+        boundaries (see `TextChunker`), each chunk is analyzed on its own
+        and its results are yielded once it's done, with offsets relative
+        to the whole text. Entities found in the overlap of two chunks
+        are returned once. Since only a chunk is processed at a time,
+        memory doesn't grow with the text size and the NLP engine's
+        maximal text length doesn't apply to the whole text.
+
+        Entities longer than half the overlap may be cut at chunk borders.
+
+        :param text: the text to analyze, or an iterable of consecutive parts
+        of it (e.g. the pages of a document), which are read as needed
+        :param language: the language of the text
+        :param chunk_size: maximal number of characters in a chunk
+        :param chunk_overlap: number of characters shared by consecutive chunks
+        :param kwargs: Additional parameters for the `analyze` method
+        :return: an iterator of the found entities, one list per chunk
+        """
+        chunker = TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        for offset, chunk, owned_start, owned_end in chunker.split(text):
+            results = self.analyze(text=chunk, language=language, **kwargs)
+
+            chunk_results = []
+            for result in results:
+                result.start += offset
+                result.end += offset
+                # Results in the overlap are returned by the chunk owning them
+                if result.start < owned_start or (
+                    owned_end is not None and result.start >= owned_end
+                ):
+                    continue
+                chunk_results.append(result)
+
+            yield chunk_results
+
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        # The pool's threads don't survive a fork, so forked processes
+        # (e.g. pre-forked server workers) start their own pool
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.n_threads, thread_name_prefix="analyzer"
+                )
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    @staticmethod
+    def _analyze_in_threads(
+        executor: concurrent.futures.Executor,
+        text: str,
+        entities: List[str],
+        nlp_artifacts: NlpArtifacts,
+        recognizers: List[EntityRecognizer],
+    ) -> Dict[str, List[RecognizerResult]]:
+        """
+        Run the recognizers in parallel on the thread pool.
+
+        :return: Dictionary of recognizer id to the recognizer's results
+        """
+        futures = {}
+        for recognizer in recognizers:
+            kwargs = {}
+            if type(recognizer).analyze is PatternRecognizer.analyze:
+                # Compile the patterns here, so the threads only read them
+                recognizer.prepare_patterns(compile_regexes=True)
+                kwargs["concurrent"] = True
+            futures[recognizer.id] = executor.submit(
+                recognizer.analyze,
+                text=text,
+                entities=entities,
+                nlp_artifacts=nlp_artifacts,
+                **kwargs,
+            )
+        return {
+            recognizer_id: future.result() for recognizer_id, future in futures.items()
+        }
+
+    @staticmethod
+    def _get_nlp_artifacts_needed(
+        recognizers: List[EntityRecognizer],
+    ) -> Optional[Set[str]]:
+        """
+        Return the NlpArtifacts attributes the recognizers need.
+
+        :param recognizers: the list of recognizers
+        :return: "entities" and/or "lemmas", or None if any may be needed
+        """
+        artifacts = set()
+        for recognizer in recognizers:
+            recognizer_artifacts = recognizer.get_nlp_artifacts_needed()
+            if recognizer_artifacts is None:
+                return None
+            artifacts.update(recognizer_artifacts)
+
+        # when the pipeline runs anyway, the lemmas for the context enhancement
+        # are produced along, rather than by running it again
+        if artifacts and any(recognizer.context for recognizer in recognizers):
+            artifacts.add("lemmas")
+        return artifacts
+
+    def _process_text(
+        self, text: str, language: str, artifacts: Optional[Set[str]]
+    ) -> NlpArtifacts:
+        """
+        Run the parts of the NLP pipeline producing the given artifacts.
+
+        :param text: the text to process
+        :param language: the language of the text
+        :param artifacts: "entities" and/or "lemmas", or None for the whole
+        pipeline. If empty, the pipeline isn't run and the artifacts are empty.
+        """
+        if artifacts is None:
+            return self.nlp_engine.process_text(text, language)
+        if not artifacts:
+            return NlpArtifacts(
+                entities=[],
+                tokens=[],
+                tokens_indices=[],
+                lemmas=[],
+                nlp_engine=None,
+                language=language,
+            )
+        return self.nlp_engine.process_text_partially(text, language, artifacts)
+
     def _enhance_using_context(
         self,
         text: str,
@@ -286,13 +524,26 @@ class AnalyzerEngine:
         """
         results = []
 
-        for recognizer in recognizers:
-            recognizer_results = [
-                r
-                for r in raw_results
-                if r.recognition_metadata[RecognizerResult.RECOGNIZER_IDENTIFIER_KEY]
-                == recognizer.id
+        # group the results by the recognizer that created them, in one pass
+        results_by_recognizer_id = {}
+        for result in raw_results:
+            recognizer_id = result.recognition_metadata[
+                RecognizerResult.RECOGNIZER_IDENTIFIER_KEY
             ]
+            results_by_recognizer_id.setdefault(recognizer_id, []).append(result)
+
+        for recognizer in recognizers:
+            recognizer_results = results_by_recognizer_id.get(recognizer.id, [])
+
+            # recognizers without their own context logic return their
+            # results as is, no need to collect the other results for them
+            if (
+                type(recognizer).enhance_using_context
+                is EntityRecognizer.enhance_using_context
+            ):
+                results.extend(recognizer_results)
+                continue
+
             other_recognizer_results = [
                 r
                 for r in raw_results
@@ -1,12 +1,16 @@
 import logging
+import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 import yaml
 
-from guardian_analyzer import AnalyzerEngine, RecognizerRegistry
+from guardian_analyzer import AnalyzerEngine, AnalyzerResultCache, RecognizerRegistry
 from guardian_analyzer.nlp_engine import NlpEngine, NlpEngineProvider
 from guardian_analyzer.recognizer_registry import RecognizerRegistryProvider
+from guardian_analyzer.recognizer_registry.recognizer_registry_snapshot import (
+    RecognizerRegistrySnapshot,
+)
 
 logger = logging.getLogger("guardian-analyzer")
 
@@ -21,6 +25,9 @@ class AnalyzerEngineProvider:
     :param nlp_engine_conf_file: the path to the nlp engine configuration file
     :param recognizer_registry_conf_file: the path to the recognizer
     registry configuration file
+    :param recognizer_registry_snapshot_file: the path to a registry snapshot,
+    see `save_recognizer_registry_snapshot`. The registry is loaded from it
+    unless it is stale, in which case it is built from the configuration.
     """
 
     def __init__(
@@ -28,10 +35,12 @@ class AnalyzerEngineProvider:
         analyzer_engine_conf_file: Optional[Union[Path, str]] = None,
         nlp_engine_conf_file: Optional[Union[Path, str]] = None,
         recognizer_registry_conf_file: Optional[Union[Path, str]] = None,
+        recognizer_registry_snapshot_file: Optional[Union[Path, str]] = None,
     ):
         self.configuration = self.get_configuration(conf_file=analyzer_engine_conf_file)
         self.nlp_engine_conf_file = nlp_engine_conf_file
         self.recognizer_registry_conf_file = recognizer_registry_conf_file
+        self.recognizer_registry_snapshot_file = recognizer_registry_snapshot_file
 
     def get_configuration(
         self, conf_file: Optional[Union[Path, str]]
@@ -72,27 +81,101 @@ class AnalyzerEngineProvider:
         :return: analyzer engine initialized with yaml configuration
         """
 
+        start_time = time.perf_counter()
         nlp_engine = self._load_nlp_engine()
+        nlp_engine_time = time.perf_counter()
         supported_languages = self.configuration.get("supported_languages", ["en"])
         default_score_threshold = self.configuration.get("default_score_threshold", 0)
+        fused_pattern_matching = self.configuration.get(
+            "fused_pattern_matching", False
+        )
+        result_cache = self._load_result_cache(self.configuration.get("result_cache"))
+        n_threads = self.configuration.get("n_threads", 1)
 
         registry = self._load_recognizer_registry(
             supported_languages=supported_languages, nlp_engine=nlp_engine
         )
+        registry_time = time.perf_counter()
 
         analyzer = AnalyzerEngine(
             nlp_engine=nlp_engine,
             registry=registry,
             supported_languages=supported_languages,
             default_score_threshold=default_score_threshold,
+            fused_pattern_matching=fused_pattern_matching,
+            result_cache=result_cache,
+            n_threads=n_threads,
         )
 
+        end_time = time.perf_counter()
+        logger.info(
+            f"Created analyzer engine in {end_time - start_time:.2f}s "
+            f"(NLP engine {nlp_engine_time - start_time:.2f}s, "
+            f"recognizer registry {registry_time - nlp_engine_time:.2f}s, "
+            f"analyzer {end_time - registry_time:.2f}s)"
+        )
         return analyzer
 
+    @staticmethod
+    def _load_result_cache(
+        result_cache_configuration: Optional[Union[bool, Dict]],
+    ) -> Optional[AnalyzerResultCache]:
+        if not result_cache_configuration:
+            return None
+        if isinstance(result_cache_configuration, dict):
+            return AnalyzerResultCache(**result_cache_configuration)
+        return AnalyzerResultCache()
+
+    def save_recognizer_registry_snapshot(
+        self, snapshot_file: Union[Path, str]
+    ) -> None:
+        """
+        Build the recognizer registry and save it as a snapshot.
+
+        Engines created by providers given this snapshot file (and the same
+        configuration) load the registry from it instead of building it.
+
+        :param snapshot_file: the path of the snapshot file to write
+        """
+        supported_languages = self.configuration.get("supported_languages", ["en"])
+        registry = self._create_recognizer_registry(supported_languages)
+        RecognizerRegistrySnapshot(snapshot_file).save(
+            registry, sources=self._get_registry_sources(supported_languages)
+        )
+
     def _load_recognizer_registry(
         self,
         supported_languages: List[str],
         nlp_engine: NlpEngine,
+    ) -> RecognizerRegistry:
+        registry = None
+        if self.recognizer_registry_snapshot_file:
+            registry = RecognizerRegistrySnapshot(
+                self.recognizer_registry_snapshot_file
+            ).load(sources=self._get_registry_sources(supported_languages))
+        if not registry:
+            registry = self._create_recognizer_registry(supported_languages)
+
+        if nlp_engine:
+            registry.add_nlp_recognizer(nlp_engine)
+        return registry
+
+    def _get_registry_sources(self, supported_languages: List[str]) -> Dict:
+        """Return the configuration the recognizer registry is built from."""
+        conf_file_content = None
+        if self.recognizer_registry_conf_file:
+            try:
+                conf_file_content = Path(self.recognizer_registry_conf_file).read_text()
+            except OSError:
+                pass
+        return {
+            "recognizer_registry_conf_file": conf_file_content,
+            "recognizer_registry": self.configuration.get("recognizer_registry"),
+            "supported_languages": supported_languages,
+        }
+
+    def _create_recognizer_registry(
+        self, supported_languages: List[str]
     ) -> RecognizerRegistry:
         if self.recognizer_registry_conf_file:
             logger.info(
@@ -122,10 +205,7 @@ class AnalyzerEngineProvider:
                     "supported_languages": supported_languages,
                 }
             )
-        registry = provider.create_recognizer_registry()
-        if nlp_engine:
-            registry.add_nlp_recognizer(nlp_engine)
-        return registry
+        return provider.create_recognizer_registry()
 
     def _load_nlp_engine(self) -> NlpEngine:
         if self.nlp_engine_conf_file:
@@ -0,0 +1,84 @@
+import hashlib
+import sys
+from typing import Hashable, List, Optional, Tuple
+
+from guardian_analyzer import AnalysisExplanation, RecognizerResult
+from guardian_analyzer.size_bounded_lru_cache import SizeBoundedLruCache
+
+
+class AnalyzerResultCache(SizeBoundedLruCache):
+    """
+    LRU cache of analysis results, keyed by a hash of the text and request params.
+
+    Used by the AnalyzerEngine to skip both the NLP pipeline and the
+    recognizers for texts it already analyzed with the same parameters.
+    Results are copied in and out of the cache, so callers are free
+    to modify the results they get. Copies keep lazy explanations lazy.
+
+    :param max_entries: Maximum number of cached texts
+    :param max_size_bytes: Approximate upper bound on the memory taken by
+    cached results
+    :param ttl_seconds: Time after which a cached entry expires,
+    None for no expiry
+    """
+
+    # Approximate size of a key: a 16 bytes digest and the request params
+    KEY_SIZE_ESTIMATE = 200
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_size_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None,
+    ):
+        super().__init__(
+            max_size_bytes=max_size_bytes,
+            max_entries=max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+
+    @staticmethod
+    def get_key(text: str, *params: Hashable) -> Tuple:
+        """
+        Create a cache key from the text and the parameters affecting its results.
+
+        :param text: The analyzed text, stored as a digest only
+        :param params: Hashable request parameters
+        """
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        return (digest, len(text)) + params
+
+    def get(self, key: Tuple) -> Optional[List[RecognizerResult]]:
+        """
+        Return a copy of the cached results for this key, or None.
+
+        :param key: A key created by get_key
+        """
+        results = self._lookup(key)
+        if results is None:
+            return None
+        return [result.copy() for result in results]
+
+    def put(self, key: Tuple, results: List[RecognizerResult]) -> None:
+        """
+        Store a copy of the results, evicting the least recently used entries.
+
+        :param key: A key created by get_key
+        :param results: Results of the analysis
+        """
+        results = [result.copy() for result in results]
+        self._store(key, results, self._estimate_size(results))
+
+    @classmethod
+    def _estimate_size(cls, results: List[RecognizerResult]) -> int:
+        size = cls.KEY_SIZE_ESTIMATE + sys.getsizeof(results)
+        for result in results:
+            size += sys.getsizeof(result) + sys.getsizeof(result.__dict__)
+            if result.recognition_metadata:
+                size += sys.getsizeof(result.recognition_metadata)
+            # Lazy explanations aren't created for the estimate
+            analysis_explanation = vars(result)["analysis_explanation"]
+            if isinstance(analysis_explanation, AnalysisExplanation):
+                size += sys.getsizeof(analysis_explanation.__dict__)
+                size += sys.getsizeof(analysis_explanation.textual_explanation)
+        return size
@@ -1,7 +1,13 @@
+import concurrent.futures
+import itertools
 import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
 from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from guardian_analyzer import AnalyzerEngine, DictAnalyzerResult, RecognizerResult
+from guardian_analyzer.analyzer_engine_provider import AnalyzerEngineProvider
 from guardian_analyzer.nlp_engine import NlpArtifacts
 
 logger = logging.getLogger("guardian-analyzer")
@@ -14,14 +20,63 @@ class BatchAnalyzerEngine:
     Wrapper class to run Presidio Analyzer Engine on multiple values,
     either lists/iterators of strings, or dictionaries.
 
+    With n_process > 1, values are sent in chunks to a pool of worker
+    processes, each holding its own engine, and results are returned in
+    the input order. The pool is kept for the following calls, use `close`
+    (or the engine as a context manager) to stop it.
+
     :param: analyzer_engine: AnalyzerEngine instance to use
     for handling the values in those collections.
+    :param n_process: Number of worker processes, 1 to analyze in this process
+    :param chunk_size: Number of values sent to a worker at a time
+    :param analyzer_engine_provider: Provider each worker creates its engine
+    with. If not provided, workers are forked and share this engine
+    as it is when the pool starts.
     """
 
-    def __init__(self, analyzer_engine: Optional[AnalyzerEngine] = None):
+    # Times a chunk is sent to the pool before giving up on it,
+    # if worker processes keep crashing
+    MAX_CHUNK_ATTEMPTS = 3
+
+    def __init__(
+        self,
+        analyzer_engine: Optional[AnalyzerEngine] = None,
+        n_process: int = 1,
+        chunk_size: int = 1000,
+        analyzer_engine_provider: Optional[AnalyzerEngineProvider] = None,
+    ):
         self.analyzer_engine = analyzer_engine
         if not analyzer_engine:
-            self.analyzer_engine = AnalyzerEngine()
+            if analyzer_engine_provider:
+                self.analyzer_engine = analyzer_engine_provider.create_engine()
+            else:
+                self.analyzer_engine = AnalyzerEngine()
+
+        if n_process > 1 and not analyzer_engine_provider:
+            if "fork" not in multiprocessing.get_all_start_methods():
+                raise ValueError(
+                    "n_process > 1 requires an analyzer_engine_provider "
+                    "on platforms which can't fork"
+                )
+
+        self.n_process = n_process
+        self.chunk_size = chunk_size
+        self.analyzer_engine_provider = analyzer_engine_provider
+        self._executor = None
+
+    def __enter__(self) -> "BatchAnalyzerEngine":
+        """Return the engine, whose worker processes stop on exit."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Stop the worker processes, if any."""
+        self.close()
+
+    def close(self) -> None:
+        """Stop the worker processes, if any."""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
 
     def analyze_iterator(
         self,
@@ -43,6 +98,16 @@ class BatchAnalyzerEngine:
         # validate types
         texts = self._validate_types(texts)
 
+        if self.n_process > 1:
+            return list(
+                self._analyze_in_workers(
+                    texts=texts,
+                    language=language,
+                    batch_size=batch_size,
+                    kwargs=kwargs,
+                )
+            )
+
         # Process the texts as batch for improved performance
         nlp_artifacts_batch: Iterator[Tuple[str, NlpArtifacts]] = (
             self.analyzer_engine.nlp_engine.process_batch(
@@ -90,6 +155,29 @@ class BatchAnalyzerEngine:
         if not keys_to_skip:
             keys_to_skip = []
 
+        # Analyze all scalar values together in the worker processes,
+        # each with its key as context
+        scalar_results = {}
+        if self.n_process > 1:
+            scalar_keys = [
+                key
+                for key, value in input_dict.items()
+                if value
+                and key not in keys_to_skip
+                and type(value) in (str, int, bool, float)
+            ]
+            scalar_results = dict(
+                zip(
+                    scalar_keys,
+                    self._analyze_in_workers(
+                        texts=(input_dict[key] for key in scalar_keys),
+                        language=language,
+                        contexts=([key] for key in scalar_keys),
+                        kwargs=kwargs,
+                    ),
+                )
+            )
+
         for key, value in input_dict.items():
             if not value or key in keys_to_skip:
                 yield DictAnalyzerResult(key=key, value=value, recognizer_results=[])
@@ -99,7 +187,9 @@ class BatchAnalyzerEngine:
             specific_context = context[:]
             specific_context.append(key)
 
-            if type(value) in (str, int, bool, float):
+            if key in scalar_results:
+                results = scalar_results[key]
+            elif type(value) in (str, int, bool, float):
                 results: List[RecognizerResult] = self.analyzer_engine.analyze(
                     text=str(value), language=language, context=[key], **kwargs
                 )
@@ -126,6 +216,101 @@ class BatchAnalyzerEngine:
 
             yield DictAnalyzerResult(key=key, value=value, recognizer_results=results)
 
+    def _analyze_in_workers(
+        self,
+        texts: Iterable[Any],
+        language: str,
+        batch_size: Optional[int] = None,
+        contexts: Optional[Iterable[List[str]]] = None,
+        kwargs: Optional[Dict] = None,
+    ) -> Iterator[List[RecognizerResult]]:
+        """
+        Analyze the texts in chunks in the worker processes, yielding in order.
+
+        A chunk whose worker crashed is sent again to a new pool,
+        up to MAX_CHUNK_ATTEMPTS times.
+
+        :param texts: Values to analyze
+        :param language: Input language
+        :param batch_size: Batch size of the NLP engine in the workers
+        :param contexts: Context words per text, overriding the context in kwargs
+        :param kwargs: Additional parameters for the `AnalyzerEngine.analyze` method
+        """
+        texts = iter(texts)
+        contexts = iter(contexts) if contexts is not None else None
+        task_args = (language, batch_size, kwargs or {})
+
+        pending = deque()
+        while True:
+            chunk_texts = list(itertools.islice(texts, self.chunk_size))
+            if chunk_texts:
+                chunk_contexts = (
+                    list(itertools.islice(contexts, len(chunk_texts)))
+                    if contexts is not None
+                    else None
+                )
+                chunk = (chunk_texts, chunk_contexts)
+                pending.append([chunk, self._submit(chunk, task_args), 1])
+
+            # Keep a chunk queued per worker while waiting for the oldest one
+            while pending and (
+                not chunk_texts or len(pending) > 2 * self.n_process
+            ):
+                yield from self._wait_for_oldest(pending, task_args)
+
+            if not chunk_texts:
+                return
+
+    def _wait_for_oldest(self, pending: deque, task_args: Tuple) -> Iterator:
+        chunk, future, attempts = pending[0]
+        try:
+            results = future.result()
+        except BrokenProcessPool:
+            logger.error(
+                f"Analyzer worker process crashed, restarting "
+                f"{self.n_process} workers"
+            )
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            for entry in pending:
+                chunk, future, attempts = entry
+                if future.done() and future.exception() is None:
+                    continue
+                if attempts >= self.MAX_CHUNK_ATTEMPTS:
+                    self.close()
+                    raise RuntimeError(
+                        f"Analyzer workers crashed {attempts} times "
+                        f"while analyzing a chunk of {len(chunk[0])} values"
+                    )
+                entry[1] = self._submit(chunk, task_args)
+                entry[2] = attempts + 1
+            return
+
+        pending.popleft()
+        yield from results
+
+    def _submit(self, chunk: Tuple, task_args: Tuple) -> concurrent.futures.Future:
+        if not self._executor:
+            self._executor = self._create_executor()
+        return self._executor.submit(_analyze_chunk, *chunk, *task_args)
+
+    def _create_executor(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self.analyzer_engine_provider:
+            mp_context = multiprocessing.get_context()
+            initargs = (None, self.analyzer_engine_provider)
+        else:
+            # Forked workers share the parent's loaded engine
+            mp_context = multiprocessing.get_context("fork")
+            initargs = (self.analyzer_engine, None)
+
+        logger.info(f"Starting {self.n_process} analyzer worker processes")
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.n_process,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=initargs,
+        )
+
     @staticmethod
     def _validate_types(value_iterator: Iterable[Any]) -> Iterator[Any]:
         for val in value_iterator:
@@ -145,3 +330,44 @@ class BatchAnalyzerEngine:
             k.replace(f"{key}.", "") for k in keys_to_skip if k.startswith(key)
         ]
         return new_keys_to_skip
+
+
+# Engine used by pool workers, created once per worker process
+_worker_engine: Optional[AnalyzerEngine] = None
+
+
+def _init_worker(
+    analyzer_engine: Optional[AnalyzerEngine],
+    analyzer_engine_provider: Optional[AnalyzerEngineProvider],
+) -> None:
+    global _worker_engine
+    if analyzer_engine_provider:
+        _worker_engine = analyzer_engine_provider.create_engine()
+    else:
+        _worker_engine = analyzer_engine
+
+
+def _analyze_chunk(
+    texts: List[Any],
+    contexts: Optional[List[List[str]]],
+    language: str,
+    batch_size: Optional[int],
+    kwargs: Dict,
+) -> List[List[RecognizerResult]]:
+    """Pool worker entry point, analyzing a chunk of texts as a batch."""
+    nlp_artifacts_batch = _worker_engine.nlp_engine.process_batch(
+        texts=texts, language=language, batch_size=batch_size
+    )
+
+    list_results = []
+    for i, (text, nlp_artifacts) in enumerate(nlp_artifacts_batch):
+        text_kwargs = kwargs if contexts is None else {**kwargs, "context": contexts[i]}
+        list_results.append(
+            _worker_engine.analyze(
+                text=str(text),
+                nlp_artifacts=nlp_artifacts,
+                language=language,
+                **text_kwargs,
+            )
+        )
+    return list_results
@@ -0,0 +1,629 @@
+"""
+Redact PII in CSV, JSONL and Parquet files, streaming them in bounded batches.
+
+Usage:
+    python -m guardian_analyzer.batch_file_redactor input.csv output.csv \
+        --columns name comments --resume
+"""
+
+import argparse
+import csv
+import io
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from guardian_analyzer import BatchAnalyzerEngine, RecognizerResult
+
+try:
+    from presidio_anonymizer import BatchAnonymizerEngine
+    from presidio_anonymizer.entities import OperatorConfig
+    from presidio_anonymizer.entities import (
+        RecognizerResult as AnonymizerRecognizerResult,
+    )
+except ImportError:
+    BatchAnonymizerEngine = None
+    OperatorConfig = None
+    AnonymizerRecognizerResult = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger("guardian-analyzer")
+
+
+class _LineReader:
+    """Iterate the lines of a binary file, keeping the offset after the last one."""
+
+    def __init__(self, file: io.BufferedReader, offset: int):
+        file.seek(offset)
+        self.file = file
+        self.offset = offset
+
+    def __iter__(self) -> "_LineReader":
+        return self
+
+    def __next__(self) -> str:
+        line = self.file.readline()
+        if not line:
+            raise StopIteration
+        if self.offset == 0 and line.startswith(b"\xef\xbb\xbf"):
+            # Skip the byte order mark
+            line = line[3:]
+            self.offset = 3
+        self.offset += len(line)
+        return line.decode("utf-8")
+
+
+class _CsvFormat:
+    """
+    CSV files with a header row.
+
+    Positions are byte offsets in the files. Rows are dicts by header name,
+    with missing values as None and extra values in a list under the None key,
+    so rows are written back as they were read.
+    """
+
+    def __init__(self):
+        self.header = None
+
+    def read(self, path: str, position: int) -> Iterator[Tuple[Dict, int]]:
+        """Yield the rows after the position, with the position after each one."""
+        with open(path, "rb") as file:
+            lines = _LineReader(file, 0)
+            self.header = next(csv.reader(lines), [])
+            if position:
+                lines = _LineReader(file, position)
+
+            reader = csv.DictReader(lines, fieldnames=self.header)
+            for row in reader:
+                yield row, lines.offset
+
+    def open_writer(self, path: str, position: int) -> "_TextWriter":
+        """Open the output, keeping what was written up to the position."""
+        writer = _TextWriter(path, position)
+        csv_writer = csv.writer(writer.text)
+        if not position and self.header:
+            csv_writer.writerow(self.header)
+
+        def write_row(row: Dict) -> None:
+            values = [row[name] for name in self.header if row[name] is not None]
+            csv_writer.writerow(values + row.get(None, []))
+
+        writer.write_row = write_row
+        return writer
+
+
+class _JsonlFormat:
+    """
+    JSON lines files, one JSON object per line.
+
+    Positions are byte offsets in the files. Values of the objects' top level
+    keys are redacted, lines which aren't objects are written as they are.
+    """
+
+    def read(self, path: str, position: int) -> Iterator[Tuple[Any, int]]:
+        """Yield the rows after the position, with the position after each one."""
+        with open(path, "rb") as file:
+            lines = _LineReader(file, position)
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line), lines.offset
+
+    def open_writer(self, path: str, position: int) -> "_TextWriter":
+        """Open the output, keeping what was written up to the position."""
+        writer = _TextWriter(path, position)
+
+        def write_row(row: Any) -> None:
+            writer.text.write(json.dumps(row, ensure_ascii=False))
+            writer.text.write("\n")
+
+        writer.write_row = write_row
+        return writer
+
+
+class _TextWriter:
+    """Output text file, truncated to the position it is resumed at."""
+
+    def __init__(self, path: str, position: int):
+        file = open(path, "r+b" if position else "wb")
+        file.truncate(position)
+        file.seek(position)
+        self.text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+        self.write_row = None
+
+    def flush(self) -> int:
+        """Persist the rows written so far, returning the position after them."""
+        self.text.flush()
+        os.fsync(self.text.buffer.fileno())
+        return self.text.buffer.tell()
+
+    def close(self) -> None:
+        """Close the file."""
+        self.text.close()
+
+
+class _ParquetFormat:
+    """
+    Parquet files, written as a directory of part files.
+
+    Input positions are row numbers, output positions are part numbers:
+    each flush writes the rows since the previous one to a new part file.
+    """
+
+    def __init__(self):
+        if not pyarrow:
+            raise ValueError(
+                "Parquet files require pyarrow. Please install it: pip install pyarrow"
+            )
+        self.schema = None
+
+    def read(self, path: str, position: int) -> Iterator[Tuple[Dict, int]]:
+        """Yield the rows after the position, with the position after each one."""
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        self.schema = parquet_file.schema_arrow
+
+        # Skip the row groups read before the position
+        row_groups = []
+        skip = position
+        for index in range(parquet_file.num_row_groups):
+            num_rows = parquet_file.metadata.row_group(index).num_rows
+            if not row_groups and skip >= num_rows:
+                skip -= num_rows
+            else:
+                row_groups.append(index)
+
+        row_number = position - skip
+        for batch in parquet_file.iter_batches(row_groups=row_groups):
+            for row in batch.to_pylist():
+                row_number += 1
+                if row_number > position:
+                    yield row, row_number
+
+    def open_writer(self, path: str, position: int) -> "_ParquetWriter":
+        """Open the output, keeping the part files written up to the position."""
+        return _ParquetWriter(path, position, self.schema)
+
+
+class _ParquetWriter:
+    """Output directory of Parquet part files."""
+
+    def __init__(self, path: str, position: int, schema: "pyarrow.Schema"):
+        os.makedirs(path, exist_ok=True)
+        for name in os.listdir(path):
+            if name.startswith("part-") and self._part_number(name) >= position:
+                os.remove(os.path.join(path, name))
+
+        self.path = path
+        self.schema = schema
+        self.parts = position
+        self.rows = []
+
+    def write_row(self, row: Dict) -> None:
+        """Buffer a row for the next part file."""
+        self.rows.append(row)
+
+    def flush(self) -> int:
+        """Write the buffered rows to a part file, returning the part count."""
+        if self.rows:
+            table = pyarrow.Table.from_pylist(self.rows, schema=self.schema)
+            part_path = os.path.join(self.path, f"part-{self.parts:05d}.parquet")
+            pyarrow.parquet.write_table(table, part_path)
+            self.parts += 1
+            self.rows = []
+        return self.parts
+
+    def close(self) -> None:
+        """Write the remaining rows."""
+        self.flush()
+
+    @staticmethod
+    def _part_number(name: str) -> int:
+        number = name[len("part-") :].split(".")[0]
+        return int(number) if number.isdigit() else -1
+
+
+_FORMATS = {
+    "csv": _CsvFormat,
+    "jsonl": _JsonlFormat,
+    "parquet": _ParquetFormat,
+}
+
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+
+class BatchFileRedactor:
+    """
+    Redact PII in CSV, JSONL and Parquet files, streaming them in bounded batches.
+
+    Rows are read `batch_size` at a time. The values of each selected column
+    in the batch are analyzed together by the BatchAnalyzerEngine,
+    with the column name as context, and anonymized by the BatchAnonymizerEngine.
+    The redacted rows are written as they are processed, so memory use
+    doesn't grow with the file size.
+
+    Every `checkpoint_interval` rows, the output is flushed to disk and
+    the input and output positions are saved to a checkpoint file, to resume
+    an interrupted run from there rather than from the first row.
+    Throughput and memory use are logged every `report_interval` seconds.
+
+    :param batch_analyzer_engine: Engine analyzing the values,
+    use n_process > 1 to analyze in worker processes
+    :param batch_anonymizer_engine: Engine anonymizing the values
+    :param batch_size: Number of rows read and analyzed at a time
+    :param checkpoint_interval: Number of rows between checkpoints
+    :param report_interval: Seconds between progress reports
+    """
+
+    def __init__(
+        self,
+        batch_analyzer_engine: Optional[BatchAnalyzerEngine] = None,
+        batch_anonymizer_engine: Optional["BatchAnonymizerEngine"] = None,
+        batch_size: int = 1000,
+        checkpoint_interval: int = 10000,
+        report_interval: float = 10,
+    ):
+        if not batch_anonymizer_engine and not BatchAnonymizerEngine:
+            raise ValueError(
+                "Redaction requires presidio-anonymizer. "
+                "Please install it: pip install presidio-anonymizer"
+            )
+
+        self.batch_analyzer_engine = batch_analyzer_engine or BatchAnalyzerEngine()
+        self.batch_anonymizer_engine = (
+            batch_anonymizer_engine or BatchAnonymizerEngine()
+        )
+        self.batch_size = batch_size
+        self.checkpoint_interval = checkpoint_interval
+        self.report_interval = report_interval
+
+    def redact_file(
+        self,
+        input_path: str,
+        output_path: str,
+        language: str = "en",
+        columns: Optional[List[str]] = None,
+        skip_columns: Optional[List[str]] = None,
+        file_format: Optional[str] = None,
+        checkpoint_path: Optional[str] = None,
+        resume: bool = False,
+        operators: Optional[Dict[str, "OperatorConfig"]] = None,
+        **kwargs,
+    ) -> int:
+        """
+        Redact the values of the selected columns of a file.
+
+        Only string values are analyzed, other values are written as they are.
+
+        :param input_path: File to redact
+        :param output_path: File to write the redacted rows to
+        (a directory of part files for Parquet)
+        :param language: Language of the values
+        :param columns: Columns to redact, all columns if not provided
+        :param skip_columns: Columns not to redact
+        :param file_format: csv, jsonl or parquet, by default the input extension's
+        :param checkpoint_path: Checkpoint file, output_path + ".checkpoint"
+        if not provided. It is removed once the file is fully redacted.
+        :param resume: Continue from the checkpoint, if there is one
+        :param operators: Anonymization operators per entity type,
+        see `AnonymizerEngine.anonymize`
+        :param kwargs: Additional parameters for the `AnalyzerEngine.analyze` method
+        :return: Number of rows in the redacted file
+        """
+        file_format = file_format or self._get_format(input_path)
+        checkpoint_path = checkpoint_path or f"{output_path}.checkpoint"
+        checkpoint = {
+            "input_path": os.path.abspath(input_path),
+            "format": file_format,
+            "rows": 0,
+            "input_position": 0,
+            "output_position": 0,
+        }
+        if resume and os.path.exists(checkpoint_path):
+            checkpoint = self._load_checkpoint(checkpoint_path, checkpoint)
+            logger.info(f"Resuming {input_path} after row {checkpoint['rows']}")
+
+        file_handler = _FORMATS[file_format]()
+        rows = file_handler.read(input_path, checkpoint["input_position"])
+        # Read the first row before opening the output, to get the CSV header
+        # and Parquet schema
+        first_row = next(rows, None)
+        writer = file_handler.open_writer(output_path, checkpoint["output_position"])
+        progress = _ProgressReport(checkpoint["rows"], self.report_interval)
+
+        try:
+            rows_since_checkpoint = 0
+            batches = self._batches(rows, first_row)
+            for batch, input_position in batches:
+                self._redact_batch(
+                    [row for row, _ in batch],
+                    language=language,
+                    columns=columns,
+                    skip_columns=skip_columns or [],
+                    operators=operators,
+                    kwargs=kwargs,
+                )
+                for row, _ in batch:
+                    writer.write_row(row)
+
+                checkpoint["rows"] += len(batch)
+                rows_since_checkpoint += len(batch)
+                if rows_since_checkpoint >= self.checkpoint_interval:
+                    checkpoint["input_position"] = input_position
+                    checkpoint["output_position"] = writer.flush()
+                    self._save_checkpoint(checkpoint_path, checkpoint)
+                    rows_since_checkpoint = 0
+
+                progress.update(checkpoint["rows"])
+        finally:
+            writer.close()
+
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        progress.report(checkpoint["rows"], final=True)
+        return checkpoint["rows"]
+
+    def _batches(
+        self, rows: Iterator[Tuple[Any, int]], first_row: Optional[Tuple[Any, int]]
+    ) -> Iterator[Tuple[List[Tuple[Any, int]], int]]:
+        """Group the rows in batches, with the input position after each batch."""
+        if first_row is None:
+            return
+        batch = [first_row]
+        for row in rows:
+            if len(batch) == self.batch_size:
+                yield batch, batch[-1][1]
+                batch = []
+            batch.append(row)
+        yield batch, batch[-1][1]
+
+    def _redact_batch(
+        self,
+        rows: List[Any],
+        language: str,
+        columns: Optional[List[str]],
+        skip_columns: List[str],
+        operators: Optional[Dict[str, "OperatorConfig"]],
+        kwargs: Dict,
+    ) -> None:
+        """Redact the selected columns of a batch of rows in place."""
+        values_by_column = {}
+        for index, row in enumerate(rows):
+            if not isinstance(row, dict):
+                continue
+            for column, value in row.items():
+                if not value or not isinstance(value, str):
+                    continue
+                if (columns and column not in columns) or column in skip_columns:
+                    continue
+                values_by_column.setdefault(column, []).append((index, value))
+
+        for column, values in values_by_column.items():
+            results_list = self.batch_analyzer_engine.analyze_iterator(
+                texts=[value for _, value in values],
+                language=language,
+                context=[column],
+                **kwargs,
+            )
+
+            found = [
+                (index, value, results)
+                for (index, value), results in zip(values, results_list)
+                if results
+            ]
+            if not found:
+                continue
+
+            redacted_values = self.batch_anonymizer_engine.anonymize_list(
+                texts=[value for _, value, _ in found],
+                recognizer_results_list=[
+                    self._to_anonymizer_results(results) for _, _, results in found
+                ],
+                operators=operators,
+            )
+            for (index, _, _), redacted_value in zip(found, redacted_values):
+                rows[index][column] = redacted_value
+
+    @staticmethod
+    def _to_anonymizer_results(results: List[RecognizerResult]) -> List:
+        return [
+            AnonymizerRecognizerResult(
+                entity_type=result.entity_type,
+                start=result.start,
+                end=result.end,
+                score=result.score,
+            )
+            for result in results
+        ]
+
+    @staticmethod
+    def _get_format(path: str) -> str:
+        extension = os.path.splitext(path)[1].lower()
+        if extension not in _EXTENSIONS:
+            raise ValueError(
+                f"Unknown file format of {path}, expected one of "
+                f"{', '.join(_EXTENSIONS)} or an explicit file format"
+            )
+        return _EXTENSIONS[extension]
+
+    @staticmethod
+    def _load_checkpoint(checkpoint_path: str, expected: Dict) -> Dict:
+        with open(checkpoint_path) as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        for key in ("input_path", "format"):
+            if checkpoint.get(key) != expected[key]:
+                raise ValueError(
+                    f"Checkpoint {checkpoint_path} is of another run "
+                    f"({key} {checkpoint.get(key)})"
+                )
+        return checkpoint
+
+    @staticmethod
+    def _save_checkpoint(checkpoint_path: str, checkpoint: Dict) -> None:
+        # Replace the previous checkpoint at once, so a crash while saving
+        # leaves either the previous or the new one
+        temp_path = f"{checkpoint_path}.tmp"
+        with open(temp_path, "w") as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temp_path, checkpoint_path)
+
+
+class _ProgressReport:
+    """Log the rows processed, throughput and peak memory use periodically."""
+
+    def __init__(self, start_rows: int, interval: float):
+        self.start_rows = start_rows
+        self.interval = interval
+        self.start_time = time.monotonic()
+        self.last_time = self.start_time
+        self.last_rows = start_rows
+
+    def update(self, rows: int) -> None:
+        """Report if the interval passed since the last report."""
+        if time.monotonic() - self.last_time >= self.interval:
+            self.report(rows)
+
+    def report(self, rows: int, final: bool = False) -> None:
+        """Log the progress since the last report and since the start."""
+        now = time.monotonic()
+        if final:
+            elapsed = max(now - self.start_time, 1e-9)
+            rate = (rows - self.start_rows) / elapsed
+        else:
+            rate = (rows - self.last_rows) / max(now - self.last_time, 1e-9)
+        logger.info(
+            f"{'Redacted' if final else 'Processed'} {rows} rows, "
+            f"{rate:.1f} rows/s, peak memory {self._peak_memory_mb():.0f} MB"
+        )
+        self.last_time = now
+        self.last_rows = rows
+
+    @staticmethod
+    def _peak_memory_mb() -> float:
+        if not resource:
+            return float("nan")
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kilobytes elsewhere
+        return max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def main(args: Optional[Iterable[str]] = None) -> None:
+    """Run the file redaction command line."""
+    parser = argparse.ArgumentParser(
+        description="Redact PII in a CSV, JSONL or Parquet file"
+    )
+    parser.add_argument("input_path", help="File to redact")
+    parser.add_argument(
+        "output_path",
+        help="File to write the redacted rows to (a directory for Parquet)",
+    )
+    parser.add_argument("--language", default="en", help="Language of the values")
+    parser.add_argument(
+        "--columns", nargs="+", help="Columns to redact. Default: all columns"
+    )
+    parser.add_argument("--skip_columns", nargs="+", help="Columns not to redact")
+    parser.add_argument(
+        "--entities", nargs="+", help="Entities to redact. Default: all entities"
+    )
+    parser.add_argument(
+        "--score_threshold", type=float, help="Minimum score of redacted entities"
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(_FORMATS),
+        help="File format. Default: by the input file extension",
+    )
+    parser.add_argument(
+        "--operators",
+        help='Anonymization operators per entity type as JSON, '
+        'e.g. {"DEFAULT": {"type": "mask", "masking_char": "*", '
+        '"chars_to_mask": 100, "from_end": false}}',
+    )
+    parser.add_argument(
+        "--batch_size", type=int, default=1000, help="Rows analyzed at a time"
+    )
+    parser.add_argument(
+        "--n_process", type=int, default=1, help="Number of analyzer processes"
+    )
+    parser.add_argument(
+        "--checkpoint_interval",
+        type=int,
+        default=10000,
+        help="Rows between checkpoints",
+    )
+    parser.add_argument(
+        "--checkpoint_path",
+        help="Checkpoint file. Default: the output path with a .checkpoint suffix",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint",
+    )
+    parser.add_argument(
+        "--report_interval",
+        type=float,
+        default=10,
+        help="Seconds between progress reports",
+    )
+    args = parser.parse_args(args)
+
+    logging.basicConfig(
+        level=logging.INFO, format="[%(asctime)s][%(name)s][%(levelname)s]%(message)s"
+    )
+
+    analyze_kwargs = {}
+    if args.entities:
+        analyze_kwargs["entities"] = args.entities
+    if args.score_threshold is not None:
+        analyze_kwargs["score_threshold"] = args.score_threshold
+
+    with BatchAnalyzerEngine(n_process=args.n_process) as batch_analyzer_engine:
+        redactor = BatchFileRedactor(
+            batch_analyzer_engine=batch_analyzer_engine,
+            batch_size=args.batch_size,
+            checkpoint_interval=args.checkpoint_interval,
+            report_interval=args.report_interval,
+        )
+
+        operators = None
+        if args.operators:
+            operators = {
+                entity_type: OperatorConfig.from_json(config)
+                for entity_type, config in json.loads(args.operators).items()
+            }
+
+        redactor.redact_file(
+            input_path=args.input_path,
+            output_path=args.output_path,
+            language=args.language,
+            columns=args.columns,
+            skip_columns=args.skip_columns,
+            file_format=args.format,
+            checkpoint_path=args.checkpoint_path,
+            resume=args.resume,
+            operators=operators,
+            **analyze_kwargs,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 import logging
 from abc import abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from guardian_analyzer import EntityRecognizer, RecognizerResult
 from guardian_analyzer.nlp_engine import NlpArtifacts
@@ -64,3 +64,18 @@ class ContextAwareEnhancer:
         :param context: list of context words
         """
         return raw_results
+
+    def get_nlp_artifacts_needed(
+        self, results: List[RecognizerResult], recognizers: List[EntityRecognizer]
+    ) -> Optional[Set[str]]:
+        """
+        Return the NlpArtifacts attributes needed to enhance the given results.
+
+        Lets the AnalyzerEngine skip the NLP pipeline, or parts of it,
+        when the enhancement doesn't need them.
+
+        :param results: Recognizer results to be enhanced
+        :param recognizers: the list of recognizers
+        :return: "entities" and/or "lemmas", or None if any may be needed
+        """
+        return None
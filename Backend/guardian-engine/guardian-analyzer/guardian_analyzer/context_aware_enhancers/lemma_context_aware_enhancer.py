@@ -1,6 +1,7 @@
 import copy
 import logging
-from typing import List, Optional
+from bisect import bisect_left, bisect_right
+from typing import Collection, Dict, List, Optional, Set
 
 from guardian_analyzer import EntityRecognizer, RecognizerResult
 from guardian_analyzer.context_aware_enhancers import ContextAwareEnhancer
@@ -66,8 +67,9 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
         :param context: list of context words
         """  # noqa D205 D400
 
-        # create a deep copy of the results object, so we can manipulate it
-        results = copy.deepcopy(raw_results)
+        # results are copied only when their score is updated (copy on write),
+        # so raw_results are left untouched without copying all of them
+        results = list(raw_results)
 
         # create recognizer context dictionary
         recognizers_dict = {recognizer.id: recognizer for recognizer in recognizers}
@@ -83,7 +85,12 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
             logger.warning("NLP artifacts were not provided")
             return results
 
-        for result in results:
+        # The keywords and context windows are shared by all results
+        # of the text, so they are computed once per text and not per result
+        lemmatized_keywords = set(nlp_artifacts.keywords)
+        context_by_token_index = {}
+
+        for i, result in enumerate(results):
             recognizer = None
             # get recognizer matching the result, if found.
             if (
@@ -124,7 +131,11 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
             word = text[result.start : result.end]
 
             surrounding_words = self._extract_surrounding_words(
-                nlp_artifacts=nlp_artifacts, word=word, start=result.start
+                nlp_artifacts=nlp_artifacts,
+                word=word,
+                start=result.start,
+                lemmatized_keywords=lemmatized_keywords,
+                context_by_token_index=context_by_token_index,
             )
 
             # combine other sources of context with surrounding words
@@ -134,6 +145,8 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
                 surrounding_words, recognizer.context
             )
             if supportive_context_word != "":
+                result = self._copy_result(result)
+                results[i] = result
                 result.score += self.context_similarity_factor
                 result.score = max(result.score, self.min_score_with_context_similarity)
                 result.score = min(result.score, ContextAwareEnhancer.MAX_SCORE)
@@ -146,6 +159,39 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
                 result.analysis_explanation.set_improved_score(result.score)
         return results
 
+    def get_nlp_artifacts_needed(
+        self, results: List[RecognizerResult], recognizers: List[EntityRecognizer]
+    ) -> Optional[Set[str]]:
+        """
+        Return the NlpArtifacts attributes needed to enhance the given results.
+
+        Lemmas are needed only if a result may be enhanced, i.e. its recognizer
+        has context words and didn't enhance it already.
+
+        :param results: Recognizer results to be enhanced
+        :param recognizers: the list of recognizers
+        """
+        recognizers_with_context = {
+            recognizer.id for recognizer in recognizers if recognizer.context
+        }
+        for result in results:
+            metadata = result.recognition_metadata or {}
+            if metadata.get(
+                RecognizerResult.RECOGNIZER_IDENTIFIER_KEY
+            ) in recognizers_with_context and not metadata.get(
+                RecognizerResult.IS_SCORE_ENHANCED_BY_CONTEXT_KEY
+            ):
+                return {"lemmas"}
+        return set()
+
+    @staticmethod
+    def _copy_result(result: RecognizerResult) -> RecognizerResult:
+        """Copy a result and its explanation, the only parts updated by the enhancer."""
+        result = copy.copy(result)
+        if result.analysis_explanation:
+            result.analysis_explanation = copy.copy(result.analysis_explanation)
+        return result
+
     @staticmethod
     def _find_supportive_word_in_context(
         context_list: List[str], recognizer_context_list: List[str]
@@ -186,7 +232,12 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
         return word
 
     def _extract_surrounding_words(
-        self, nlp_artifacts: NlpArtifacts, word: str, start: int
+        self,
+        nlp_artifacts: NlpArtifacts,
+        word: str,
+        start: int,
+        lemmatized_keywords: Optional[Collection[str]] = None,
+        context_by_token_index: Optional[Dict[int, List[str]]] = None,
     ) -> List[str]:
         """Extract words surrounding another given word.
 
@@ -198,6 +249,10 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
                               execution on a given text
         :param word: The word to look for context around
         :param start: The start index of the word in the original text
+        :param lemmatized_keywords: The keywords of nlp_artifacts as a set,
+                                    for fast lookups
+        :param context_by_token_index: Context lists already extracted
+                                       from this text, by token index
         """
         if not nlp_artifacts.tokens:
             logger.info("Skipping context extraction due to lack of NLP artifacts")
@@ -208,7 +263,8 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
 
         # Get the already prepared words in the given text, in their
         # LEMMATIZED version
-        lemmatized_keywords = nlp_artifacts.keywords
+        if lemmatized_keywords is None:
+            lemmatized_keywords = set(nlp_artifacts.keywords)
 
         # since the list of tokens is not necessarily aligned
         # with the actual index of the match, we look for the
@@ -217,6 +273,10 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
             word, start, nlp_artifacts.tokens, nlp_artifacts.tokens_indices
         )
 
+        if context_by_token_index is not None:
+            if token_index in context_by_token_index:
+                return list(context_by_token_index[token_index])
+
         # index i belongs to the PII entity, take the preceding n words
         # and the successing m words into a context list
 
@@ -238,6 +298,8 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
         context_list.extend(forward_context)
         context_list = list(set(context_list))
         logger.debug("Context list is: %s", " ".join(context_list))
+        if context_by_token_index is not None:
+            context_by_token_index[token_index] = list(context_list)
         return context_list
 
     @staticmethod
@@ -247,26 +309,27 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
         tokens,
         tokens_indices: List[int],  # noqa ANN001
     ) -> int:
-        found = False
         # we use the known start index of the original word to find the actual
         # token at that index, we are not checking for equivilance since the
         # token might be just a substring of that word (e.g. for phone number
         # 555-124564 the first token might be just '555' or for a match like '
         # rocket' the actual token will just be 'rocket' hence the misalignment
         # of indices)
-        # Note: we are iterating over the original tokens (not the lemmatized)
-        i = -1
-        for i, token in enumerate(tokens, 0):
-            # Either we found a token with the exact location, or
-            # we take a token which its characters indices covers
-            # the index we are looking for.
-            if (tokens_indices[i] == start) or (start < tokens_indices[i] + len(token)):
-                # found the interesting token, the one that around it
-                # we take n words, we save the matching lemma
-                found = True
-                break
-
-        if not found:
+        # Note: we are searching the original tokens (not the lemmatized)
+
+        # Tokens are sorted by their start index and don't overlap, so the
+        # token we look for is the first one that either starts at the index
+        # or ends after it. Bisect to the last token starting at or
+        # before the index.
+        i = bisect_right(tokens_indices, start) - 1
+        if i >= 0 and tokens_indices[i] == start:
+            # the first of the tokens starting at this exact location
+            i = bisect_left(tokens_indices, start)
+        elif i < 0 or start >= tokens_indices[i] + len(tokens[i]):
+            # the index falls between tokens, take the following token
+            i += 1
+
+        if i >= len(tokens_indices):
             raise ValueError(
                 "Did not find word '" + word + "' "
                 "in the list of tokens although it "
@@ -279,7 +342,7 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
         index: int,
         n_words: int,
         lemmas: List[str],
-        lemmatized_filtered_keywords: List[str],
+        lemmatized_filtered_keywords: Collection[str],
         is_backward: bool,
     ) -> List[str]:
         """
@@ -291,8 +354,8 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
         :param index: index of the lemma that its surrounding words we want
         :param n_words: number of words to take
         :param lemmas: array of lemmas
-        :param lemmatized_filtered_keywords: the array of filtered
-               lemmas from the original sentence,
+        :param lemmatized_filtered_keywords: the filtered lemmas from the
+               original sentence, preferably as a set
         :param is_backward: if true take the preceeding words, if false,
                             take the successing words
         """
@@ -318,7 +381,7 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
         index: int,
         n_words: int,
         lemmas: List[str],
-        lemmatized_filtered_keywords: List[str],
+        lemmatized_filtered_keywords: Collection[str],
     ) -> List[str]:
         return self._add_n_words(
             index, n_words, lemmas, lemmatized_filtered_keywords, False
@@ -329,7 +392,7 @@ class LemmaContextAwareEnhancer(ContextAwareEnhancer):
         index: int,
         n_words: int,
         lemmas: List[str],
-        lemmatized_filtered_keywords: List[str],
+        lemmatized_filtered_keywords: Collection[str],
     ) -> List[str]:
         return self._add_n_words(
             index, n_words, lemmas, lemmatized_filtered_keywords, True
@@ -1,6 +1,7 @@
 import logging
 from abc import abstractmethod
-from typing import Dict, List, Optional
+from bisect import bisect_left, bisect_right
+from typing import Dict, FrozenSet, List, Optional
 
 from guardian_analyzer import RecognizerResult
 from guardian_analyzer.nlp_engine import NlpArtifacts
@@ -32,6 +33,14 @@ class EntityRecognizer:
     MIN_SCORE = 0
     MAX_SCORE = 1.0
 
+    # NlpArtifacts attributes read by analyze and enhance_using_context,
+    # "entities" and/or "lemmas" (the tokens come along with either), so that
+    # the AnalyzerEngine runs only the NLP pipeline parts needed. Empty: the
+    # NlpArtifacts aren't read, and are given empty. None: anything may be read.
+    # Only trusted for the analyze and enhance_using_context of the class
+    # declaring it, see get_nlp_artifacts_needed.
+    NLP_ARTIFACTS_NEEDED: Optional[FrozenSet[str]] = None
+
     def __init__(
         self,
         supported_entities: List[str],
@@ -116,6 +125,25 @@ class EntityRecognizer:
         """
         return raw_recognizer_results
 
+    def get_nlp_artifacts_needed(self) -> Optional[FrozenSet[str]]:
+        """
+        Return the NlpArtifacts attributes this recognizer reads.
+
+        NLP_ARTIFACTS_NEEDED is inherited, but doesn't hold for a subclass
+        overriding analyze or enhance_using_context without declaring it again.
+
+        :return: NLP_ARTIFACTS_NEEDED, or None if it may not hold
+        """
+        classes = type(self).__mro__
+        declaring_class = next(
+            cls for cls in classes if "NLP_ARTIFACTS_NEEDED" in cls.__dict__
+        )
+        for method in ("analyze", "enhance_using_context"):
+            defining_class = next(cls for cls in classes if method in cls.__dict__)
+            if classes.index(defining_class) < classes.index(declaring_class):
+                return None
+        return self.NLP_ARTIFACTS_NEEDED
+
     def get_supported_entities(self) -> List[str]:
         """
         Return the list of entities this recognizer can identify.
@@ -177,22 +205,61 @@ class EntityRecognizer:
         results = sorted(results, key=lambda x: (-x.score, x.start, -(x.end - x.start)))
         filtered_results = []
 
+        # A result is removed if it's contained in an already kept result of
+        # the same type (equal results included). Kept results aren't sorted by
+        # position, so per entity type, the max end of the kept results by
+        # start position is indexed: a result is contained in a kept one
+        # if a kept result starting at or before it ends at or after it.
+        starts_by_type = {}
+        for result in results:
+            starts_by_type.setdefault(result.entity_type, []).append(result.start)
+        kept_ends_by_type = {
+            entity_type: _MaxEndIndex(starts)
+            for entity_type, starts in starts_by_type.items()
+        }
+
         for result in results:
             if result.score == 0:
                 continue
 
-            to_keep = result not in filtered_results  # equals based comparison
-            if to_keep:
-                for filtered in filtered_results:
-                    # If result is contained in one of the other results
-                    if (
-                        result.contained_in(filtered)
-                        and result.entity_type == filtered.entity_type
-                    ):
-                        to_keep = False
-                        break
+            kept_ends = kept_ends_by_type[result.entity_type]
+            if kept_ends.max_end(result.start) >= result.end:
+                continue
 
-            if to_keep:
-                filtered_results.append(result)
+            kept_ends.add(result.start, result.end)
+            filtered_results.append(result)
 
         return filtered_results
+
+
+class _MaxEndIndex:
+    """
+    Maximum end position of the intervals added so far, by start position.
+
+    A Fenwick tree over the given start positions, answering in O(log n)
+    the largest end of an added interval starting at or before a position.
+
+    :param starts: All the start positions of intervals that might be added
+    """
+
+    def __init__(self, starts: List[int]):
+        self.starts = sorted(set(starts))
+        self.tree = [-1] * (len(self.starts) + 1)
+
+    def add(self, start: int, end: int) -> None:
+        """Add an interval, its start must be one of the indexed starts."""
+        i = bisect_left(self.starts, start) + 1
+        while i < len(self.tree):
+            if self.tree[i] < end:
+                self.tree[i] = end
+            i += i & -i
+
+    def max_end(self, position: int) -> int:
+        """Return the max end of intervals starting at or before position, or -1."""
+        i = bisect_right(self.starts, position)
+        max_end = -1
+        while i > 0:
+            if self.tree[i] > max_end:
+                max_end = self.tree[i]
+            i -= i & -i
+        return max_end
@@ -0,0 +1,153 @@
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+
+import regex as re
+
+from guardian_analyzer import EntityRecognizer, PatternRecognizer, RecognizerResult
+from guardian_analyzer.pattern_prefilter import PatternPrefilter, TextFeatures
+
+logger = logging.getLogger("guardian-analyzer")
+
+
+class FusedPatternMatcher:
+    """
+    Match the patterns of many PatternRecognizers in a single pass per regex.
+
+    The patterns of all given recognizers are compiled once into a scan plan
+    which holds every distinct (regex, flags) pair only once, no matter how
+    many recognizers or languages share it. Each distinct regex runs over the
+    text a single time, unless its prefilter rules out a match,
+    and its matches are handed back to every recognizer
+    owning it, which validates and invalidates them exactly as
+    `PatternRecognizer.analyze` would. Results are therefore identical to
+    calling `analyze` on each recognizer separately.
+
+    Only recognizers relying on the default `PatternRecognizer.analyze` are
+    fused, recognizers overriding it are left to the caller.
+    A matcher can be shared by threads analyzing texts concurrently.
+
+    :param max_plans: Number of scan plans (one per set of recognizers)
+    to keep compiled
+    """
+
+    def __init__(self, max_plans: int = 32):
+        self.max_plans = max_plans
+        self._plans = OrderedDict()
+        self._plans_lock = threading.Lock()
+
+    @staticmethod
+    def is_fusable(recognizer: EntityRecognizer) -> bool:
+        """
+        Return True if the recognizer's matching can be done by this matcher.
+
+        :param recognizer: The recognizer to check
+        """
+        return (
+            isinstance(recognizer, PatternRecognizer)
+            and type(recognizer).analyze is PatternRecognizer.analyze
+            and bool(recognizer.patterns)
+        )
+
+    def analyze(
+        self,
+        text: str,
+        recognizers: List[EntityRecognizer],
+        executor: Optional[Executor] = None,
+    ) -> Dict[str, List[RecognizerResult]]:
+        """
+        Run the patterns of all fusable recognizers over the text.
+
+        :param text: Text to analyze
+        :param recognizers: Recognizers to run, non fusable ones are ignored
+        :param executor: Thread pool to run the regexes on in parallel,
+        releasing the GIL while matching. If None, they run in this thread.
+        :return: Dictionary of recognizer id to the recognizer's results
+        """
+        fusable = [rec for rec in recognizers if self.is_fusable(rec)]
+        if not fusable:
+            return {}
+
+        compiled_regexes, prefilters, owners = self._get_plan(fusable)
+
+        text_features = TextFeatures(text)
+        to_match = [
+            i
+            for i, prefilter in enumerate(prefilters)
+            if prefilter is None or prefilter.may_match(text_features)
+        ]
+
+        def find_spans(i: int) -> List[Tuple[int, int]]:
+            matches = compiled_regexes[i].finditer(text, concurrent=bool(executor))
+            return [match.span() for match in matches]
+
+        spans = [[] for _ in compiled_regexes]
+        run = executor.map if executor else map
+        for i, regex_spans in zip(to_match, run(find_spans, to_match)):
+            spans[i] = regex_spans
+
+        results = {}
+        for recognizer, flags, pattern_indices in owners:
+            pattern_matches = [(pattern, spans[i]) for pattern, i in pattern_indices]
+            results[recognizer.id] = recognizer.analyze_pattern_matches(
+                text=text, pattern_matches=pattern_matches, flags=flags
+            )
+
+        return results
+
+    def _get_plan(self, recognizers: List[PatternRecognizer]) -> Tuple:
+        key = tuple(
+            (
+                recognizer.id,
+                recognizer.global_regex_flags,
+                tuple((id(pattern), pattern.regex) for pattern in recognizer.patterns),
+            )
+            for recognizer in recognizers
+        )
+
+        with self._plans_lock:
+            plan = self._plans.get(key)
+            if plan:
+                self._plans.move_to_end(key)
+                return plan
+
+        # Built unlocked, threads missing the same plan may each build it
+        plan = self._build_plan(recognizers)
+        with self._plans_lock:
+            self._plans[key] = plan
+            if len(self._plans) > self.max_plans:
+                self._plans.popitem(last=False)
+        return plan
+
+    @staticmethod
+    def _build_plan(recognizers: List[PatternRecognizer]) -> Tuple:
+        """
+        Compile the distinct regexes of the recognizers.
+
+        :return: A tuple of the compiled regexes, their prefilters and,
+        per recognizer, the flags and the index of each of its patterns' regex
+        """
+        regex_indices = {}
+        compiled_regexes = []
+        prefilters = []
+        owners = []
+        for recognizer in recognizers:
+            flags = recognizer.global_regex_flags
+            pattern_indices = []
+            for pattern in recognizer.patterns:
+                regex_key = (pattern.regex, flags)
+                if regex_key not in regex_indices:
+                    regex_indices[regex_key] = len(compiled_regexes)
+                    compiled_regexes.append(re.compile(pattern.regex, flags=flags))
+                    prefilters.append(PatternPrefilter.from_regex(pattern.regex, flags))
+                pattern_indices.append((pattern, regex_indices[regex_key]))
+            owners.append((recognizer, flags, pattern_indices))
+
+        logger.debug(
+            "Fused %s patterns into %s distinct regexes",
+            sum(len(rec.patterns) for rec in recognizers),
+            len(compiled_regexes),
+        )
+        return compiled_regexes, prefilters, owners
@@ -2,19 +2,23 @@
 
 from .ner_model_configuration import NerModelConfiguration
 from .nlp_artifacts import NlpArtifacts
+from .nlp_artifacts_cache import NlpArtifactsCache
 from .nlp_engine import NlpEngine
 from .spacy_nlp_engine import SpacyNlpEngine
 from .stanza_nlp_engine import StanzaNlpEngine
 from .transformers_nlp_engine import TransformersNlpEngine
 
+from .micro_batching_nlp_engine import MicroBatchingNlpEngine  # isort:skip
 from .nlp_engine_provider import NlpEngineProvider  # isort:skip
 
 __all__ = [
     "NerModelConfiguration",
     "NlpArtifacts",
+    "NlpArtifactsCache",
     "NlpEngine",
     "SpacyNlpEngine",
     "StanzaNlpEngine",
     "NlpEngineProvider",
+    "MicroBatchingNlpEngine",
     "TransformersNlpEngine",
 ]
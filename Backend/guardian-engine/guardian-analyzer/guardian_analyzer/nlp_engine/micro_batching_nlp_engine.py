@@ -0,0 +1,209 @@
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Collection, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from guardian_analyzer.nlp_engine import NlpArtifacts, NlpEngine
+
+logger = logging.getLogger("guardian-analyzer")
+
+
+class _PendingText:
+    """A text waiting for its NlpArtifacts, of the whole pipeline if no artifacts."""
+
+    def __init__(
+        self, text: str, language: str, artifacts: Optional[FrozenSet[str]] = None
+    ):
+        self.text = text
+        self.language = language
+        self.artifacts = artifacts
+        self.nlp_artifacts = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class MicroBatchingNlpEngine(NlpEngine):
+    """
+    NlpEngine grouping concurrent process_text calls into process_batch calls.
+
+    Texts sent from different threads (e.g. concurrent HTTP requests) within
+    a short window are processed together by the wrapped engine's
+    process_batch, amortizing the model cost over the batch.
+    Texts processed partially are batched with the texts needing the same
+    artifacts, using process_batch_partially.
+    Each caller blocks until the batch holding its text is processed.
+    All other methods are delegated to the wrapped engine.
+
+    :param nlp_engine: The NlpEngine doing the actual processing
+    :param max_batch_size: Maximum number of texts in a batch
+    :param max_wait_ms: Time to wait for more texts after the first text
+    of a batch arrived
+    """
+
+    def __init__(
+        self,
+        nlp_engine: NlpEngine,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5,
+    ):
+        self.nlp_engine = nlp_engine
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue = None
+        self._worker = None
+        self._worker_pid = None
+        self._worker_lock = threading.Lock()
+
+    def load(self) -> None:
+        """Load the wrapped engine."""
+        self.nlp_engine.load()
+
+    def is_loaded(self) -> bool:
+        """Return True if the wrapped engine is loaded."""
+        return self.nlp_engine.is_loaded()
+
+    def process_text(self, text: str, language: str) -> NlpArtifacts:
+        """
+        Process the text as part of the next batch of the wrapped engine.
+
+        :param text: the text to analyze
+        :param language: the language of the text
+        :return: the text's NlpArtifacts
+        """
+        return self._process_pending(_PendingText(text, language))
+
+    def process_text_partially(
+        self, text: str, language: str, artifacts: Collection[str]
+    ) -> NlpArtifacts:
+        """
+        Process the text as part of the next partial batch of the wrapped engine.
+
+        :param text: the text to analyze
+        :param language: the language of the text
+        :param artifacts: The NlpArtifacts attributes needed besides the tokens,
+        "entities" and/or "lemmas"
+        :return: the text's NlpArtifacts
+        """
+        return self._process_pending(_PendingText(text, language, frozenset(artifacts)))
+
+    def process_batch(
+        self, texts: Iterable[str], language: str, **kwargs
+    ) -> Iterator[Tuple[str, NlpArtifacts]]:
+        """Execute the wrapped engine's batch processing directly."""
+        return self.nlp_engine.process_batch(texts=texts, language=language, **kwargs)
+
+    def process_batch_partially(
+        self,
+        texts: Iterable[str],
+        language: str,
+        artifacts: Collection[str],
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Tuple[str, NlpArtifacts]]:
+        """Execute the wrapped engine's partial batch processing directly."""
+        return self.nlp_engine.process_batch_partially(
+            texts=texts, language=language, artifacts=artifacts, batch_size=batch_size
+        )
+
+    def is_stopword(self, word: str, language: str) -> bool:
+        """Return true if the given word is a stop word."""
+        return self.nlp_engine.is_stopword(word, language)
+
+    def is_punct(self, word: str, language: str) -> bool:
+        """Return true if the given word is a punctuation word."""
+        return self.nlp_engine.is_punct(word, language)
+
+    def get_supported_entities(self) -> List[str]:
+        """Return the supported entities of the wrapped engine."""
+        return self.nlp_engine.get_supported_entities()
+
+    def get_supported_languages(self) -> List[str]:
+        """Return the supported languages of the wrapped engine."""
+        return self.nlp_engine.get_supported_languages()
+
+    def __getattr__(self, name: str):
+        """Delegate engine specific attributes, e.g. get_nlp, to the wrapped engine."""
+        if name == "nlp_engine":
+            raise AttributeError(name)
+        return getattr(self.nlp_engine, name)
+
+    def _process_pending(self, pending: _PendingText) -> NlpArtifacts:
+        self._ensure_worker()
+
+        self._queue.put(pending)
+        pending.done.wait()
+
+        if pending.error:
+            raise pending.error
+        return pending.nlp_artifacts
+
+    def _ensure_worker(self) -> None:
+        # The worker thread doesn't survive a fork, so forked processes
+        # (e.g. PDF page workers) start their own
+        if self._worker_pid == os.getpid():
+            return
+        with self._worker_lock:
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+                self._worker = threading.Thread(
+                    target=self._run,
+                    args=(self._queue,),
+                    name="nlp-micro-batcher",
+                    daemon=True,
+                )
+                self._worker.start()
+                self._worker_pid = os.getpid()
+
+    def _run(self, pending_queue: queue.Queue) -> None:
+        while True:
+            batch = [pending_queue.get()]
+            deadline = time.monotonic() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(pending_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            self._process(batch)
+
+    def _process(self, batch: List[_PendingText]) -> None:
+        by_language = {}
+        for pending in batch:
+            key = (pending.language, pending.artifacts)
+            by_language.setdefault(key, []).append(pending)
+
+        for (language, artifacts), pending_texts in by_language.items():
+            logger.debug(
+                "Processing a batch of %s texts in %s", len(pending_texts), language
+            )
+            texts = [pending.text for pending in pending_texts]
+            try:
+                if artifacts is None:
+                    nlp_artifacts_batch = self.nlp_engine.process_batch(
+                        texts=texts, language=language, batch_size=len(texts)
+                    )
+                else:
+                    nlp_artifacts_batch = self.nlp_engine.process_batch_partially(
+                        texts=texts,
+                        language=language,
+                        artifacts=artifacts,
+                        batch_size=len(texts),
+                    )
+                for pending, (_, nlp_artifacts) in zip(
+                    pending_texts, nlp_artifacts_batch
+                ):
+                    pending.nlp_artifacts = nlp_artifacts
+                if any(pending.nlp_artifacts is None for pending in pending_texts):
+                    raise ValueError("NLP engine returned fewer results than texts")
+            except Exception as e:
+                logger.error(f"Failed processing a batch of texts: {e}")
+                for pending in pending_texts:
+                    pending.error = e
+            finally:
+                for pending in pending_texts:
+                    pending.done.set()
@@ -0,0 +1,68 @@
+import hashlib
+import sys
+from typing import Collection, FrozenSet, Optional, Tuple
+
+from guardian_analyzer.nlp_engine import NlpArtifacts
+from guardian_analyzer.size_bounded_lru_cache import SizeBoundedLruCache
+
+
+class NlpArtifactsCache(SizeBoundedLruCache):
+    """
+    Byte bounded LRU cache of NlpArtifacts, keyed by language and a text hash.
+
+    Lets an NlpEngine return the artifacts of a text it already processed
+    without running its models again. Cached artifacts are shared between
+    callers and should be treated as read only. Artifacts of a partial run
+    of the pipeline are keyed by the artifacts it produced as well.
+
+    :param max_size_bytes: Approximate upper bound on the memory taken by
+    the cached artifacts. Least recently used artifacts are evicted first.
+    """
+
+    # Approximate memory taken by a spaCy token, its lemma and index
+    TOKEN_SIZE_ESTIMATE = 300
+
+    def __init__(self, max_size_bytes: int):
+        super().__init__(max_size_bytes=max_size_bytes)
+
+    @staticmethod
+    def get_key(
+        text: str, language: str, artifacts: Optional[Collection[str]] = None
+    ) -> Tuple[str, bytes, int, Optional[FrozenSet[str]]]:
+        """
+        Return the cache key of a text in a given language.
+
+        :param text: the processed text
+        :param language: the language of the text
+        :param artifacts: the artifacts produced by a partial run of the
+        pipeline, or None for the whole pipeline
+        """
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        if artifacts is not None:
+            artifacts = frozenset(artifacts)
+        return language, digest, len(text), artifacts
+
+    def get(
+        self, text: str, language: str, artifacts: Optional[Collection[str]] = None
+    ) -> Optional[NlpArtifacts]:
+        """Return the cached artifacts of the text, or None."""
+        return self._lookup(self.get_key(text, language, artifacts))
+
+    def put(
+        self,
+        text: str,
+        language: str,
+        nlp_artifacts: NlpArtifacts,
+        artifacts: Optional[Collection[str]] = None,
+    ) -> None:
+        """Cache the artifacts of the text, evicting least recently used ones."""
+        size = self._estimate_size(text, nlp_artifacts)
+        self._store(self.get_key(text, language, artifacts), nlp_artifacts, size)
+
+    @classmethod
+    def _estimate_size(cls, text: str, nlp_artifacts: NlpArtifacts) -> int:
+        size = sys.getsizeof(text)
+        size += len(nlp_artifacts.tokens_indices) * cls.TOKEN_SIZE_ESTIMATE
+        tensor = getattr(nlp_artifacts.tokens, "tensor", None)
+        size += getattr(tensor, "nbytes", 0)
+        return size
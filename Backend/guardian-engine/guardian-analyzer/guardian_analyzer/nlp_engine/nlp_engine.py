@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Iterable, Iterator, List, Optional, Tuple
+from typing import Collection, Iterable, Iterator, List, Optional, Tuple
 
 from guardian_analyzer.nlp_engine import NlpArtifacts
 
@@ -24,6 +24,42 @@ class NlpEngine(ABC):
     def process_text(self, text: str, language: str) -> NlpArtifacts:
         """Execute the NLP pipeline on the given text and language."""
 
+    def process_text_partially(
+        self, text: str, language: str, artifacts: Collection[str]
+    ) -> NlpArtifacts:
+        """
+        Execute the parts of the NLP pipeline producing the given artifacts.
+
+        Engines which can't run part of their pipeline run all of it.
+
+        :param text: the text to process
+        :param language: the language of the text
+        :param artifacts: The NlpArtifacts attributes needed besides the tokens,
+        "entities" and/or "lemmas". Other attributes may be left empty.
+        """
+        return self.process_text(text, language)
+
+    def process_batch_partially(
+        self,
+        texts: Iterable[str],
+        language: str,
+        artifacts: Collection[str],
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Tuple[str, NlpArtifacts]]:
+        """
+        Execute the parts of the NLP pipeline producing the given artifacts on texts.
+
+        Engines which can't run part of their pipeline run all of it.
+
+        :param texts: the texts to process
+        :param language: the language of the texts
+        :param artifacts: The NlpArtifacts attributes needed besides the tokens,
+        "entities" and/or "lemmas". Other attributes may be left empty.
+        :param batch_size: the number of texts to process at once
+        :return: a tuple of (text, NlpArtifacts) per text
+        """
+        return self.process_batch(texts, language, batch_size=batch_size)
+
     @abstractmethod
     def process_batch(
         self,
@@ -1,7 +1,6 @@
 import logging
 from pathlib import Path
 from typing import Dict, Optional, Tuple, Union
-import transformers
 
 import yaml
 
@@ -79,7 +78,6 @@ class NlpEngineProvider:
             )
         nlp_engine_name = self.nlp_configuration["nlp_engine_name"]
         if nlp_engine_name not in self.nlp_engines:
-            print("Transformers module found:", transformers.__version__)
             raise ValueError(
                 f"NLP engine '{nlp_engine_name}' is not available. "
                 "Make sure you have all required packages installed"
@@ -96,8 +94,16 @@ class NlpEngineProvider:
                     ner_model_configuration
                 )
 
+            engine_kwargs = {}
+            if "artifacts_cache_size_bytes" in self.nlp_configuration:
+                engine_kwargs["artifacts_cache_size_bytes"] = self.nlp_configuration[
+                    "artifacts_cache_size_bytes"
+                ]
+
             engine = nlp_engine_class(
-                models=nlp_models, ner_model_configuration=ner_model_configuration
+                models=nlp_models,
+                ner_model_configuration=ner_model_configuration,
+                **engine_kwargs,
             )
             engine.load()
             logger.info(
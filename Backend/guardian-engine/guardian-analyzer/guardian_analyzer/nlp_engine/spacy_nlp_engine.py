@@ -1,12 +1,30 @@
+from __future__ import annotations
+
+import importlib.util
 import logging
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Tuple, Union
-
-import spacy
-from spacy.language import Language
-from spacy.tokens import Doc, Span
-
-from guardian_analyzer.nlp_engine import NerModelConfiguration, NlpArtifacts, NlpEngine
+from typing import (
+    TYPE_CHECKING,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from guardian_analyzer.nlp_engine import (
+    NerModelConfiguration,
+    NlpArtifacts,
+    NlpArtifactsCache,
+    NlpEngine,
+)
+
+if TYPE_CHECKING:
+    from spacy.language import Language
+    from spacy.tokens import Doc, Span
 
 logger = logging.getLogger("guardian-analyzer")
 
@@ -21,12 +39,25 @@ class SpacyNlpEngine(NlpEngine):
     """
 
     engine_name = "spacy"
-    is_available = bool(spacy)
+    # spaCy is imported when the models are loaded, as importing it takes
+    # most of the package's import time
+    is_available = importlib.util.find_spec("spacy") is not None
+
+    # Pipeline components producing each artifact, disabled when processing
+    # a text for other artifacts only. Components no artifact depends on
+    # (e.g. the parser) are always disabled then, shared ones (e.g. tok2vec)
+    # never are.
+    ARTIFACT_COMPONENTS = {
+        "entities": ("ner", "entity_ruler", "span_ruler", "hf_token_pipe"),
+        "lemmas": ("tagger", "morphologizer", "attribute_ruler", "lemmatizer"),
+    }
+    UNUSED_COMPONENTS = ("parser", "senter")
 
     def __init__(
         self,
         models: Optional[List[Dict[str, str]]] = None,
         ner_model_configuration: Optional[NerModelConfiguration] = None,
+        artifacts_cache_size_bytes: int = 0,
     ):
         """
         Initialize a wrapper on spaCy functionality.
@@ -35,6 +66,9 @@ class SpacyNlpEngine(NlpEngine):
         For example: models = [{"lang_code": "en", "model_name": "en_core_web_lg"}]
         :param ner_model_configuration: Parameters for the NER model.
         See conf/spacy.yaml for an example
+        :param artifacts_cache_size_bytes: Memory budget for caching the
+        NlpArtifacts of processed texts, so that processing the same text again
+        skips the models. 0 disables the cache.
         """
         if not models:
             models = [{"lang_code": "en", "model_name": "en_core_web_lg"}]
@@ -44,10 +78,18 @@ class SpacyNlpEngine(NlpEngine):
             ner_model_configuration = NerModelConfiguration()
         self.ner_model_configuration = ner_model_configuration
 
+        self.artifacts_cache = (
+            NlpArtifactsCache(max_size_bytes=artifacts_cache_size_bytes)
+            if artifacts_cache_size_bytes
+            else None
+        )
+
         self.nlp = None
 
     def load(self) -> None:
         """Load the spaCy NLP model."""
+        import spacy
+
         logger.debug(f"Loading SpaCy models: {self.models}")
 
         self.nlp = {}
@@ -59,6 +101,8 @@ class SpacyNlpEngine(NlpEngine):
 
     @staticmethod
     def _download_spacy_model_if_needed(model_name: str) -> None:
+        import spacy
+
         if not (spacy.util.is_package(model_name) or Path(model_name).exists()):
             logger.warning(f"Model {model_name} is not installed. Downloading...")
             spacy.cli.download(model_name)
@@ -104,8 +148,129 @@ class SpacyNlpEngine(NlpEngine):
         if not self.nlp:
             raise ValueError("NLP engine is not loaded. Consider calling .load()")
 
+        if self.artifacts_cache is not None:
+            nlp_artifacts = self.artifacts_cache.get(text, language)
+            if nlp_artifacts is not None:
+                return nlp_artifacts
+
         doc = self.nlp[language](text)
-        return self._doc_to_nlp_artifact(doc, language)
+        nlp_artifacts = self._doc_to_nlp_artifact(doc, language)
+
+        if self.artifacts_cache is not None:
+            self.artifacts_cache.put(text, language, nlp_artifacts)
+        return nlp_artifacts
+
+    def process_text_partially(
+        self, text: str, language: str, artifacts: Collection[str]
+    ) -> NlpArtifacts:
+        """
+        Execute the spaCy pipeline components producing the given artifacts.
+
+        :param text: the text to process
+        :param language: the language of the text
+        :param artifacts: The NlpArtifacts attributes needed besides the tokens,
+        "entities" and/or "lemmas". Other attributes may be left empty.
+        """
+        if not self.nlp:
+            raise ValueError("NLP engine is not loaded. Consider calling .load()")
+
+        nlp_artifacts = self._get_cached_partially(text, language, artifacts)
+        if nlp_artifacts is not None:
+            return nlp_artifacts
+
+        disable = self._get_disabled_components(language, artifacts)
+        # Disabled for this call only, unlike nlp.select_pipes
+        doc = self.nlp[language](text, disable=disable)
+        nlp_artifacts = self._doc_to_nlp_artifact(
+            doc, language, with_entities="entities" in artifacts
+        )
+        self._cache_partially(text, language, artifacts, disable, nlp_artifacts)
+        return nlp_artifacts
+
+    def process_batch_partially(
+        self,
+        texts: Iterable[str],
+        language: str,
+        artifacts: Collection[str],
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Tuple[str, NlpArtifacts]]:
+        """
+        Execute the spaCy pipeline components producing the given artifacts on texts.
+
+        :param texts: the texts to process
+        :param language: the language of the texts
+        :param artifacts: The NlpArtifacts attributes needed besides the tokens,
+        "entities" and/or "lemmas". Other attributes may be left empty.
+        :param batch_size: the number of texts spacy pipe processes at once
+        """
+        if not self.nlp:
+            raise ValueError("NLP engine is not loaded. Consider calling .load()")
+
+        texts = [str(text) for text in texts]
+        cached = [
+            self._get_cached_partially(text, language, artifacts) for text in texts
+        ]
+        missing = [
+            text for text, nlp_artifacts in zip(texts, cached) if nlp_artifacts is None
+        ]
+
+        disable = self._get_disabled_components(language, artifacts)
+        docs = self.nlp[language].pipe(missing, batch_size=batch_size, disable=disable)
+        for text, nlp_artifacts in zip(texts, cached):
+            if nlp_artifacts is None:
+                nlp_artifacts = self._doc_to_nlp_artifact(
+                    next(docs), language, with_entities="entities" in artifacts
+                )
+                self._cache_partially(text, language, artifacts, disable, nlp_artifacts)
+            yield text, nlp_artifacts
+
+    def _get_cached_partially(
+        self, text: str, language: str, artifacts: Collection[str]
+    ) -> Optional[NlpArtifacts]:
+        """Return cached artifacts of the whole pipeline or of the same partial run."""
+        if self.artifacts_cache is None:
+            return None
+        # Artifacts of the whole pipeline hold the partial ones
+        nlp_artifacts = self.artifacts_cache.get(text, language)
+        if nlp_artifacts is None:
+            nlp_artifacts = self.artifacts_cache.get(text, language, artifacts)
+        return nlp_artifacts
+
+    def _cache_partially(
+        self,
+        text: str,
+        language: str,
+        artifacts: Collection[str],
+        disabled_components: List[str],
+        nlp_artifacts: NlpArtifacts,
+    ) -> None:
+        """Cache the artifacts of a partial run, keyed by the artifacts produced."""
+        if self.artifacts_cache is None:
+            return
+        self.artifacts_cache.put(text, language, nlp_artifacts, artifacts)
+        # With no component disabled and the entities extracted,
+        # they are the artifacts of the whole pipeline
+        if not disabled_components and "entities" in artifacts:
+            self.artifacts_cache.put(text, language, nlp_artifacts)
+
+    def _get_disabled_components(
+        self, language: str, artifacts: Collection[str]
+    ) -> List[str]:
+        """Return the pipeline components not needed for the given artifacts."""
+        return [
+            name
+            for name in self.nlp[language].pipe_names
+            if self._get_component_artifact(name) not in (*artifacts, None)
+        ]
+
+    def _get_component_artifact(self, component_name: str) -> Optional[str]:
+        """Return the artifact a component produces, "" if none, None if unknown."""
+        if component_name in self.UNUSED_COMPONENTS:
+            return ""
+        for artifact, component_names in self.ARTIFACT_COMPONENTS.items():
+            if component_name in component_names:
+                return artifact
+        return None
 
     def process_batch(
         self,
@@ -126,6 +291,10 @@ class SpacyNlpEngine(NlpEngine):
         if not self.nlp:
             raise ValueError("NLP engine is not loaded. Consider calling .load()")
 
+        if self.artifacts_cache is not None and not as_tuples:
+            yield from self._process_batch_with_cache(texts, language, batch_size)
+            return
+
         texts = (str(text) for text in texts)
         docs = self.nlp[language].pipe(
             texts, as_tuples=as_tuples, batch_size=batch_size
@@ -133,6 +302,21 @@ class SpacyNlpEngine(NlpEngine):
         for doc in docs:
             yield doc.text, self._doc_to_nlp_artifact(doc, language)
 
+    def _process_batch_with_cache(
+        self, texts: List[str], language: str, batch_size: Optional[int]
+    ) -> Iterator[Tuple[str, NlpArtifacts]]:
+        """Run spacy pipe only on the texts missing from the artifacts cache."""
+        texts = [str(text) for text in texts]
+        cached = [self.artifacts_cache.get(text, language) for text in texts]
+        missing = [text for text, artifacts in zip(texts, cached) if artifacts is None]
+
+        docs = self.nlp[language].pipe(missing, batch_size=batch_size)
+        for text, nlp_artifacts in zip(texts, cached):
+            if nlp_artifacts is None:
+                nlp_artifacts = self._doc_to_nlp_artifact(next(docs), language)
+                self.artifacts_cache.put(text, language, nlp_artifacts)
+            yield text, nlp_artifacts
+
     def is_stopword(self, word: str, language: str) -> bool:
         """
         Return true if the given word is a stop word.
@@ -158,14 +342,18 @@ class SpacyNlpEngine(NlpEngine):
         """
         return self.nlp[language]
 
-    def _doc_to_nlp_artifact(self, doc: Doc, language: str) -> NlpArtifacts:
+    def _doc_to_nlp_artifact(
+        self, doc: Doc, language: str, with_entities: bool = True
+    ) -> NlpArtifacts:
         lemmas = [token.lemma_ for token in doc]
         tokens_indices = [token.idx for token in doc]
 
-        entities = self._get_entities(doc)
-        scores = self._get_scores_for_entities(doc)
-
-        entities, scores = self._get_updated_entities(entities, scores)
+        if with_entities:
+            entities = self._get_entities(doc)
+            scores = self._get_scores_for_entities(doc)
+            entities, scores = self._get_updated_entities(entities, scores)
+        else:
+            entities, scores = [], []
 
         return NlpArtifacts(
             entities=entities,
@@ -1,12 +1,7 @@
+import importlib.util
 import logging
 from typing import Dict, List, Optional
 
-try:
-    import spacy_stanza
-    import stanza
-except ImportError:
-    stanza = None
-
 from guardian_analyzer.nlp_engine import NerModelConfiguration, SpacyNlpEngine
 
 logger = logging.getLogger("guardian-analyzer")
@@ -24,23 +19,31 @@ class StanzaNlpEngine(SpacyNlpEngine):
     For example: models = [{"lang_code": "en", "model_name": "en"}]
     :param ner_model_configuration: Parameters for the NER model.
     See conf/stanza.yaml for an example
+    :param artifacts_cache_size_bytes: Memory budget for caching the
+    NlpArtifacts of processed texts. 0 disables the cache.
 
     """
 
     engine_name = "stanza"
-    is_available = bool(stanza)
+    # Stanza is imported when the models are loaded
+    is_available = all(
+        importlib.util.find_spec(package) is not None
+        for package in ("stanza", "spacy_stanza")
+    )
 
     def __init__(
         self,
         models: Optional[List[Dict[str, str]]] = None,
         ner_model_configuration: Optional[NerModelConfiguration] = None,
         download_if_missing: bool = True,
+        artifacts_cache_size_bytes: int = 0,
     ):
-        super().__init__(models, ner_model_configuration)
+        super().__init__(models, ner_model_configuration, artifacts_cache_size_bytes)
         self.download_if_missing = download_if_missing
 
     def load(self) -> None:
         """Load the NLP model."""
+        import spacy_stanza
 
         logger.debug(f"Loading Stanza models: {self.models}")
 
@@ -1,21 +1,17 @@
-import logging
-from typing import Dict, List, Optional
-
-import spacy
-from spacy.tokens import Doc, Span
+from __future__ import annotations
 
-try:
-    import spacy_huggingface_pipelines
-    import transformers
-except ImportError:
-    spacy_huggingface_pipelines = None
-    transformers = None
+import importlib.util
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 from guardian_analyzer.nlp_engine import (
     NerModelConfiguration,
     SpacyNlpEngine,
 )
 
+if TYPE_CHECKING:
+    from spacy.tokens import Doc, Span
+
 logger = logging.getLogger("guardian-analyzer")
 
 
@@ -38,6 +34,8 @@ class TransformersNlpEngine(SpacyNlpEngine):
     }]
     :param ner_model_configuration: Parameters for the NER model.
     See conf/transformers.yaml for an example
+    :param artifacts_cache_size_bytes: Memory budget for caching the
+    NlpArtifacts of processed texts. 0 disables the cache.
 
 
     Note that since the spaCy model is not used for NER,
@@ -50,12 +48,17 @@ class TransformersNlpEngine(SpacyNlpEngine):
     """
 
     engine_name = "transformers"
-    is_available = bool(spacy_huggingface_pipelines)
+    # The transformers packages are imported when the models are loaded
+    is_available = all(
+        importlib.util.find_spec(package) is not None
+        for package in ("spacy_huggingface_pipelines", "transformers")
+    )
 
     def __init__(
         self,
         models: Optional[List[Dict]] = None,
         ner_model_configuration: Optional[NerModelConfiguration] = None,
+        artifacts_cache_size_bytes: int = 0,
     ):
         if not models:
             models = [
@@ -74,11 +77,17 @@ class TransformersNlpEngine(SpacyNlpEngine):
                     },
                 },
             ]
-        super().__init__(models=models, ner_model_configuration=ner_model_configuration)
+        super().__init__(
+            models=models,
+            ner_model_configuration=ner_model_configuration,
+            artifacts_cache_size_bytes=artifacts_cache_size_bytes,
+        )
         self.entity_key = "bert-base-ner"
 
     def load(self) -> None:
         """Load the spaCy and transformers models."""
+        import spacy
+        import spacy_huggingface_pipelines  # noqa F401, registers hf_token_pipe
 
         logger.debug(f"Loading SpaCy and transformers models: {self.models}")
         self.nlp = {}
@@ -17,6 +17,7 @@ class Pattern:
         self.score = score
         self.compiled_regex = None
         self.compiled_with_flags = None
+        self.prefilter = None
 
     def to_dict(self) -> Dict:
         """
@@ -37,6 +38,12 @@ class Pattern:
         """
         return cls(**pattern_dict)
 
+    def __getstate__(self) -> Dict:
+        """Return the state to pickle, leaving the regex to be compiled on use."""
+        state = self.__dict__.copy()
+        state["compiled_regex"] = None
+        return state
+
     def __repr__(self):
         """Return string representation of instance."""
         return json.dumps(self.to_dict())
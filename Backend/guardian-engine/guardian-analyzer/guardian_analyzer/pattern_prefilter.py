@@ -0,0 +1,348 @@
+import logging
+import re
+import threading
+import warnings
+from typing import FrozenSet, List, Optional, Union
+
+import regex
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+logger = logging.getLogger("guardian-analyzer")
+
+
+class _AnyDigit:
+    r"""Requirement alternative satisfied by any decimal digit (\d)."""
+
+    def __repr__(self):
+        return "\\d"
+
+    def __reduce__(self):
+        # Unpickle as the ANY_DIGIT singleton, which requirements are compared to
+        return "ANY_DIGIT"
+
+
+ANY_DIGIT = _AnyDigit()
+
+Alternative = Union[str, _AnyDigit]
+
+# Non ASCII characters matching ASCII letters in case insensitive regexes
+_ASCII_CASE_FOLDS = str.maketrans(
+    {"İ": "i", "ı": "i", "ſ": "s", "K": "k"}
+)
+
+_DIGIT_REGEX = regex.compile(r"\d")
+
+# Flags sre_parse and the regex package interpret the same way
+_SUPPORTED_FLAGS = (
+    re.IGNORECASE | re.MULTILINE | re.DOTALL | re.VERBOSE | re.ASCII | re.UNICODE
+)
+
+_REPEATS = {
+    sre_parse.MAX_REPEAT,
+    sre_parse.MIN_REPEAT,
+    getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT),
+}
+
+# Character classes enumerating more characters are too common to be worth checking
+_MAX_CLASS_SIZE = 16
+
+
+class _UnsupportedRegexError(Exception):
+    """Raised for regexes whose requirements can't be derived safely."""
+
+
+class TextFeatures:
+    """
+    Features of a text checked by pattern prefilters, computed on demand.
+
+    Each requirement is checked once, so patterns sharing requirements
+    (e.g. digits) only cost a single lookup.
+
+    :param text: The text to be matched by the patterns
+    """
+
+    _local = threading.local()
+
+    def __init__(self, text: str):
+        self.text = text
+        self._folded_text = None
+        self._chars = {}
+        self._digit = None
+        self._met = {}
+
+    @classmethod
+    def of(cls, text: str) -> "TextFeatures":
+        """
+        Return the features of the text, shared by consecutive calls on it.
+
+        The features of the last text are kept per thread, so the recognizers
+        analyzing the same text one after the other reuse them.
+
+        :param text: The text to be matched by the patterns
+        """
+        features = getattr(cls._local, "features", None)
+        if features is None or features.text is not text:
+            features = cls(text)
+            cls._local.features = features
+        return features
+
+    def meets(
+        self, requirement: FrozenSet[Alternative], ignore_case: bool
+    ) -> bool:
+        """
+        Return True if the text contains one of the requirement's alternatives.
+
+        :param requirement: Literals (lower cased if ignore_case) or ANY_DIGIT
+        :param ignore_case: Whether to compare case insensitively
+        """
+        key = (requirement, ignore_case)
+        met = self._met.get(key)
+        if met is None:
+            met = any(self._contains(alt, ignore_case) for alt in requirement)
+            self._met[key] = met
+        return met
+
+    def _contains(self, alternative: Alternative, ignore_case: bool) -> bool:
+        if alternative is ANY_DIGIT:
+            return self._has_digit()
+        if len(alternative) == 1:
+            return alternative in self._get_chars(ignore_case)
+        return alternative in self._get_text(ignore_case)
+
+    def _has_digit(self) -> bool:
+        if self._digit is None:
+            self._digit = _DIGIT_REGEX.search(self.text) is not None
+        return self._digit
+
+    def _get_text(self, ignore_case: bool) -> str:
+        if not ignore_case:
+            return self.text
+        if self._folded_text is None:
+            text = self.text
+            if not text.isascii():
+                text = text.translate(_ASCII_CASE_FOLDS)
+            self._folded_text = text.lower()
+        return self._folded_text
+
+    def _get_chars(self, ignore_case: bool) -> FrozenSet[str]:
+        chars = self._chars.get(ignore_case)
+        if chars is None:
+            chars = frozenset(self._get_text(ignore_case))
+            self._chars[ignore_case] = chars
+        return chars
+
+
+class PatternPrefilter:
+    """
+    Necessary conditions for a regex to match, checked before running it.
+
+    The conditions are derived from the parsed regex: each requirement
+    is a set of alternatives (literals, characters or any digit),
+    one of which appears in the text whenever the regex matches it.
+    A text failing a requirement can't be matched by the regex,
+    so running it can be skipped.
+    Use `from_regex` to create a prefilter.
+
+    :param requirements: Sets of alternatives, all of which must be met
+    :param ignore_case: Whether the literals are compared case insensitively
+    """
+
+    def __init__(
+        self, requirements: List[FrozenSet[Alternative]], ignore_case: bool
+    ):
+        self.requirements = requirements
+        self.ignore_case = ignore_case
+
+    @classmethod
+    def from_regex(
+        cls, pattern_regex: str, flags: int = 0
+    ) -> Optional["PatternPrefilter"]:
+        """
+        Derive the prefilter of a regex.
+
+        :param pattern_regex: The regex, as given to the regex package
+        :param flags: Flags the regex is compiled with
+        :return: The prefilter, or None if the regex has no derivable requirement
+        """
+        flags = flags or 0
+        if flags & ~_SUPPORTED_FLAGS:
+            return None
+
+        try:
+            # Warnings flag syntax the regex package reads differently,
+            # e.g. nested sets
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                parsed = sre_parse.parse(pattern_regex, flags)
+
+            ignore_case = bool((flags | parsed.state.flags) & re.IGNORECASE)
+            ignore_case = ignore_case or cls._sets_ignore_case(parsed)
+            requirements = cls._get_requirements(parsed, ignore_case)
+        except Exception as e:
+            logger.debug("No prefilter for regex %s: %s", pattern_regex, e)
+            return None
+
+        if not requirements:
+            return None
+
+        requirements = sorted(set(requirements), key=cls._selectivity, reverse=True)
+        return cls(requirements, ignore_case)
+
+    def may_match(self, features: TextFeatures) -> bool:
+        """
+        Return False if the regex can't match the text.
+
+        :param features: Features of the text
+        """
+        for requirement in self.requirements:
+            if not features.meets(requirement, self.ignore_case):
+                return False
+        return True
+
+    def __repr__(self):
+        """Return string representation of instance."""
+        return f"PatternPrefilter({self.requirements}, ignore_case={self.ignore_case})"
+
+    @classmethod
+    def _sets_ignore_case(cls, subpattern) -> bool:
+        for op, av in subpattern:
+            if op is sre_parse.SUBPATTERN and av[1] & re.IGNORECASE:
+                return True
+            for child in cls._children(op, av):
+                if cls._sets_ignore_case(child):
+                    return True
+        return False
+
+    @staticmethod
+    def _children(op, av) -> list:
+        if op is sre_parse.SUBPATTERN:
+            return [av[-1]]
+        if op in _REPEATS:
+            return [av[2]]
+        if op is sre_parse.BRANCH:
+            return av[1]
+        if op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            return [av[1]]
+        if op is sre_parse.GROUPREF_EXISTS:
+            return [item for item in av[1:] if item]
+        if op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            return [av]
+        return []
+
+    @classmethod
+    def _get_requirements(
+        cls, subpattern, ignore_case: bool
+    ) -> List[FrozenSet[Alternative]]:
+        """Return the requirements met by every match of a parsed subpattern."""
+        requirements = []
+        literal = []
+
+        for op, av in subpattern:
+            if op is sre_parse.LITERAL:
+                if av == ord("{"):
+                    # Likely a fuzzy matching constraint of the regex package,
+                    # which sre_parse reads as literal characters
+                    raise _UnsupportedRegexError("literal brace")
+                char = cls._literal_char(av, ignore_case)
+                if char is not None:
+                    literal.append(char)
+                    continue
+
+            if literal:
+                requirements.append(frozenset(["".join(literal)]))
+                literal = []
+
+            if op is sre_parse.IN:
+                alternatives = cls._class_alternatives(av, ignore_case)
+                if alternatives:
+                    requirements.append(alternatives)
+            elif op in _REPEATS:
+                if av[0] >= 1:
+                    requirements.extend(cls._get_requirements(av[2], ignore_case))
+            elif op is sre_parse.SUBPATTERN:
+                requirements.extend(cls._get_requirements(av[-1], ignore_case))
+            elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+                requirements.extend(cls._get_requirements(av, ignore_case))
+            elif op is sre_parse.BRANCH:
+                alternatives = cls._branch_alternatives(av[1], ignore_case)
+                if alternatives:
+                    requirements.append(alternatives)
+            elif op is sre_parse.ASSERT:
+                # What a lookaround matches isn't part of the match,
+                # but still has to be in the text
+                requirements.extend(cls._get_requirements(av[1], ignore_case))
+            # Negative lookarounds, anchors, back references and unknown
+            # characters don't add requirements
+
+        if literal:
+            requirements.append(frozenset(["".join(literal)]))
+        return requirements
+
+    @classmethod
+    def _branch_alternatives(
+        cls, branches, ignore_case: bool
+    ) -> Optional[FrozenSet[Alternative]]:
+        """Merge the most selective requirement of each branch."""
+        alternatives = set()
+        for branch in branches:
+            requirements = cls._get_requirements(branch, ignore_case)
+            if not requirements:
+                return None
+            alternatives.update(max(requirements, key=cls._selectivity))
+
+        # A literal containing another one is implied by it
+        literals = [alt for alt in alternatives if alt is not ANY_DIGIT]
+        for alt in literals:
+            if any(other != alt and other in alt for other in literals):
+                alternatives.discard(alt)
+        return frozenset(alternatives)
+
+    @staticmethod
+    def _class_alternatives(
+        items, ignore_case: bool
+    ) -> Optional[FrozenSet[Alternative]]:
+        """Return the characters a character class matches, if few enough."""
+        alternatives = set()
+        for op, av in items:
+            if op is sre_parse.LITERAL:
+                codes = [av]
+            elif op is sre_parse.RANGE:
+                if av == (ord("0"), ord("9")):
+                    alternatives.add(ANY_DIGIT)
+                    continue
+                if av[1] - av[0] >= _MAX_CLASS_SIZE:
+                    return None
+                codes = range(av[0], av[1] + 1)
+            elif op is sre_parse.CATEGORY and av is sre_parse.CATEGORY_DIGIT:
+                alternatives.add(ANY_DIGIT)
+                continue
+            else:
+                return None
+
+            for code in codes:
+                char = PatternPrefilter._literal_char(code, ignore_case)
+                if char is None:
+                    return None
+                alternatives.add(char)
+
+        if len(alternatives) > _MAX_CLASS_SIZE:
+            return None
+        return frozenset(alternatives)
+
+    @staticmethod
+    def _literal_char(code: int, ignore_case: bool) -> Optional[str]:
+        char = chr(code)
+        if ignore_case:
+            # Case folding of non ASCII characters differs between
+            # str.lower and the regex package
+            return char.lower() if char.isascii() else None
+        return char
+
+    @staticmethod
+    def _selectivity(alternatives: FrozenSet[Alternative]) -> tuple:
+        shortest = min(1 if alt is ANY_DIGIT else len(alt) for alt in alternatives)
+        return shortest, -len(alternatives)
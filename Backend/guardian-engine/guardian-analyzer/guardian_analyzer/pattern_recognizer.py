@@ -1,6 +1,7 @@
 import datetime
+import functools
 import logging
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import regex as re
 
@@ -12,6 +13,7 @@ from guardian_analyzer import (
     RecognizerResult,
 )
 from guardian_analyzer.nlp_engine import NlpArtifacts
+from guardian_analyzer.pattern_prefilter import PatternPrefilter, TextFeatures
 
 logger = logging.getLogger("guardian-analyzer")
 
@@ -30,6 +32,8 @@ class PatternRecognizer(LocalRecognizer):
     including deny-lists.
     """
 
+    NLP_ARTIFACTS_NEEDED = frozenset()
+
     def __init__(
         self,
         supported_entity: str,
@@ -75,12 +79,38 @@ class PatternRecognizer(LocalRecognizer):
     def load(self):  # noqa D102
         pass
 
+    def prepare_patterns(self, compile_regexes: bool = False) -> None:
+        """
+        Derive the patterns' prefilters for the global regex flags ahead of analysis.
+
+        Used before saving the recognizer, e.g. in a registry snapshot,
+        so the prefilters don't have to be derived again when it is loaded.
+
+        :param compile_regexes: Whether to compile the regexes as well,
+        e.g. in a process forking workers which then share them
+        """
+        for pattern in self.patterns:
+            if pattern.compiled_with_flags != self.global_regex_flags:
+                self._prepare_pattern(pattern, self.global_regex_flags)
+            if compile_regexes and pattern.compiled_regex is None:
+                pattern.compiled_regex = re.compile(
+                    pattern.regex, flags=self.global_regex_flags
+                )
+
+    @staticmethod
+    def _prepare_pattern(pattern: Pattern, flags: int) -> None:
+        # The flags are set last, as they mark the pattern as prepared
+        pattern.compiled_regex = None
+        pattern.prefilter = _get_prefilter(pattern.regex, flags)
+        pattern.compiled_with_flags = flags
+
     def analyze(
         self,
         text: str,
         entities: List[str],
         nlp_artifacts: Optional[NlpArtifacts] = None,
         regex_flags: Optional[int] = None,
+        concurrent: bool = False,
     ) -> List[RecognizerResult]:
         """
         Analyzes text to detect PII using regular expressions or deny-lists.
@@ -89,12 +119,14 @@ class PatternRecognizer(LocalRecognizer):
         :param entities: Entities this recognizer can detect
         :param nlp_artifacts: Output values from the NLP engine
         :param regex_flags: regex flags to be used in regex matching
+        :param concurrent: Whether to release the GIL while matching,
+        so that other threads run meanwhile. Slightly slower otherwise.
         :return:
         """
         results = []
 
         if self.patterns:
-            pattern_result = self.__analyze_patterns(text, regex_flags)
+            pattern_result = self.__analyze_patterns(text, regex_flags, concurrent)
             results.extend(pattern_result)
 
         return results
@@ -172,7 +204,7 @@ class PatternRecognizer(LocalRecognizer):
         return explanation
 
     def __analyze_patterns(
-        self, text: str, flags: int = None
+        self, text: str, flags: int = None, concurrent: bool = False
     ) -> List[RecognizerResult]:
         """
         Evaluate all patterns in the provided text.
@@ -181,19 +213,38 @@ class PatternRecognizer(LocalRecognizer):
 
         :param text: text to analyze
         :param flags: regex flags
+        :param concurrent: Whether to release the GIL while matching
         :return: A list of RecognizerResult
         """
         flags = flags if flags else self.global_regex_flags
+        text_features = TextFeatures.of(text)
         results = []
         for pattern in self.patterns:
             match_start_time = datetime.datetime.now()
 
-            # Compile regex if flags differ from flags the regex was compiled with
-            if not pattern.compiled_regex or pattern.compiled_with_flags != flags:
-                pattern.compiled_with_flags = flags
-                pattern.compiled_regex = re.compile(pattern.regex, flags=flags)
-
-            matches = pattern.compiled_regex.finditer(text)
+            # Patterns are prepared once, for the recognizer's flags.
+            # Patterns prepared for other flags are left as they are,
+            # as other threads may be matching them
+            if pattern.compiled_with_flags is None and flags == self.global_regex_flags:
+                self._prepare_pattern(pattern, flags)
+            if pattern.compiled_with_flags == flags:
+                prefilter = pattern.prefilter
+                compiled_regex = pattern.compiled_regex
+            else:
+                prefilter = _get_prefilter(pattern.regex, flags)
+                compiled_regex = None
+
+            # Skip patterns whose required literals are missing from the text
+            if prefilter and not prefilter.may_match(text_features):
+                continue
+
+            # Compiled on first use, as patterns are pickled without their regex
+            if compiled_regex is None:
+                compiled_regex = re.compile(pattern.regex, flags=flags)
+                if pattern.compiled_with_flags == flags:
+                    pattern.compiled_regex = compiled_regex
+
+            matches = compiled_regex.finditer(text, concurrent=concurrent)
             match_time = datetime.datetime.now() - match_start_time
             logger.debug(
                 "--- match_time[%s]: %s.%s seconds",
@@ -202,56 +253,139 @@ class PatternRecognizer(LocalRecognizer):
                 match_time.microseconds,
             )
 
-            for match in matches:
-                start, end = match.span()
-                current_match = text[start:end]
+            results.extend(
+                self._get_pattern_results(
+                    text, pattern, (match.span() for match in matches), flags
+                )
+            )
 
-                # Skip empty results
-                if current_match == "":
-                    continue
+        results = EntityRecognizer.remove_duplicates(results)
+        return results
 
-                score = pattern.score
+    def analyze_pattern_matches(
+        self,
+        text: str,
+        pattern_matches: List[Tuple[Pattern, Iterable[Tuple[int, int]]]],
+        flags: Optional[int] = None,
+    ) -> List[RecognizerResult]:
+        """
+        Create results out of pattern matches which were found externally.
 
-                validation_result = self.validate_result(current_match)
-                description = self.build_regex_explanation(
-                    self.name,
-                    pattern.name,
-                    pattern.regex,
-                    score,
-                    validation_result,
-                    flags,
-                )
-                pattern_result = RecognizerResult(
-                    entity_type=self.supported_entities[0],
-                    start=start,
-                    end=end,
-                    score=score,
-                    analysis_explanation=description,
-                    recognition_metadata={
-                        RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
-                        RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
-                    },
-                )
+        Runs the same validation, invalidation and deduplication as `analyze`,
+        so matching the patterns elsewhere (e.g. by the FusedPatternMatcher)
+        returns the same results as this recognizer would.
 
-                if validation_result is not None:
-                    if validation_result:
-                        pattern_result.score = EntityRecognizer.MAX_SCORE
-                    else:
-                        pattern_result.score = EntityRecognizer.MIN_SCORE
+        :param text: text the matches were found in
+        :param pattern_matches: (pattern, spans) tuples, one per pattern
+        of this recognizer, in the order of self.patterns
+        :param flags: regex flags the patterns were matched with
+        :return: A list of RecognizerResult
+        """
+        flags = flags if flags else self.global_regex_flags
+        results = []
+        for pattern, spans in pattern_matches:
+            results.extend(self._get_pattern_results(text, pattern, spans, flags))
 
-                invalidation_result = self.invalidate_result(current_match)
-                if invalidation_result is not None and invalidation_result:
-                    pattern_result.score = EntityRecognizer.MIN_SCORE
+        results = EntityRecognizer.remove_duplicates(results)
+        return results
 
-                if pattern_result.score > EntityRecognizer.MIN_SCORE:
-                    results.append(pattern_result)
+    def _get_pattern_results(
+        self,
+        text: str,
+        pattern: Pattern,
+        spans: Iterable[Tuple[int, int]],
+        flags: int,
+    ) -> List[RecognizerResult]:
+        """
+        Turn the spans matched by a single pattern into results.
+
+        :param text: text to analyze
+        :param pattern: the pattern which matched the spans
+        :param spans: (start, end) tuples of the matches
+        :param flags: regex flags
+        :return: A list of RecognizerResult
+        """
+        results = []
+        explanations = {}
+        for start, end in spans:
+            current_match = text[start:end]
+
+            # Skip empty results
+            if current_match == "":
+                continue
+
+            score = pattern.score
+
+            validation_result = self.validate_result(current_match)
+            pattern_result = RecognizerResult(
+                entity_type=self.supported_entities[0],
+                start=start,
+                end=end,
+                score=score,
+                recognition_metadata={
+                    RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                    RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
+                },
+            )
 
-                # Update analysis explanation score following validation or invalidation
-                description.score = pattern_result.score
+            if validation_result is not None:
+                if validation_result:
+                    pattern_result.score = EntityRecognizer.MAX_SCORE
+                else:
+                    pattern_result.score = EntityRecognizer.MIN_SCORE
+
+            invalidation_result = self.invalidate_result(current_match)
+            if invalidation_result is not None and invalidation_result:
+                pattern_result.score = EntityRecognizer.MIN_SCORE
+
+            if pattern_result.score > EntityRecognizer.MIN_SCORE:
+                # The explanation is only created if the decision process is
+                # requested, so a function creating it is passed instead.
+                # The function only depends on the score and validation result,
+                # so it's shared by the matches having the same ones.
+                explanation_key = (pattern_result.score, validation_result)
+                explanation = explanations.get(explanation_key)
+                if explanation is None:
+                    explanation = functools.partial(
+                        self._build_pattern_explanation,
+                        pattern,
+                        pattern_result.score,
+                        validation_result,
+                        flags,
+                    )
+                    explanations[explanation_key] = explanation
+                pattern_result.analysis_explanation = explanation
+                results.append(pattern_result)
 
-        results = EntityRecognizer.remove_duplicates(results)
         return results
 
+    def _build_pattern_explanation(
+        self,
+        pattern: Pattern,
+        score: float,
+        validation_result: Optional[bool],
+        flags: int,
+    ) -> AnalysisExplanation:
+        """
+        Construct the explanation of a pattern match.
+
+        :param pattern: the pattern which matched
+        :param score: the score of the match following validation or invalidation
+        :param validation_result: Whether validation was used and its result
+        :param flags: regex flags
+        :return: Analysis explanation
+        """
+        explanation = self.build_regex_explanation(
+            self.name,
+            pattern.name,
+            pattern.regex,
+            pattern.score,
+            validation_result,
+            flags,
+        )
+        explanation.score = score
+        return explanation
+
     def to_dict(self) -> Dict:
         """Serialize instance into a dictionary."""
         return_dict = super().to_dict()
@@ -273,3 +407,9 @@ class PatternRecognizer(LocalRecognizer):
             entity_recognizer_dict["patterns"] = patterns_list
 
         return cls(**entity_recognizer_dict)
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_prefilter(regex: str, flags: int) -> Optional[PatternPrefilter]:
+    """Derive the prefilter of a regex, once per regex and flags."""
+    return PatternPrefilter.from_regex(regex, flags)
@@ -1,23 +1,22 @@
+import importlib.util
 import logging
 import os
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 
-try:
-    from azure.ai.textanalytics import TextAnalyticsClient
-    from azure.core.credentials import AzureKeyCredential
-
-except ImportError:
-    TextAnalyticsClient = None
-    AzureKeyCredential = None
 from guardian_analyzer import AnalysisExplanation, RecognizerResult, RemoteRecognizer
 from guardian_analyzer.nlp_engine import NlpArtifacts
 
+if TYPE_CHECKING:
+    from azure.ai.textanalytics import TextAnalyticsClient
+
 logger = logging.getLogger("guardian-analyzer")
 
 
 class AzureAILanguageRecognizer(RemoteRecognizer):
     """Wrapper for PII detection using Azure AI Language."""
 
+    NLP_ARTIFACTS_NEEDED = frozenset()
+
     def __init__(
         self,
         supported_entities: Optional[List[str]] = None,
@@ -50,7 +49,7 @@ class AzureAILanguageRecognizer(RemoteRecognizer):
             **kwargs
         )
 
-        is_available = bool(TextAnalyticsClient)
+        is_available = self._is_azure_available()
         if not ta_client and not is_available:
             raise ValueError(
                 "Azure AI Language is not available. "
@@ -82,7 +81,15 @@ class AzureAILanguageRecognizer(RemoteRecognizer):
         return [r.value.upper() for r in PiiEntityCategory]
 
     @staticmethod
-    def __authenticate_client(key: str, endpoint: str) -> TextAnalyticsClient:
+    def _is_azure_available() -> bool:
+        # The Azure SDK is imported when the client is created
+        try:
+            return importlib.util.find_spec("azure.ai.textanalytics") is not None
+        except ModuleNotFoundError:
+            return False
+
+    @staticmethod
+    def __authenticate_client(key: str, endpoint: str) -> "TextAnalyticsClient":
         """Authenticate the client using the key and endpoint.
 
         :param key: Azure AI Language key
@@ -102,6 +109,9 @@ class AzureAILanguageRecognizer(RemoteRecognizer):
                 "or set the AZURE_AI_ENDPOINT environment variable."
             )
 
+        from azure.ai.textanalytics import TextAnalyticsClient
+        from azure.core.credentials import AzureKeyCredential
+
         ta_credential = AzureKeyCredential(key)
         text_analytics_client = TextAnalyticsClient(
             endpoint=endpoint, credential=ta_credential
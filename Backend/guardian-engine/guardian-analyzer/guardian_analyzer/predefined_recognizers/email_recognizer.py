@@ -1,7 +1,5 @@
 from typing import List, Optional
 
-import tldextract
-
 from guardian_analyzer import Pattern, PatternRecognizer
 
 
@@ -42,5 +40,8 @@ class EmailRecognizer(PatternRecognizer):
         )
 
     def validate_result(self, pattern_text: str):  # noqa D102
+        # Imported on first use, as it takes a third of the package's import time
+        import tldextract
+
         result = tldextract.extract(pattern_text)
         return result.fqdn != ""
@@ -1,3 +1,4 @@
+import functools
 import logging
 import string
 from typing import Dict, List, Optional, Tuple
@@ -48,6 +49,7 @@ class IbanRecognizer(PatternRecognizer):
     ]
 
     CONTEXT = ["iban", "bank", "transaction"]
+    NLP_ARTIFACTS_NEEDED = frozenset()
 
     LETTERS: Dict[int, str] = {
         ord(d): str(i) for i, d in enumerate(string.digits + string.ascii_uppercase)
@@ -148,7 +150,8 @@ class IbanRecognizer(PatternRecognizer):
                     score = pattern.score
 
                     validation_result = self.validate_result(current_match)
-                    description = PatternRecognizer.build_regex_explanation(
+                    description = functools.partial(
+                        PatternRecognizer.build_regex_explanation,
                         self.name,
                         pattern.name,
                         pattern.regex,
@@ -1,3 +1,5 @@
+import functools
+import re
 from typing import List, Optional
 
 import phonenumbers
@@ -11,6 +13,9 @@ from guardian_analyzer import (
 )
 from guardian_analyzer.nlp_engine import NlpArtifacts
 
+# Every phone number candidate phonenumbers matches has a digit in it
+_DIGIT_PATTERN = re.compile(r"\d")
+
 
 class PhoneRecognizer(LocalRecognizer):
     """Recognize multi-regional phone numbers.
@@ -26,6 +31,7 @@ class PhoneRecognizer(LocalRecognizer):
     SCORE = 0.4
     CONTEXT = ["phone", "number", "telephone", "cell", "cellphone", "mobile", "call"]
     DEFAULT_SUPPORTED_REGIONS = ("US", "UK", "DE", "FE", "IL", "IN", "CA", "BR")
+    NLP_ARTIFACTS_NEEDED = frozenset()
 
     def __init__(
         self,
@@ -55,28 +61,35 @@ class PhoneRecognizer(LocalRecognizer):
     ) -> List[RecognizerResult]:
         """Analyzes text to detect phone numbers using python-phonenumbers.
 
-        Iterates over entities, fetching regions, then matching regional
-        phone numbers patterns against the text.
+        Iterates over the regions, matching regional phone numbers patterns
+        against the text. Texts without digits aren't matched, regions unknown
+        to phonenumbers are matched once, as they all match the same
+        (international) numbers, and the region of the numbers is memoized.
         :param text: Text to be analyzed
         :param entities: Entities this recognizer can detect
         :param nlp_artifacts: Additional metadata from the NLP engine
         :return: List of phone numbers RecognizerResults
         """
+        if not _DIGIT_PATTERN.search(text):
+            return []
+
         results = []
+        matched_unknown_region = False
         for region in self.supported_regions:
+            if region not in phonenumbers.SUPPORTED_REGIONS:
+                if matched_unknown_region:
+                    continue
+                matched_unknown_region = True
+
             for match in phonenumbers.PhoneNumberMatcher(
                 text, region, leniency=self.leniency
             ):
-                try:
-                    parsed_number = phonenumbers.parse(text[match.start:match.end])
-                    region = phonenumbers.region_code_for_number(parsed_number)
-                    results += [
-                    self._get_recognizer_result(match, text, region, nlp_artifacts)
-                ]
-                except NumberParseException:
-                    results += [
-                        self._get_recognizer_result(match, text, region, nlp_artifacts)
-                    ]
+                number_region = _get_number_region(match.raw_string, region)
+                results.append(
+                    self._get_recognizer_result(
+                        match, text, number_region, nlp_artifacts
+                    )
+                )
 
         return EntityRecognizer.remove_duplicates(results)
 
@@ -86,7 +99,9 @@ class PhoneRecognizer(LocalRecognizer):
             start=match.start,
             end=match.end,
             score=self.SCORE,
-            analysis_explanation=self._get_analysis_explanation(region),
+            analysis_explanation=functools.partial(
+                self._get_analysis_explanation, region
+            ),
             recognition_metadata={
                 RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
                 RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id,
@@ -102,3 +117,12 @@ class PhoneRecognizer(LocalRecognizer):
             textual_explanation=f"Recognized as {region} region phone number, "
             f"using PhoneRecognizer",
         )
+
+
+@functools.lru_cache(maxsize=4096)
+def _get_number_region(raw_string: str, default_region: str) -> Optional[str]:
+    """Return the region of an international number, else the default region."""
+    try:
+        return phonenumbers.region_code_for_number(phonenumbers.parse(raw_string))
+    except NumberParseException:
+        return default_region
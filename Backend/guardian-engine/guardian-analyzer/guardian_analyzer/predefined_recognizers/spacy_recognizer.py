@@ -1,3 +1,4 @@
+import functools
 import logging
 import warnings
 from typing import List, Optional, Set, Tuple
@@ -23,6 +24,8 @@ class SpacyRecognizer(LocalRecognizer):
 
     ENTITIES = ["DATE_TIME", "NRP", "LOCATION", "PERSON", "ORGANIZATION"]
 
+    NLP_ARTIFACTS_NEEDED = frozenset({"entities"})
+
     DEFAULT_EXPLANATION = "Identified as {} by Spacy's Named Entity Recognition"
 
     # deprecated, use MODEL_TO_PRESIDIO_MAPPING in NerModelConfiguration instead
@@ -113,8 +116,11 @@ class SpacyRecognizer(LocalRecognizer):
                 )
                 continue
 
-            textual_explanation = self.DEFAULT_EXPLANATION.format(ner_entity.label_)
-            explanation = self.build_explanation(ner_score, textual_explanation)
+            explanation = functools.partial(
+                self.build_explanation,
+                ner_score,
+                self.DEFAULT_EXPLANATION.format(ner_entity.label_),
+            )
             spacy_result = RecognizerResult(
                 entity_type=ner_entity.label_,
                 start=ner_entity.start_char,
@@ -2,5 +2,10 @@
 
 from .recognizer_registry import RecognizerRegistry
 from .recognizer_registry_provider import RecognizerRegistryProvider
+from .recognizer_registry_snapshot import RecognizerRegistrySnapshot
 
-__all__ = ["RecognizerRegistry", "RecognizerRegistryProvider"]
+__all__ = [
+    "RecognizerRegistry",
+    "RecognizerRegistryProvider",
+    "RecognizerRegistrySnapshot",
+]
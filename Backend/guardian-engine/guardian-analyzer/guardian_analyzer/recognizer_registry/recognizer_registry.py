@@ -1,7 +1,6 @@
-import copy
 import logging
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Type, Union
+from typing import Dict, Iterable, List, Optional, Tuple, Type, Union
 
 import regex as re
 import yaml
@@ -35,6 +34,8 @@ class RecognizerRegistry:
     :param global_regex_flags : regex flags to be used in regex matching,
     including deny-lists
 
+    Recognizers are indexed by language and entity, and the index is rebuilt
+    lazily whenever recognizers are added, removed or replaced.
     """
 
     def __init__(
@@ -43,6 +44,9 @@ class RecognizerRegistry:
         global_regex_flags: Optional[int] = re.DOTALL | re.MULTILINE | re.IGNORECASE,
         supported_languages: Optional[List[str]] = None,
     ):
+        self._index = None
+        self._indexed_recognizers = []
+        self._version = 0
         if recognizers:
             self.recognizers = recognizers
         else:
@@ -52,6 +56,74 @@ class RecognizerRegistry:
             supported_languages if supported_languages else ["en"]
         )
 
+    @property
+    def recognizers(self) -> List[EntityRecognizer]:
+        """Return the recognizers held by this registry."""
+        return self._recognizers
+
+    @recognizers.setter
+    def recognizers(self, recognizers: Iterable[EntityRecognizer]) -> None:
+        self._recognizers = recognizers
+        self._invalidate_index()
+
+    @property
+    def version(self) -> int:
+        """Return a counter increasing whenever recognizers are added or removed."""
+        self._get_index()
+        return self._version
+
+    def _invalidate_index(self) -> None:
+        """Mark the (language, entity) index as stale after a registry change."""
+        self._index = None
+
+    def _get_index(self) -> Tuple[Dict, Dict, Dict]:
+        """
+        Return the recognizers index, rebuilding it if the registry changed.
+
+        Changes made directly to the `recognizers` list (e.g. appending
+        or replacing items) are detected by comparing it to the recognizers
+        the index was built from.
+
+        :return: A tuple of three dictionaries: language to recognizers,
+        (language, entity) to recognizers, and language to supported entities
+        """
+        if self._index is None or self._is_index_stale():
+            by_language = {}
+            by_entity = {}
+            for rec in self._recognizers:
+                by_language.setdefault(rec.supported_language, []).append(rec)
+                for entity in rec.supported_entities:
+                    entity_recognizers = by_entity.setdefault(
+                        (rec.supported_language, entity), []
+                    )
+                    if rec not in entity_recognizers:
+                        entity_recognizers.append(rec)
+
+            supported_entities = {
+                language: list(
+                    {
+                        entity
+                        for rec in language_recognizers
+                        for entity in rec.get_supported_entities()
+                    }
+                )
+                for language, language_recognizers in by_language.items()
+            }
+
+            self._index = (by_language, by_entity, supported_entities)
+            self._indexed_recognizers = list(self._recognizers)
+            self._version += 1
+
+        return self._index
+
+    def _is_index_stale(self) -> bool:
+        """Return whether the recognizers changed since the index was built."""
+        indexed = self._indexed_recognizers
+        return len(indexed) != len(self._recognizers) or any(
+            indexed_rec is not rec
+            for indexed_rec, rec in zip(indexed, self._recognizers)
+        )
+
     def _create_nlp_recognizer(
         self, nlp_engine: NlpEngine = None, supported_language: str = None
     ) -> SpacyRecognizer:
@@ -86,6 +158,7 @@ class RecognizerRegistry:
                 for supported_language in supported_languages
             ]
         )
+        self._invalidate_index()
 
     def load_predefined_recognizers(
         self, languages: Optional[List[str]] = None, nlp_engine: NlpEngine = None
@@ -108,6 +181,7 @@ class RecognizerRegistry:
         recognizers = RecognizerListLoader.get(**configuration)
 
         self.recognizers.extend(recognizers)
+        self._invalidate_index()
         self.add_nlp_recognizer(nlp_engine=nlp_engine)
 
     @staticmethod
@@ -154,25 +228,24 @@ class RecognizerRegistry:
         if entities is None and all_fields is False:
             raise ValueError("No entities provided")
 
-        all_possible_recognizers = copy.copy(self.recognizers)
-        if ad_hoc_recognizers:
-            all_possible_recognizers.extend(ad_hoc_recognizers)
+        by_language, by_entity, _ = self._get_index()
+
+        ad_hoc_recognizers = [
+            rec
+            for rec in (ad_hoc_recognizers or [])
+            if language == rec.supported_language
+        ]
 
         # filter out unwanted recognizers
-        to_return = set()
         if all_fields:
-            to_return = [
-                rec
-                for rec in all_possible_recognizers
-                if language == rec.supported_language
-            ]
+            to_return = by_language.get(language, []) + ad_hoc_recognizers
         else:
+            to_return = []
             for entity in entities:
-                subset = [
+                subset = by_entity.get((language, entity), []) + [
                     rec
-                    for rec in all_possible_recognizers
+                    for rec in ad_hoc_recognizers
                     if entity in rec.supported_entities
-                    and language == rec.supported_language
                 ]
 
                 if not subset:
@@ -183,7 +256,10 @@ class RecognizerRegistry:
                         language,
                     )
                 else:
-                    to_return.update(set(subset))
+                    to_return.extend(subset)
+
+            # remove recognizers supporting more than one requested entity
+            to_return = list(dict.fromkeys(to_return))
 
         logger.debug(
             "Returning a total of %s recognizers",
@@ -193,7 +269,7 @@ class RecognizerRegistry:
         if not to_return:
             raise ValueError("No matching recognizers were found to serve the request.")
 
-        return list(to_return)
+        return to_return
 
     def add_recognizer(self, recognizer: EntityRecognizer) -> None:
         """
@@ -205,6 +281,7 @@ class RecognizerRegistry:
             raise ValueError("Input is not of type EntityRecognizer")
 
         self.recognizers.append(recognizer)
+        self._invalidate_index()
 
     def remove_recognizer(
         self, recognizer_name: str, language: Optional[str] = None
@@ -306,11 +383,8 @@ class RecognizerRegistry:
         return inst
 
     def _get_supported_languages(self) -> List[str]:
-        languages = []
-        for rec in self.recognizers:
-            languages.append(rec.supported_language)
-
-        return list(set(languages))
+        by_language, _, _ = self._get_index()
+        return list(by_language)
 
     def get_supported_entities(
         self, languages: Optional[List[str]] = None
@@ -324,11 +398,14 @@ class RecognizerRegistry:
         if not languages:
             languages = self._get_supported_languages()
 
-        supported_entities = []
-        for language in languages:
-            recognizers = self.get_recognizers(language=language, all_fields=True)
+        _, _, language_entities = self._get_index()
 
-            for recognizer in recognizers:
-                supported_entities.extend(recognizer.get_supported_entities())
+        supported_entities = set()
+        for language in languages:
+            if language not in language_entities:
+                raise ValueError(
+                    "No matching recognizers were found to serve the request."
+                )
+            supported_entities.update(language_entities[language])
 
-        return list(set(supported_entities))
+        return list(supported_entities)
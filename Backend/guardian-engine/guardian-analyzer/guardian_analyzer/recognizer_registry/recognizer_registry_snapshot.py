@@ -0,0 +1,160 @@
+import argparse
+import functools
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+from guardian_analyzer.pattern_recognizer import PatternRecognizer
+from guardian_analyzer.recognizer_registry import RecognizerRegistry
+
+logger = logging.getLogger("guardian-analyzer")
+
+# Increase when the snapshot layout changes
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class RecognizerRegistrySnapshot:
+    """
+    File holding a fully built RecognizerRegistry, to load it without building it.
+
+    Loading a snapshot skips parsing the registry configuration, looking up
+    and creating the recognizers, and deriving their patterns' prefilters.
+    The regexes themselves are compiled on first use, as they are otherwise.
+
+    A snapshot is fingerprinted with the sources it was built from:
+    the registry configuration, the package code and default configuration,
+    and the Python version. A snapshot whose sources changed is stale,
+    and isn't loaded.
+
+    Snapshots are pickles, only load snapshots created by a trusted party
+    (e.g. the `compile` step of your own build).
+
+    :param path: Path of the snapshot file
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        self.path = Path(path)
+
+    def save(self, registry: RecognizerRegistry, sources: Any) -> None:
+        """
+        Save the registry in the snapshot file.
+
+        :param registry: The registry to save, without NLP recognizers,
+        which depend on the NLP engine
+        :param sources: JSON serializable configuration the registry was built from
+        """
+        for recognizer in registry.recognizers:
+            if isinstance(recognizer, PatternRecognizer):
+                recognizer.prepare_patterns()
+        # Build the index before pickling, so it is loaded with the recognizers
+        registry.get_supported_entities()
+
+        # Replace the previous snapshot at once, as workers may be loading it
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with open(temp_path, "wb") as snapshot_file:
+            snapshot_file.write(self.get_fingerprint(sources).encode() + b"\n")
+            pickle.dump(registry, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+        logger.info(
+            f"Saved a registry snapshot of {len(registry.recognizers)} "
+            f"recognizers to {self.path}"
+        )
+
+    def load(self, sources: Any) -> Optional[RecognizerRegistry]:
+        """
+        Load the registry from the snapshot file.
+
+        :param sources: JSON serializable configuration the registry is built from
+        :return: The registry, or None if the snapshot is missing or stale
+        """
+        try:
+            with open(self.path, "rb") as snapshot_file:
+                fingerprint = snapshot_file.readline().strip().decode()
+                if fingerprint != self.get_fingerprint(sources):
+                    logger.warning(
+                        f"Registry snapshot {self.path} is stale, "
+                        f"building the registry from its configuration"
+                    )
+                    return None
+                registry = pickle.load(snapshot_file)
+        except FileNotFoundError:
+            logger.warning(
+                f"Registry snapshot {self.path} not found, "
+                f"building the registry from its configuration"
+            )
+            return None
+        except Exception as e:
+            logger.warning(
+                f"Failed to load registry snapshot {self.path}, "
+                f"building the registry from its configuration: {e}"
+            )
+            return None
+
+        logger.info(f"Loaded registry snapshot {self.path}")
+        return registry
+
+    @staticmethod
+    def get_fingerprint(sources: Any) -> str:
+        """
+        Return the fingerprint of a registry built from the given sources.
+
+        :param sources: JSON serializable configuration the registry is built from
+        """
+        fingerprint = hashlib.sha256()
+        fingerprint.update(
+            json.dumps(
+                [SNAPSHOT_FORMAT_VERSION, sys.version_info[:2], sources],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        )
+        fingerprint.update(_get_package_fingerprint().encode())
+        return fingerprint.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_package_fingerprint() -> str:
+    """Hash the package code and default configuration, which recognizers embed."""
+    package_path = Path(__file__).parent.parent
+    package_hash = hashlib.sha256()
+    for file_path in sorted(package_path.rglob("*")):
+        if file_path.suffix in (".py", ".yaml"):
+            package_hash.update(str(file_path.relative_to(package_path)).encode())
+            package_hash.update(file_path.read_bytes())
+    return package_hash.hexdigest()
+
+
+def main(args: Optional[Iterable[str]] = None) -> None:
+    """Compile a registry snapshot from the analyzer configuration."""
+    from guardian_analyzer import AnalyzerEngineProvider
+
+    parser = argparse.ArgumentParser(
+        description="Compile the recognizer registry into a snapshot file, "
+        "for AnalyzerEngineProvider to load it at startup"
+    )
+    parser.add_argument("snapshot_file", help="Path of the snapshot file to write")
+    parser.add_argument(
+        "--analyzer_conf_file", help="Analyzer configuration file. Default: default"
+    )
+    parser.add_argument(
+        "--recognizer_registry_conf_file",
+        help="Recognizer registry configuration file. "
+        "Default: the analyzer configuration's",
+    )
+    args = parser.parse_args(args)
+
+    logging.basicConfig(level=logging.INFO)
+    provider = AnalyzerEngineProvider(
+        analyzer_engine_conf_file=args.analyzer_conf_file,
+        recognizer_registry_conf_file=args.recognizer_registry_conf_file,
+    )
+    provider.save_recognizer_registry_snapshot(args.snapshot_file)
+
+
+if __name__ == "__main__":
+    main()
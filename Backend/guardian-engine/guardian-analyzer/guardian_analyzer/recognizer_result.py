@@ -1,5 +1,6 @@
+import copy
 import logging
-from typing import Dict
+from typing import Callable, Dict, Optional, Union
 
 from guardian_analyzer import AnalysisExplanation
 
@@ -15,7 +16,8 @@ class RecognizerResult:
     :param end: the end location of the detected entity
     :param score: the score of the detection
     :param analysis_explanation: contains the explanation of why this
-                                 entity was identified
+                                 entity was identified, or a function creating it,
+                                 called only if the explanation is accessed
     :param recognition_metadata: a dictionary of metadata to be used in
     recognizer specific cases, for example specific recognized context words
     and recognizer name
@@ -37,7 +39,9 @@ class RecognizerResult:
         start: int,
         end: int,
         score: float,
-        analysis_explanation: AnalysisExplanation = None,
+        analysis_explanation: Union[
+            AnalysisExplanation, Callable[[], AnalysisExplanation]
+        ] = None,
         recognition_metadata: Dict = None,
     ):
         self.entity_type = entity_type
@@ -54,6 +58,60 @@ class RecognizerResult:
 
         self.recognition_metadata = recognition_metadata
 
+    @property
+    def analysis_explanation(self) -> Optional[AnalysisExplanation]:
+        """Return the analysis explanation, creating it if it was passed lazily."""
+        return self._materialize_explanation()
+
+    @analysis_explanation.setter
+    def analysis_explanation(
+        self,
+        analysis_explanation: Union[
+            AnalysisExplanation, Callable[[], AnalysisExplanation]
+        ],
+    ) -> None:
+        self.__dict__["analysis_explanation"] = analysis_explanation
+
+    def _materialize_explanation(self) -> Optional[AnalysisExplanation]:
+        """Create the explanation if it was passed lazily, and return it."""
+        # Stored in the instance dict under the same name, so to_dict and
+        # copies of the result keep working as with a plain attribute
+        analysis_explanation = self.__dict__["analysis_explanation"]
+        if callable(analysis_explanation):
+            analysis_explanation = analysis_explanation()
+            self.__dict__["analysis_explanation"] = analysis_explanation
+        return analysis_explanation
+
+    def __getstate__(self) -> Dict:
+        """
+        Create the explanation before copying or pickling the result.
+
+        The lazy explanation may refer to the recognizer, which isn't copied.
+        Use `copy` to copy a result keeping its explanation lazy.
+        """
+        return self.to_dict()
+
+    def copy(self) -> "RecognizerResult":
+        """
+        Return a deep copy of the result, without creating a lazy explanation.
+
+        A lazy explanation is shared by the copy, and created by each result
+        separately when accessed.
+        """
+        analysis_explanation = self.__dict__["analysis_explanation"]
+        if not callable(analysis_explanation):
+            return copy.deepcopy(self)
+
+        state = {
+            name: value
+            for name, value in self.__dict__.items()
+            if name != "analysis_explanation"
+        }
+        result = type(self).__new__(type(self))
+        result.__dict__.update(copy.deepcopy(state))
+        result.__dict__["analysis_explanation"] = analysis_explanation
+        return result
+
     def append_analysis_explanation_text(self, text: str) -> None:
         """Add text to the analysis explanation."""
         if self.analysis_explanation:
@@ -65,6 +123,7 @@ class RecognizerResult:
 
         :return: a dictionary
         """
+        self._materialize_explanation()
         return self.__dict__
 
     @classmethod
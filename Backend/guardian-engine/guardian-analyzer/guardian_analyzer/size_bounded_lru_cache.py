@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+logger = logging.getLogger("guardian-analyzer")
+
+
+class SizeBoundedLruCache:
+    """
+    Thread safe LRU cache bounded by the approximate memory its values take.
+
+    Base of the caches of the analyzer, which create the keys of their
+    values and estimate their size, and store and look them up with
+    `_store` and `_lookup`. Hits and misses are counted.
+
+    :param max_size_bytes: Approximate upper bound on the memory taken by
+    the cached values. Least recently used values are evicted first.
+    :param max_entries: Maximum number of cached values, None for no limit
+    :param ttl_seconds: Time after which a cached value expires,
+    None for no expiry
+    """
+
+    def __init__(
+        self,
+        max_size_bytes: int,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.max_size_bytes = max_size_bytes
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.size_bytes = 0
+
+        # Per key: (value, size, expiry time or None), least recently used first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached values."""
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.size_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> dict:
+        """Return the cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "size_bytes": self.size_bytes,
+        }
+
+    def _lookup(self, key: Hashable) -> Optional[Any]:
+        """Return the value cached for the key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, _, expires_at = entry
+                if expires_at is not None and expires_at < time.monotonic():
+                    self._remove(key)
+                    entry = None
+                else:
+                    self._entries.move_to_end(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return value
+
+    def _store(self, key: Hashable, value: Any, size: int) -> None:
+        """Cache a value of the given size, evicting least recently used ones."""
+        if size > self.max_size_bytes:
+            logger.debug(
+                "%s: value too large to be cached (%s bytes)", type(self).__name__, size
+            )
+            return
+
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self.size_bytes += size
+
+            while self.size_bytes > self.max_size_bytes or (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self.size_bytes -= size
@@ -0,0 +1,122 @@
+import logging
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+import regex as re
+
+logger = logging.getLogger("guardian-analyzer")
+
+# Boundaries to end a chunk at, by order of preference.
+# Reverse searches, so the boundary closest to the chunk size is found first.
+_CHUNK_BOUNDARIES = (
+    re.compile(r"(?r)\n[^\S\n]*\n\s*"),  # Paragraph
+    re.compile(r"(?r)(?:[.!?][\"')\]]*\s+|\n\s*)"),  # Sentence or line
+    re.compile(r"(?r)\s+"),  # Word
+)
+
+_WORD_BOUNDARY = re.compile(r"\s+")
+
+
+class TextChunker:
+    """
+    Split a text, or a stream of text parts, into overlapping chunks.
+
+    Chunks end at the paragraph, sentence or word boundary closest to
+    `chunk_size`, in this order of preference. Each chunk starts
+    `chunk_overlap` characters before the previous one ended (at a word
+    boundary), so entities and context words around the split appear whole
+    in at least one chunk. The overlap is shared out between the two chunks:
+    each chunk owns the offsets up to the middle of the overlap,
+    so every offset is owned by exactly one chunk.
+
+    Only about two chunks of text are held at once, no matter the text size.
+
+    :param chunk_size: Maximum number of characters in a chunk
+    :param chunk_overlap: Number of characters repeated at the start
+    of the next chunk, less than half the chunk size
+    """
+
+    def __init__(self, chunk_size: int = 100000, chunk_overlap: int = 200):
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        if not 0 <= chunk_overlap < chunk_size // 2:
+            raise ValueError(
+                "chunk_overlap must be non negative and less than half the chunk_size"
+            )
+
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+
+    def split(
+        self, text: Union[str, Iterable[str]]
+    ) -> Iterator[Tuple[int, str, int, Optional[int]]]:
+        """
+        Split the text into chunks, reading text parts as they are needed.
+
+        :param text: The text, or an iterable of consecutive parts of it
+        (e.g. the pages of a document)
+        :return: Iterator of (offset, chunk, owned_start, owned_end) tuples:
+        the offset of the chunk in the text, the chunk text, and the range of
+        text offsets owned by the chunk. owned_end is None for the last chunk.
+        """
+        parts = self._bounded_parts(text)
+        buffer = ""
+        offset = 0
+        owned_start = 0
+        exhausted = False
+
+        while True:
+            pending = [buffer]
+            pending_size = len(buffer)
+            while not exhausted and pending_size < self.chunk_size:
+                part = next(parts, None)
+                if part is None:
+                    exhausted = True
+                else:
+                    pending.append(part)
+                    pending_size += len(part)
+            buffer = "".join(pending)
+
+            if exhausted and len(buffer) <= self.chunk_size:
+                if buffer:
+                    yield offset, buffer, owned_start, None
+                return
+
+            end = self._find_chunk_end(buffer)
+            next_start = self._find_next_start(buffer, end)
+            owned_end = offset + (next_start + end) // 2
+            logger.debug("Text chunk at offset %s of %s characters", offset, end)
+
+            yield offset, buffer[:end], owned_start, owned_end
+
+            owned_start = owned_end
+            buffer = buffer[next_start:]
+            offset += next_start
+
+    def _bounded_parts(self, text: Union[str, Iterable[str]]) -> Iterator[str]:
+        """Yield the parts of the text, slicing parts larger than a chunk."""
+        if isinstance(text, str):
+            text = [text]
+        for part in text:
+            if len(part) <= self.chunk_size:
+                yield part
+            else:
+                for start in range(0, len(part), self.chunk_size):
+                    yield part[start : start + self.chunk_size]
+
+    def _find_chunk_end(self, buffer: str) -> int:
+        """Return the end of the chunk, at the best boundary before chunk_size."""
+        for boundary in _CHUNK_BOUNDARIES:
+            match = boundary.search(buffer, self.chunk_size // 2, self.chunk_size)
+            if match:
+                return match.end()
+        return self.chunk_size
+
+    def _find_next_start(self, buffer: str, end: int) -> int:
+        """Return the start of the next chunk, at a word boundary in the overlap."""
+        if not self.chunk_overlap:
+            return end
+        start = end - self.chunk_overlap
+        match = _WORD_BOUNDARY.search(buffer, start, end)
+        if match and match.end() < end:
+            return match.end()
+        return start
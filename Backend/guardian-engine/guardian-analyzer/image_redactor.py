@@ -1,8 +1,10 @@
+import bisect
+
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw
 import pytesseract
-from typing import List, Dict, Any, Tuple
+from typing import BinaryIO, List, Dict, Any, Optional, Tuple, Union
 from guardian_analyzer import AnalyzerEngine
 import logging
 
@@ -42,6 +44,82 @@ class PresidioImageRedactor:
                 )
         return entities
 
+    @staticmethod
+    def build_text_from_ocr(
+        ocr_data: Dict[str, List[Any]]
+    ) -> Tuple[str, List[int], List[int], List[Tuple[int, int, int, int]]]:
+        """
+        Build the text of the OCR words, indexing each word's box by its span.
+
+        Words are separated by a space, lines by a new line, and paragraphs
+        and blocks by an empty line, as in Tesseract's text output.
+        :param ocr_data: The output of pytesseract.image_to_data, as a dict
+        :return: The text, the start and end offsets of each word in the text,
+        and the box (left, top, width, height) of each word
+        """
+        parts = []
+        length = 0
+        word_starts = []
+        word_ends = []
+        word_boxes = []
+        previous_line = None
+        for i, word in enumerate(ocr_data["text"]):
+            word = word.strip()
+            if not word:
+                continue
+            line = (
+                ocr_data["block_num"][i],
+                ocr_data["par_num"][i],
+                ocr_data["line_num"][i],
+            )
+            if previous_line is not None:
+                if line[:2] != previous_line[:2]:
+                    separator = "\n\n"
+                elif line != previous_line:
+                    separator = "\n"
+                else:
+                    separator = " "
+                parts.append(separator)
+                length += len(separator)
+            previous_line = line
+
+            word_starts.append(length)
+            word_ends.append(length + len(word))
+            word_boxes.append(
+                (
+                    ocr_data["left"][i],
+                    ocr_data["top"][i],
+                    ocr_data["width"][i],
+                    ocr_data["height"][i],
+                )
+            )
+            parts.append(word)
+            length += len(word)
+        return "".join(parts), word_starts, word_ends, word_boxes
+
+    @staticmethod
+    def get_entity_boxes(
+        start: int,
+        end: int,
+        word_starts: List[int],
+        word_ends: List[int],
+        word_boxes: List[Tuple[int, int, int, int]],
+    ) -> List[Tuple[int, int, int, int]]:
+        """
+        Return the boxes of the words overlapping a span of the OCR text.
+
+        :param start: Start of the span in the text built by build_text_from_ocr
+        :param end: End of the span
+        :param word_starts: Start offset of each word, in increasing order
+        :param word_ends: End offset of each word, in increasing order
+        :param word_boxes: Box of each word
+        """
+        # From the first word ending after the span's start
+        # to the last word starting before its end
+        first = bisect.bisect_right(word_ends, start)
+        last = bisect.bisect_left(word_starts, end)
+        return word_boxes[first:last]
+
     def preprocess_image(self, image: np.ndarray) -> np.ndarray:
         """Preprocess image for better OCR results"""
         # Convert to grayscale
@@ -52,33 +130,45 @@ class PresidioImageRedactor:
 
     def redact_image(
         self,
-        image_path: str,
-        output_path: str,
+        image_path: Union[str, bytes],
+        output_path: Union[str, BinaryIO],
         language: str = "en",
         entities: List[str] = None,
         color_fill: Tuple[int, int, int] = (0, 0, 0),
+        image_format: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Analyze and redact image using Guardian analysis
+
+        The image can be given as a path or as its encoded bytes, and the output
+        written to a path or a binary file object (which requires image_format).
         """
         try:
             # Read and preprocess image
-            image = cv2.imread(image_path)
+            if isinstance(image_path, (bytes, bytearray)):
+                image = cv2.imdecode(
+                    np.frombuffer(image_path, dtype=np.uint8), cv2.IMREAD_COLOR
+                )
+            else:
+                image = cv2.imread(image_path)
             if image is None:
                 raise ValueError("Could not read image")
 
             # Preprocess for better OCR
             processed_image = self.preprocess_image(image)
 
-            # Extract text using OCR
-            text = pytesseract.image_to_string(processed_image)
-
-            print(f"Extracted text: {text}")
-
-            # Get word boxes from OCR
-            boxes = pytesseract.image_to_data(
+            # Extract the words and their boxes using a single OCR pass
+            ocr_data = pytesseract.image_to_data(
                 processed_image, output_type=pytesseract.Output.DICT
             )
+            (
+                text,
+                word_starts,
+                word_ends,
+                word_boxes,
+            ) = self.build_text_from_ocr(ocr_data)
+
+            print(f"Extracted text: {text}")
 
             # Analyze text with Presidio
             analyzer_results = self.analyzer.analyze(
@@ -100,23 +190,15 @@ class PresidioImageRedactor:
             pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
             draw = ImageDraw.Draw(pil_image)
 
-            # Redact detected entities
+            # Redact the boxes of the words each entity spans
             for entity in detected_entities:
-                entity_text = entity["text"]
-                # Find word positions in OCR results
-                words = boxes["text"]
-                for i, word in enumerate(words):
-                    if entity_text in word:
-                        # print(f"Redacting entity: {entity_text}", sep="\t")
-                        x = boxes["left"][i]
-                        y = boxes["top"][i]
-                        w = boxes["width"][i]
-                        h = boxes["height"][i]
-                        # Draw redaction rectangle
-                        draw.rectangle([(x, y), (x + w, y + h)], fill=color_fill)
+                for x, y, w, h in self.get_entity_boxes(
+                    entity["start"], entity["end"], word_starts, word_ends, word_boxes
+                ):
+                    draw.rectangle([(x, y), (x + w, y + h)], fill=color_fill)
 
             # Save redacted image
-            pil_image.save(output_path)
+            pil_image.save(output_path, format=image_format)
 
             return {
                 "status": "success",
@@ -5,20 +5,66 @@ import logging
 import concurrent.futures
 import multiprocessing
 import os
-from typing import List, Dict, Any, Optional
-from guardian_analyzer import AnalyzerEngine
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import BinaryIO, List, Dict, Any, Optional, Union
+from guardian_analyzer import AnalyzerEngine, AnalyzerEngineProvider
 from datetime import datetime
 
 # Change logger name
 logger = logging.getLogger("guardian-analyzer")
 
+# A PDF given either as a file path or as the raw bytes of the document
+PdfSource = Union[str, bytes]
+# Where to write a PDF: a file path or a writable binary file object
+PdfOutput = Union[str, BinaryIO]
+
+
+def open_pdf(source: PdfSource) -> fitz.Document:
+    """Open a PDF from a file path or, without touching the disk, from its bytes."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source)
+
+
+def save_pdf(doc: fitz.Document, output: PdfOutput, **kwargs) -> None:
+    """Save a PDF to a file path, or write its bytes to a binary file object."""
+    if isinstance(output, str):
+        doc.save(output, **kwargs)
+    else:
+        output.write(doc.tobytes(**kwargs))
+
 
 class GuardianPDFRedactor:
-    def __init__(self, analyzer_engine: AnalyzerEngine = None):
+    def __init__(
+        self,
+        analyzer_engine: AnalyzerEngine = None,
+        n_process: int = 1,
+        pages_per_chunk: int = 25,
+        analyzer_engine_provider: Optional[AnalyzerEngineProvider] = None,
+    ):
         """
         PDF Redactor that uses Guardian analysis results with comprehensive redaction
+
+        With n_process > 1, the pages of documents longer than pages_per_chunk
+        are analyzed in a pool of worker processes, started by `start` and
+        stopped by `close`. Start it before any other thread is running
+        (e.g. at server startup), as the workers are forked from this process.
+        Workers create their own engine with analyzer_engine_provider if given,
+        otherwise they are forked and share this engine as it is when started.
         """
         self.analyzer = analyzer_engine or AnalyzerEngine()
+        if n_process > 1 and not analyzer_engine_provider:
+            if "fork" not in multiprocessing.get_all_start_methods():
+                raise ValueError(
+                    "n_process > 1 requires an analyzer_engine_provider "
+                    "on platforms which can't fork"
+                )
+        self.n_process = n_process
+        self.pages_per_chunk = pages_per_chunk
+        self.analyzer_engine_provider = analyzer_engine_provider
+        self._executor = None
 
         # Precompile common regex patterns for efficiency
         self.default_regex_patterns = [
@@ -37,6 +83,35 @@ class GuardianPDFRedactor:
                 entities.append(entity_text)
         return list(set(entities))  # Remove duplicates
 
+    def start(self) -> None:
+        """Start the worker processes analyzing pages, if n_process > 1."""
+        if self.n_process <= 1 or self._executor:
+            return
+
+        if self.analyzer_engine_provider:
+            mp_context = multiprocessing.get_context()
+            initargs = (None, self.analyzer_engine_provider)
+        else:
+            # Forked workers share the parent's loaded engine
+            mp_context = multiprocessing.get_context("fork")
+            initargs = (self, None)
+
+        logger.info(f"Starting {self.n_process} PDF page analysis worker processes")
+        self._executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.n_process,
+            mp_context=mp_context,
+            initializer=_init_page_worker,
+            initargs=initargs,
+        )
+        # Workers are created on the first task, create them now
+        self._executor.submit(int).result()
+
+    def close(self) -> None:
+        """Stop the worker processes, if any."""
+        if self._executor:
+            self._executor.shutdown()
+            self._executor = None
+
     def find_text_instances(self, page, text):
         """
         Find all text instances on a page and return their rectangles
@@ -46,15 +121,15 @@ class GuardianPDFRedactor:
 
     def encrypt_pdf(
         self,
-        input_path: str,
-        output_path: str,
+        input_path: PdfSource,
+        output_path: PdfOutput,
         password: str,
         owner_password: str = None,  # Optional different password for owner
     ) -> Dict[str, Any]:
         """Encrypt PDF with password protection"""
         try:
             # Open the PDF
-            doc = fitz.open(input_path)
+            doc = open_pdf(input_path)
             
             # Define permissions bit field
             permissions = (
@@ -65,7 +140,8 @@ class GuardianPDFRedactor:
             )
 
             # Save with encryption
-            doc.save(
+            save_pdf(
+                doc,
                 output_path,
                 owner_pw=owner_password if owner_password else password,  # owner password
                 user_pw=password,                                        # user password
@@ -87,10 +163,35 @@ class GuardianPDFRedactor:
             logger.error(f"Error encrypting PDF: {str(e)}")
             raise Exception(f"Error encrypting PDF: {str(e)}")
 
+    def detect_page_entities(
+        self, page_text: str, language: str = "en", entities: List[str] = None
+    ) -> Dict[str, str]:
+        """Map each string detected in the text of a page to its entity type."""
+        analyzer_results = self.analyzer.analyze(
+            text=page_text, language=language, entities=entities
+        )
+
+        detected_entities = {}
+        for result in analyzer_results:
+            entity_text = page_text[result.start : result.end]
+            if len(entity_text.strip()) > 2:
+                detected_entities[entity_text] = result.entity_type
+        return detected_entities
+
+    @staticmethod
+    def find_regex_targets(page_text: str, regex_patterns: List[str]) -> List[str]:
+        """Return the first match of each regex pattern found in the page text."""
+        targets = []
+        for pattern in regex_patterns:
+            matches = re.findall(pattern, page_text)
+            if matches:
+                targets.append(matches[0])
+        return targets
+
     def redact_pdf(
         self,
-        pdf_path: str,
-        output_path: str,
+        pdf_path: PdfSource,
+        output_path: PdfOutput,
         language: str = "en",
         additional_keywords: List[str] = None,
         custom_regex: List[str] = None,
@@ -99,50 +200,47 @@ class GuardianPDFRedactor:
     ) -> Dict[str, Any]:
         """
         Analyze and redact PDF using Guardian analysis with comprehensive redaction
+
+        Once the worker processes are started, pages are split into ranges of
+        pages_per_chunk pages which are analyzed by the workers, each opening
+        the PDF on its own. Redactions are then applied in a single pass over
+        the document.
         """
         try:
-            doc = fitz.open(pdf_path)
-            detected_entities = {}
+            regex_patterns = self.default_regex_patterns.copy()
+            if custom_regex:
+                regex_patterns.extend(custom_regex)
 
-            # First pass: Entity Detection
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                page_text = page.get_text()
+            doc = open_pdf(pdf_path)
+            page_count = len(doc)
 
-                # Analyze text with Guardian
-                analyzer_results = self.analyzer.analyze(
-                    text=page_text, language=language, entities=entities
+            # First pass: Entity Detection
+            detected = None
+            if self._executor and page_count > self.pages_per_chunk:
+                detected = self._detect_entities_parallel(
+                    pdf_path=pdf_path,
+                    page_count=page_count,
+                    language=language,
+                    entities=entities,
+                    regex_patterns=regex_patterns,
+                )
+            if detected:
+                detected_entities, page_regex_targets = detected
+            else:
+                detected_entities, page_regex_targets = _detect_page_range(
+                    self, doc, range(page_count), language, entities, regex_patterns
                 )
 
-                # Store entities with their types
-                for result in analyzer_results:
-                    entity_text = page_text[result.start : result.end]
-                    if len(entity_text.strip()) > 2:
-                        detected_entities[entity_text] = result.entity_type
-
-            # Prepare redaction configuration
-            redaction_config = {
-                "keywords": list(detected_entities.keys()),
-                "regex_patterns": self.default_regex_patterns.copy(),
-            }
-
-            # Add additional keywords and patterns
+            keywords = list(detected_entities.keys())
             if additional_keywords:
-                redaction_config["keywords"].extend(additional_keywords)
-            if custom_regex:
-                redaction_config["regex_patterns"].extend(custom_regex)
+                keywords.extend(additional_keywords)
 
             # Perform Redaction
-            for page_num in range(len(doc)):
+            for page_num in range(page_count):
                 page = doc[page_num]
-                page_text = page.get_text()
 
                 # Get all targets including regex matches
-                redact_targets = redaction_config["keywords"] + [
-                    re.findall(pattern, page_text)[0]
-                    for pattern in redaction_config["regex_patterns"]
-                    if re.findall(pattern, page_text)
-                ]
+                redact_targets = keywords + page_regex_targets[page_num]
 
                 # Sort targets by length (longest first) to avoid partial matches
                 redact_targets = sorted(redact_targets, key=len, reverse=True)
@@ -195,7 +293,7 @@ class GuardianPDFRedactor:
                     page.apply_redactions()
 
             # Save the processed document
-            doc.save(output_path)
+            save_pdf(doc, output_path)
             doc.close()
 
             return {
@@ -209,10 +307,64 @@ class GuardianPDFRedactor:
             logger.error(f"Error redacting PDF: {e}")
             raise
 
+    def _detect_entities_parallel(
+        self,
+        pdf_path: PdfSource,
+        page_count: int,
+        language: str,
+        entities: Optional[List[str]],
+        regex_patterns: List[str],
+    ):
+        """
+        Run entity detection over page ranges in the worker processes.
+
+        The PDF path is sent along each range. A PDF given as bytes is written
+        once to a temporary file, rather than sending the bytes to the workers
+        with each range. Results are merged in page order, giving the same
+        entity map as a sequential pass. If the workers crashed, they are
+        stopped and None is returned, for the pages to be analyzed in this
+        process: the pool isn't started again, as this process may be running
+        other threads.
+        """
+        page_ranges = [
+            range(start, min(start + self.pages_per_chunk, page_count))
+            for start in range(0, page_count, self.pages_per_chunk)
+        ]
+
+        detected_entities = {}
+        page_regex_targets = {}
+        try:
+            with _pdf_file(pdf_path) as worker_pdf_path:
+                chunk_results = self._executor.map(
+                    _detect_pdf_page_range,
+                    [worker_pdf_path] * len(page_ranges),
+                    page_ranges,
+                    [language] * len(page_ranges),
+                    [entities] * len(page_ranges),
+                    [regex_patterns] * len(page_ranges),
+                )
+                for chunk_entities, chunk_regex_targets in chunk_results:
+                    detected_entities.update(chunk_entities)
+                    page_regex_targets.update(chunk_regex_targets)
+        except BrokenProcessPool:
+            logger.error(
+                "PDF page analysis worker process crashed, "
+                "analyzing pages in the server process from now on"
+            )
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            return None
+
+        logger.info(
+            f"Analyzed {page_count} pages in {len(page_ranges)} chunks "
+            f"using {self.n_process} processes"
+        )
+        return detected_entities, page_regex_targets
+
     def redact_strings_only(
         self,
-        pdf_path: str,
-        output_path: str,
+        pdf_path: PdfSource,
+        output_path: PdfOutput,
         strings_to_redact: List[str],
         redaction_style: str = "blackbox",
     ) -> Dict[str, Any]:
@@ -220,7 +372,7 @@ class GuardianPDFRedactor:
         Redact only specific strings from PDF without any analysis
         """
         try:
-            doc = fitz.open(pdf_path)
+            doc = open_pdf(pdf_path)
             
             # Sort strings by length (longest first) to avoid partial matches
             redact_targets = sorted(strings_to_redact, key=len, reverse=True)
@@ -268,7 +420,7 @@ class GuardianPDFRedactor:
                     page.apply_redactions()
 
             # Save the processed document
-            doc.save(output_path)
+            save_pdf(doc, output_path)
             doc.close()
 
             return {
@@ -281,3 +433,75 @@ class GuardianPDFRedactor:
         except Exception as e:
             logger.error(f"Error redacting strings from PDF: {e}")
             raise
+
+
+# Redactor used by pool workers, created once per worker process
+_worker_redactor: Optional[GuardianPDFRedactor] = None
+
+
+def _init_page_worker(
+    redactor: Optional[GuardianPDFRedactor],
+    analyzer_engine_provider: Optional[AnalyzerEngineProvider],
+) -> None:
+    global _worker_redactor
+    if analyzer_engine_provider:
+        _worker_redactor = GuardianPDFRedactor(
+            analyzer_engine=analyzer_engine_provider.create_engine()
+        )
+    else:
+        _worker_redactor = redactor
+
+
+def _detect_page_range(
+    redactor: GuardianPDFRedactor,
+    doc,
+    page_numbers: range,
+    language: str,
+    entities: Optional[List[str]],
+    regex_patterns: List[str],
+):
+    """Detect entities and regex targets on pages, reading each page's text once."""
+    detected_entities = {}
+    page_regex_targets = {}
+    for page_num in page_numbers:
+        page_text = doc[page_num].get_text()
+        detected_entities.update(
+            redactor.detect_page_entities(page_text, language, entities)
+        )
+        page_regex_targets[page_num] = redactor.find_regex_targets(
+            page_text, regex_patterns
+        )
+    return detected_entities, page_regex_targets
+
+
+def _detect_pdf_page_range(
+    pdf_path: str,
+    page_numbers: range,
+    language: str,
+    entities: Optional[List[str]],
+    regex_patterns: List[str],
+):
+    """Pool worker entry point, opening its own fitz handle on the PDF."""
+    doc = fitz.open(pdf_path)
+    try:
+        return _detect_page_range(
+            _worker_redactor, doc, page_numbers, language, entities, regex_patterns
+        )
+    finally:
+        doc.close()
+
+
+@contextmanager
+def _pdf_file(pdf_source: PdfSource):
+    """Yield the path of a PDF, written to a temporary file if given as bytes."""
+    if isinstance(pdf_source, str):
+        yield pdf_source
+        return
+
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as pdf_file:
+            pdf_file.write(pdf_source)
+        yield path
+    finally:
+        os.remove(path)
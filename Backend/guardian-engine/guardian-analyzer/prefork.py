@@ -0,0 +1,221 @@
+"""Pre-fork entry point for the analyzer REST API.
+
+The master process loads the analyzer engine (NLP models and recognizer
+registry) once, then forks the worker processes serving the ASGI app of
+asgi.py on a shared socket. Workers share the master's memory pages
+copy-on-write, so the models are held once per host instead of once per
+worker. The master restarts workers which exit, and logs the resident and
+shared memory of each worker.
+
+Run with: python prefork.py (workers from WEB_CONCURRENCY, port from PORT)
+
+Only fork-safe work happens in the master: models are loaded but not run,
+as some backends (e.g. PyTorch thread pools) don't survive a fork once used.
+"""
+
+import gc
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict, List
+
+import uvicorn
+
+logger = logging.getLogger("guardian-analyzer")
+
+# /proc/<pid>/smaps_rollup fields reported, in kB
+MEMORY_FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Dirty")
+
+
+class PreforkServer:
+    """
+    Serve an ASGI app from worker processes forked from this process.
+
+    :param app: The ASGI app, fully loaded
+    :param host: Host to listen on
+    :param port: Port to listen on
+    :param workers: Number of worker processes
+    :param memory_report_interval: Seconds between memory reports, 0 to disable
+    """
+
+    def __init__(
+        self,
+        app,
+        host: str = "0.0.0.0",
+        port: int = 3000,
+        workers: int = 4,
+        memory_report_interval: float = 300,
+    ):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.memory_report_interval = memory_report_interval
+        self.worker_pids: List[int] = []
+        self.stopping = False
+        self.socket = None
+
+    def run(self) -> None:
+        """Fork the workers and supervise them until asked to stop."""
+        self.socket = self._bind()
+
+        # Objects allocated so far are never collected, so the garbage
+        # collector doesn't write to (and copy) the pages they share
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+        signal.signal(signal.SIGUSR1, lambda *_: self.log_memory_report())
+
+        for _ in range(self.workers):
+            self._spawn_worker()
+        logger.info(
+            f"Serving on {self.host}:{self.port} "
+            f"with {self.workers} pre-forked workers"
+        )
+
+        next_report = time.monotonic() + min(self.memory_report_interval, 30)
+        while not self.stopping:
+            self._reap_workers()
+            if self.memory_report_interval and time.monotonic() >= next_report:
+                self.log_memory_report()
+                next_report = time.monotonic() + self.memory_report_interval
+            time.sleep(1)
+
+        self._stop_workers()
+
+    def log_memory_report(self) -> None:
+        """Log the memory of each worker and the total memory they use."""
+        total_pss = 0
+        for pid in self.worker_pids:
+            memory = read_memory(pid)
+            if not memory:
+                continue
+            shared = memory["Shared_Clean"] + memory["Shared_Dirty"]
+            total_pss += memory["Pss"]
+            logger.info(
+                f"Worker {pid} memory: RSS {memory['Rss'] // 1024} MB, "
+                f"shared {shared // 1024} MB, "
+                f"private {memory['Private_Dirty'] // 1024} MB, "
+                f"PSS {memory['Pss'] // 1024} MB"
+            )
+
+        master = read_memory(os.getpid())
+        if master:
+            total_pss += master["Pss"]
+            logger.info(
+                f"Master {os.getpid()} memory: RSS {master['Rss'] // 1024} MB. "
+                f"Total proportional memory of master and workers: "
+                f"{total_pss // 1024} MB"
+            )
+
+    def _bind(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((self.host, self.port))
+        sock.listen(2048)
+        sock.set_inheritable(True)
+        return sock
+
+    def _spawn_worker(self) -> None:
+        pid = os.fork()
+        if pid:
+            self.worker_pids.append(pid)
+            return
+
+        # Worker: uvicorn installs its own handlers for a graceful shutdown
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            config = uvicorn.Config(self.app, lifespan="on")
+            uvicorn.Server(config).run(sockets=[self.socket])
+        except BaseException:
+            logger.exception("Worker failed")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+
+    def _reap_workers(self) -> None:
+        while self.worker_pids:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if not pid:
+                return
+            if pid in self.worker_pids:
+                self.worker_pids.remove(pid)
+                if not self.stopping:
+                    logger.error(
+                        f"Worker {pid} exited with status {status}, restarting it"
+                    )
+                    self._spawn_worker()
+
+    def _stop(self, *args) -> None:
+        self.stopping = True
+
+    def _stop_workers(self) -> None:
+        logger.info(f"Stopping {len(self.worker_pids)} workers")
+        for pid in self.worker_pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in self.worker_pids:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.worker_pids = []
+        self.socket.close()
+
+
+def read_memory(pid: int) -> Dict[str, int]:
+    """
+    Return the memory of a process in kB, from /proc/<pid>/smaps_rollup.
+
+    :param pid: The process id
+    :return: MEMORY_FIELDS by name, empty if not available (e.g. not Linux)
+    """
+    memory = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as smaps:
+            for line in smaps:
+                name, _, value = line.partition(":")
+                if name in MEMORY_FIELDS:
+                    memory[name] = int(value.split()[0])
+    except OSError:
+        return {}
+    return memory
+
+
+def warm_up(asgi_app) -> None:
+    """
+    Compile the recognizers' regexes in the master, for the workers to share.
+
+    :param asgi_app: The GuardianAsgiApp holding the analyzer server
+    """
+    from guardian_analyzer import PatternRecognizer
+
+    registry = asgi_app.server.engine.registry
+    for recognizer in registry.recognizers:
+        if isinstance(recognizer, PatternRecognizer):
+            recognizer.prepare_patterns(compile_regexes=True)
+
+
+if __name__ == "__main__":
+    # Loads the analyzer engine, in this process only
+    from asgi import app
+
+    warm_up(app)
+    PreforkServer(
+        app,
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", 3000)),
+        workers=int(os.environ.get("WEB_CONCURRENCY", 4)),
+        memory_report_interval=float(
+            os.environ.get("MEMORY_REPORT_INTERVAL", 300)
+        ),
+    ).run()
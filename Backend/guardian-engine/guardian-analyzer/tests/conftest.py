@@ -16,10 +16,28 @@ from guardian_analyzer.predefined_recognizers import NLP_RECOGNIZERS, PREDEFINED
 from tests.mocks import RecognizerRegistryMock, NlpEngineMock
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--runslow", action="store_true", default=False, help="run slow tests"
+    )
+
+
 def pytest_configure(config):
     config.addinivalue_line(
         "markers", "skip_engine(nlp_engine): skip test for given nlp engine"
     )
+    config.addinivalue_line(
+        "markers", "slow: timing test, only run with --runslow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--runslow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --runslow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
 @pytest.fixture(scope="session")
@@ -935,3 +935,205 @@ def test_when_multiple_nameless_recognizers_context_is_correct(spacy_nlp_engine)
 
     for recognizer_result in recognizer_results:
         assert recognizer_result.score > 0.3
+
+
+def test_when_analyze_chunked_then_results_identical_to_analyze(
+    loaded_analyzer_engine,
+):
+    sentence = (
+        "My credit card is 4012888888881881 and my email is john@example.com. "
+        "Call 212-555-5555 tomorrow.\n"
+    )
+    text = "".join(f"Line {i}. " + sentence for i in range(50))
+
+    expected = loaded_analyzer_engine.analyze(text, language="en")
+    chunked = list(
+        loaded_analyzer_engine.analyze_chunked(
+            text, language="en", chunk_size=500, chunk_overlap=100
+        )
+    )
+
+    def to_tuples(results):
+        return sorted((r.entity_type, r.start, r.end, r.score) for r in results)
+
+    assert len(chunked) > 1
+    assert to_tuples(r for results in chunked for r in results) == to_tuples(expected)
+
+
+def test_when_entity_in_chunk_overlap_then_returned_once(loaded_analyzer_engine):
+    text = "x " * 40 + "4012888888881881" + " y" * 40
+    parts = [text[:30], text[30:90], text[90:]]
+
+    results = [
+        result
+        for chunk_results in loaded_analyzer_engine.analyze_chunked(
+            iter(parts),
+            language="en",
+            entities=["CREDIT_CARD"],
+            chunk_size=100,
+            chunk_overlap=40,
+        )
+        for result in chunk_results
+    ]
+
+    assert len(results) == 1
+    assert text[results[0].start : results[0].end] == "4012888888881881"
+
+
+class RecordingNlpEngineMock(NlpEngineMock):
+    def __init__(self):
+        super().__init__()
+        self.processed = []
+
+    def process_text(self, text, language):
+        self.processed.append(None)
+        return super().process_text(text, language)
+
+    def process_text_partially(self, text, language, artifacts):
+        self.processed.append(set(artifacts))
+        return super().process_text(text, language)
+
+
+class NerRecognizerMock(EntityRecognizer):
+    NLP_ARTIFACTS_NEEDED = frozenset({"entities"})
+
+    def load(self):
+        pass
+
+    def analyze(self, text, entities, nlp_artifacts=None):
+        return []
+
+
+def create_recording_analyzer_engine(*recognizers):
+    registry = RecognizerRegistry()
+    for recognizer in recognizers:
+        registry.add_recognizer(recognizer)
+    return AnalyzerEngine(registry=registry, nlp_engine=RecordingNlpEngineMock())
+
+
+@pytest.fixture
+def card_recognizer():
+    return PatternRecognizer(
+        supported_entity="CARD",
+        context=["card"],
+        patterns=[Pattern("card", r"\b\d{16}\b", 0.3)],
+    )
+
+
+def test_when_only_pattern_recognizers_and_no_match_then_nlp_not_run(card_recognizer):
+    analyzer_engine = create_recording_analyzer_engine(card_recognizer)
+
+    assert analyzer_engine.analyze("nothing to see here", language="en") == []
+    assert analyzer_engine.nlp_engine.processed == []
+
+
+def test_when_pattern_match_with_context_then_only_lemmas_produced(card_recognizer):
+    analyzer_engine = create_recording_analyzer_engine(card_recognizer)
+
+    results = analyzer_engine.analyze("my card is 4012888888881881", language="en")
+
+    assert len(results) == 1
+    assert analyzer_engine.nlp_engine.processed == [{"lemmas"}]
+
+
+def test_when_ner_recognizer_then_entities_and_lemmas_produced_once(card_recognizer):
+    analyzer_engine = create_recording_analyzer_engine(
+        card_recognizer, NerRecognizerMock(supported_entities=["PERSON"])
+    )
+
+    analyzer_engine.analyze("my card is 4012888888881881", language="en")
+
+    assert analyzer_engine.nlp_engine.processed == [{"entities", "lemmas"}]
+
+
+def test_when_recognizer_needs_unknown_then_whole_pipeline_run(card_recognizer):
+    class CustomRecognizer(NerRecognizerMock):
+        NLP_ARTIFACTS_NEEDED = None
+
+    analyzer_engine = create_recording_analyzer_engine(
+        card_recognizer, CustomRecognizer(supported_entities=["PERSON"])
+    )
+
+    analyzer_engine.analyze("nothing to see here", language="en")
+
+    assert analyzer_engine.nlp_engine.processed == [None]
+
+
+class ArtifactsRecordingRecognizer(PatternRecognizer):
+    def analyze(self, text, entities, nlp_artifacts=None, regex_flags=None):
+        self.nlp_artifacts_seen = nlp_artifacts
+        return super().analyze(text, entities, nlp_artifacts, regex_flags)
+
+
+class ContextArtifactsRecordingRecognizer(PatternRecognizer):
+    def enhance_using_context(
+        self,
+        text,
+        raw_recognizer_results,
+        other_raw_recognizer_results,
+        nlp_artifacts,
+        context=None,
+    ):
+        self.nlp_artifacts_seen = nlp_artifacts
+        return raw_recognizer_results
+
+
+class DeclaringArtifactsRecordingRecognizer(ArtifactsRecordingRecognizer):
+    NLP_ARTIFACTS_NEEDED = frozenset()
+
+
+@pytest.mark.parametrize(
+    "recognizer_class", [ArtifactsRecordingRecognizer, ContextArtifactsRecordingRecognizer]
+)
+def test_when_pattern_recognizer_overrides_methods_then_whole_pipeline_run(
+    recognizer_class,
+):
+    recognizer = recognizer_class(
+        supported_entity="CARD", patterns=[Pattern("card", r"\b\d{16}\b", 0.3)]
+    )
+    analyzer_engine = create_recording_analyzer_engine(recognizer)
+
+    analyzer_engine.analyze("my card is 4012888888881881", language="en")
+
+    assert recognizer.get_nlp_artifacts_needed() is None
+    assert analyzer_engine.nlp_engine.processed == [None]
+    nlp_engine = analyzer_engine.nlp_engine
+    assert recognizer.nlp_artifacts_seen is nlp_engine.process_text("", "en")
+
+
+def test_when_overriding_recognizer_declares_needs_then_declaration_trusted():
+    recognizer = DeclaringArtifactsRecordingRecognizer(
+        supported_entity="CARD", patterns=[Pattern("card", r"\b\d{16}\b", 0.3)]
+    )
+    analyzer_engine = create_recording_analyzer_engine(recognizer)
+
+    analyzer_engine.analyze("my card is 4012888888881881", language="en")
+
+    assert recognizer.get_nlp_artifacts_needed() == frozenset()
+    assert analyzer_engine.nlp_engine.processed == []
+
+
+@pytest.mark.parametrize("fused_pattern_matching", [False, True])
+def test_when_recognizers_run_in_threads_then_same_results(
+    loaded_registry, fused_pattern_matching
+):
+    text = (
+        "My credit card is 4012888888881881, my email is john@example.com "
+        "and my phone is 212-555-5555. Visit https://microsoft.com "
+        "from 192.168.0.1, SSN 078-05-1120. "
+    ) * 20
+    nlp_engine = NlpEngineMock()
+    serial_engine = AnalyzerEngine(loaded_registry, nlp_engine)
+    threaded_engine = AnalyzerEngine(
+        loaded_registry,
+        nlp_engine,
+        fused_pattern_matching=fused_pattern_matching,
+        n_threads=4,
+    )
+
+    expected = serial_engine.analyze(text, language="en")
+    results = threaded_engine.analyze(text, language="en")
+
+    assert len(expected) > 20
+    assert [r.to_dict() for r in results] == [r.to_dict() for r in expected]
+    assert threaded_engine._get_executor() is threaded_engine._get_executor()
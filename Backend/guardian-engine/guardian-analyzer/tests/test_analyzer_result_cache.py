@@ -0,0 +1,156 @@
+import time
+
+import pytest
+
+from guardian_analyzer import (
+    AnalysisExplanation,
+    AnalyzerEngine,
+    AnalyzerResultCache,
+    Pattern,
+    PatternRecognizer,
+    RecognizerResult,
+)
+from tests.mocks import NlpEngineMock, RecognizerRegistryMock
+
+
+class CountingRecognizerRegistryMock(RecognizerRegistryMock):
+    """Count the analyses, each getting the recognizers once."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def get_recognizers(self, *args, **kwargs):
+        self.calls += 1
+        return super().get_recognizers(*args, **kwargs)
+
+
+@pytest.fixture(scope="function")
+def cached_analyzer_engine():
+    registry = CountingRecognizerRegistryMock()
+    registry.load_predefined_recognizers()
+    return AnalyzerEngine(
+        registry=registry,
+        nlp_engine=NlpEngineMock(),
+        result_cache=AnalyzerResultCache(),
+    )
+
+
+def test_when_same_key_then_hit_returns_copy():
+    cache = AnalyzerResultCache()
+    key = cache.get_key("my text", "en")
+    assert cache.get(key) is None
+
+    cache.put(key, [RecognizerResult("PERSON", 0, 2, 0.5)])
+    first = cache.get(key)
+    first[0].score = 1.0
+
+    assert cache.get(key)[0].score == 0.5
+    assert cache.get_stats()["hits"] == 2
+    assert cache.get_stats()["misses"] == 1
+
+
+def test_when_lazy_explanations_cached_then_created_only_on_access():
+    calls = []
+
+    def build_explanation():
+        calls.append(1)
+        return AnalysisExplanation(recognizer="test", original_score=0.5)
+
+    cache = AnalyzerResultCache()
+    key = cache.get_key("my text", "en")
+    cache.put(
+        key,
+        [RecognizerResult("PERSON", 0, 2, 0.5, analysis_explanation=build_explanation)],
+    )
+    first = cache.get(key)
+    assert calls == []
+
+    assert first[0].analysis_explanation.recognizer == "test"
+    assert calls == [1]
+    assert cache.get(key)[0].analysis_explanation is not first[0].analysis_explanation
+
+
+def test_when_params_differ_then_keys_differ():
+    cache = AnalyzerResultCache()
+    assert cache.get_key("text", "en") == cache.get_key("text", "en")
+    assert cache.get_key("text", "en") != cache.get_key("text", "de")
+    assert cache.get_key("text", "en") != cache.get_key("other", "en")
+
+
+def test_when_max_entries_exceeded_then_least_recently_used_evicted():
+    cache = AnalyzerResultCache(max_entries=2)
+    keys = [cache.get_key(text) for text in ("a", "b", "c")]
+    cache.put(keys[0], [])
+    cache.put(keys[1], [])
+    cache.get(keys[0])
+    cache.put(keys[2], [])
+
+    assert len(cache) == 2
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == []
+
+
+def test_when_max_size_exceeded_then_entries_evicted():
+    results = [RecognizerResult("PERSON", i, i + 1, 0.5) for i in range(10)]
+    cache = AnalyzerResultCache()
+    cache.put(cache.get_key("a"), results)
+    entry_size = cache.size_bytes
+    cache = AnalyzerResultCache(max_size_bytes=int(entry_size * 2.5))
+
+    for text in ("a", "b", "c"):
+        cache.put(cache.get_key(text), results)
+
+    assert len(cache) == 2
+    assert cache.size_bytes <= cache.max_size_bytes
+
+
+def test_when_ttl_expired_then_miss():
+    cache = AnalyzerResultCache(ttl_seconds=0.01)
+    key = cache.get_key("text")
+    cache.put(key, [])
+    time.sleep(0.02)
+
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_when_text_analyzed_twice_then_recognizers_run_once(cached_analyzer_engine):
+    text = "My credit card number is 4012888888881881"
+    first = cached_analyzer_engine.analyze(text, language="en")
+    second = cached_analyzer_engine.analyze(text, language="en")
+
+    assert cached_analyzer_engine.registry.calls == 1
+    assert [r.to_dict() for r in first] == [r.to_dict() for r in second]
+    assert cached_analyzer_engine.result_cache.hits == 1
+
+    cached_analyzer_engine.analyze(text, language="en", score_threshold=0.9)
+    assert cached_analyzer_engine.registry.calls == 2
+
+
+def test_when_registry_changes_then_cache_not_used(cached_analyzer_engine):
+    text = "My zip code is 90210"
+    assert cached_analyzer_engine.analyze(text, language="en") == []
+
+    cached_analyzer_engine.registry.add_recognizer(
+        PatternRecognizer(
+            supported_entity="ZIP", patterns=[Pattern("zip", r"\b\d{5}\b", 0.5)]
+        )
+    )
+    results = cached_analyzer_engine.analyze(text, language="en")
+
+    assert len(results) == 1
+    assert cached_analyzer_engine.registry.calls == 2
+
+
+def test_when_ad_hoc_recognizers_then_cache_bypassed(cached_analyzer_engine):
+    ad_hoc = PatternRecognizer(
+        supported_entity="ZIP", patterns=[Pattern("zip", r"\b\d{5}\b", 0.5)]
+    )
+    for _ in range(2):
+        cached_analyzer_engine.analyze(
+            "My zip code is 90210", language="en", ad_hoc_recognizers=[ad_hoc]
+        )
+
+    assert cached_analyzer_engine.registry.calls == 2
+    assert len(cached_analyzer_engine.result_cache) == 0
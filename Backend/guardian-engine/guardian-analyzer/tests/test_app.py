@@ -0,0 +1,264 @@
+import io
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+fitz = pytest.importorskip("fitz")
+cv2 = pytest.importorskip("cv2")
+pytest.importorskip("pytesseract")
+
+import app  # noqa: E402
+import image_redactor  # noqa: E402
+from guardian_analyzer import AnalyzerEngine  # noqa: E402
+from new_pdf_redactor import open_pdf  # noqa: E402
+from tests.mocks import NlpEngineMock  # noqa: E402
+
+TEXT = "Mail john@microsoft.com about the report"
+
+# Image words and their boxes, as OCR would find them
+IMAGE_WORDS = [("Mail", (10, 20, 40, 15)), ("john@microsoft.com", (60, 20, 120, 15))]
+
+
+class AnalyzerEngineProviderMock:
+    """Provider creating an engine with no NLP models, shared by the tests."""
+
+    engine = None
+
+    def __init__(self, **kwargs):
+        pass
+
+    def create_engine(self):
+        if AnalyzerEngineProviderMock.engine is None:
+            AnalyzerEngineProviderMock.engine = AnalyzerEngine(
+                nlp_engine=NlpEngineMock()
+            )
+        return AnalyzerEngineProviderMock.engine
+
+
+class DrmManagerMock:
+    """DRM manager copying the PDF, recording the owner it was created for."""
+
+    def __init__(self):
+        self.owner_ids = []
+
+    def create_drm_pdf(self, input_path, output_path, owner_id, expiry_date=None):
+        self.owner_ids.append(owner_id)
+        doc = open_pdf(input_path)
+        output_path.write(doc.tobytes())
+        doc.close()
+
+
+def create_pdf(text=TEXT):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def read_text(pdf_bytes, password=None):
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    try:
+        if password:
+            assert doc.needs_pass
+            assert doc.authenticate(password)
+        return "".join(page.get_text() for page in doc)
+    finally:
+        doc.close()
+
+
+def image_to_data(image, output_type=None):
+    data = {key: [] for key in ("text", "block_num", "par_num", "line_num")}
+    data.update({key: [] for key in ("left", "top", "width", "height")})
+    for text, (left, top, width, height) in IMAGE_WORDS:
+        data["text"].append(text)
+        data["block_num"].append(1)
+        data["par_num"].append(1)
+        data["line_num"].append(1)
+        data["left"].append(left)
+        data["top"].append(top)
+        data["width"].append(width)
+        data["height"].append(height)
+    return data
+
+
+@pytest.fixture(params=["in_memory", "spilled"])
+def server(request, monkeypatch):
+    """Server with its file size limit above, or below, the size of the files."""
+    limit = 100 * 1024 * 1024 if request.param == "in_memory" else 1
+    monkeypatch.setenv("IN_MEMORY_FILE_LIMIT", str(limit))
+    monkeypatch.setattr(app, "AnalyzerEngineProvider", AnalyzerEngineProviderMock)
+    monkeypatch.setattr(
+        app,
+        "PresidioImageRedactor",
+        lambda: image_redactor.PresidioImageRedactor(
+            analyzer_engine=AnalyzerEngineProviderMock().create_engine()
+        ),
+    )
+    monkeypatch.setattr(image_redactor.pytesseract, "image_to_data", image_to_data)
+
+    server = app.Server()
+    server.drm_manager = DrmManagerMock()
+    server.spilled = request.param == "spilled"
+
+    # Record the temporary files and outputs of the requests
+    server.temp_paths = []
+    mkstemp = tempfile.mkstemp
+
+    def recording_mkstemp(*args, **kwargs):
+        fd, path = mkstemp(*args, **kwargs)
+        server.temp_paths.append(path)
+        return fd, path
+
+    monkeypatch.setattr(tempfile, "mkstemp", recording_mkstemp)
+
+    server.outputs = []
+    output_file = server._output_file
+
+    def recording_output_file():
+        output = output_file()
+        server.outputs.append(output)
+        return output
+
+    monkeypatch.setattr(server, "_output_file", recording_output_file)
+    return server
+
+
+def post(server, route, data, filename="document.pdf"):
+    """Post a file to a route, returning the response once the file was sent."""
+    file_bytes = data.pop("file")
+    data["file"] = (io.BytesIO(file_bytes), filename)
+    with server.app.test_client() as client:
+        response = client.post(route, data=data, content_type="multipart/form-data")
+        response.get_data()
+        response.close()
+    return response
+
+
+def assert_files_released(server, requests=1):
+    """Check uploads went to memory or to a temporary file, removed afterwards."""
+    if server.spilled:
+        assert len(server.temp_paths) == requests
+    else:
+        assert server.temp_paths == []
+    assert not any(os.path.exists(path) for path in server.temp_paths)
+    assert all(output.closed for output in server.outputs)
+    assert all(output._rolled == server.spilled for output in server.outputs)
+
+
+def test_when_redact_pdf_then_entities_redacted(server):
+    response = post(server, "/redact-pdf", {"file": create_pdf()})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/pdf"
+    assert "attachment; filename=redacted_document.pdf" in (
+        response.headers["Content-Disposition"]
+    )
+    text = read_text(response.data)
+    assert "about the report" in text
+    assert "john@microsoft.com" not in text
+    assert_files_released(server)
+
+
+def test_when_encrypt_pdf_then_password_needed(server):
+    response = post(
+        server, "/encrypt-pdf", {"file": create_pdf(), "password": "secret"}
+    )
+
+    assert response.status_code == 200
+    assert "john@microsoft.com" in read_text(response.data, password="secret")
+    assert_files_released(server)
+
+
+def test_when_redact_image_then_entity_boxes_filled(server):
+    image = np.full((60, 200, 3), 255, dtype=np.uint8)
+    _, png = cv2.imencode(".png", image)
+
+    response = post(
+        server, "/redact-image", {"file": png.tobytes()}, filename="scan.png"
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "image/png"
+    redacted = cv2.imdecode(
+        np.frombuffer(response.data, dtype=np.uint8), cv2.IMREAD_COLOR
+    )
+    left, top, width, height = IMAGE_WORDS[1][1]
+    assert (redacted[top : top + height, left : left + width] == 0).all()
+    left, top, width, height = IMAGE_WORDS[0][1]
+    assert (redacted[top : top + height, left : left + width] == 255).all()
+    assert_files_released(server)
+
+
+def test_when_analyze_pdf_then_entities_returned(server):
+    response = post(
+        server,
+        "/analyze-pdf",
+        {"file": create_pdf(), "entities": json.dumps(["EMAIL_ADDRESS"])},
+    )
+
+    assert response.status_code == 200
+    assert [
+        (entity["entity_type"], entity["text_snippet"]) for entity in response.json
+    ] == [("EMAIL_ADDRESS", "john@microsoft.com")]
+    assert_files_released(server)
+
+
+def test_when_redact_from_strings_then_strings_redacted(server):
+    response = post(
+        server,
+        "/redact-from-strings",
+        {"file": create_pdf(), "strings": json.dumps(["report"])},
+    )
+
+    assert response.status_code == 200
+    text = read_text(response.data)
+    assert "john@microsoft.com" in text
+    assert "report" not in text
+    assert_files_released(server)
+
+
+def test_when_create_drm_pdf_then_drm_pdf_returned(server):
+    response = post(server, "/create-drm-pdf", {"file": create_pdf(), "owner_id": "7"})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/drmpdf"
+    assert "john@microsoft.com" in read_text(response.data)
+    assert server.drm_manager.owner_ids == ["7"]
+    assert_files_released(server)
+
+
+def test_when_concurrent_uploads_with_same_name_then_each_gets_its_own(server):
+    redact_strings_only = server.pdf_redactor.redact_strings_only
+    both_uploaded = threading.Barrier(2, timeout=10)
+
+    def redact_when_both_uploaded(**kwargs):
+        both_uploaded.wait()
+        return redact_strings_only(**kwargs)
+
+    server.pdf_redactor.redact_strings_only = redact_when_both_uploaded
+    texts = ["First secret report", "Second secret memo"]
+
+    def redact(text):
+        response = post(
+            server,
+            "/redact-from-strings",
+            {"file": create_pdf(text), "strings": json.dumps(["secret"])},
+        )
+        assert response.status_code == 200
+        return read_text(response.data)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first, second = executor.map(redact, texts)
+
+    assert "report" in first and "memo" not in first
+    assert "memo" in second and "report" not in second
+    assert "secret" not in first + second
+    assert_files_released(server, requests=2)
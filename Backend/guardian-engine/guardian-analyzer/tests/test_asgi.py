@@ -0,0 +1,165 @@
+import asyncio
+import importlib
+import sys
+import threading
+
+import pytest
+
+pytest.importorskip("a2wsgi")
+flask = pytest.importorskip("flask")
+
+
+class ServerMock:
+    """Server with an /analyze and a /redact-pdf route, which can be held."""
+
+    def __init__(self):
+        self.app = flask.Flask(__name__)
+        self.release = threading.Event()
+        self.release.set()
+        self.started = 0
+        self.closed = 0
+        self.route_threads = {}
+
+        @self.app.route("/analyze", methods=["GET"])
+        def analyze():
+            return self._handle("/analyze")
+
+        @self.app.route("/redact-pdf", methods=["GET"])
+        def redact_pdf():
+            return self._handle("/redact-pdf")
+
+    def _handle(self, path):
+        self.route_threads.setdefault(path, set()).add(threading.current_thread())
+        self.release.wait(timeout=10)
+        return path
+
+    def start(self):
+        self.started += 1
+
+    def close(self):
+        self.closed += 1
+
+
+@pytest.fixture
+def asgi(monkeypatch):
+    # The module creates the app at import, with a mock server
+    import app
+
+    monkeypatch.setattr(app, "Server", ServerMock)
+    sys.modules.pop("asgi", None)
+    yield importlib.import_module("asgi")
+    sys.modules.pop("asgi", None)
+
+
+async def request(asgi_app, path):
+    """Send a GET request to an ASGI app, returning the status and body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    received = asyncio.Event()
+    messages = []
+
+    async def receive():
+        if not received.is_set():
+            received.set()
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    status = messages[0]["status"]
+    body = b"".join(m.get("body", b"") for m in messages[1:])
+    return status, body
+
+
+async def wait_for(condition):
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError
+
+
+def test_when_pool_saturated_then_too_many_requests(asgi):
+    asgi_app = asgi.GuardianAsgiApp(
+        server=ServerMock(), analyze_workers=2, file_workers=1, max_queued=1
+    )
+    asgi_app.server.release.clear()
+
+    async def saturate():
+        held = [
+            asyncio.create_task(request(asgi_app, "/analyze")) for _ in range(3)
+        ]
+        await wait_for(lambda: asgi_app.analyze_pool.active == 3)
+
+        rejected = await request(asgi_app, "/analyze")
+        # The other pool isn't saturated
+        asgi_app.server.release.set()
+        accepted = await request(asgi_app, "/redact-pdf")
+        return rejected, accepted, await asyncio.gather(*held)
+
+    rejected, accepted, held = asyncio.run(saturate())
+
+    assert rejected[0] == 429
+    assert b"Too many requests" in rejected[1]
+    assert accepted == (200, b"/redact-pdf")
+    assert held == [(200, b"/analyze")] * 3
+    assert asgi_app.analyze_pool.active == 0
+
+
+def test_when_file_route_then_served_by_file_pool(asgi):
+    asgi_app = asgi.GuardianAsgiApp(
+        server=ServerMock(), analyze_workers=1, file_workers=1, max_queued=0
+    )
+    server = asgi_app.server
+    server.release.clear()
+
+    async def hold_file_pool():
+        held = asyncio.create_task(request(asgi_app, "/redact-pdf"))
+        await wait_for(lambda: asgi_app.file_pool.active == 1)
+
+        results = [
+            await request(asgi_app, "/redact-pdf"),
+            await request(asgi_app, "/analyze-pdf"),
+        ]
+        server.release.set()
+        results.append(await request(asgi_app, "/analyze"))
+        return results, await held
+
+    results, held = asyncio.run(hold_file_pool())
+
+    assert [status for status, _ in results] == [429, 429, 200]
+    assert held == (200, b"/redact-pdf")
+    assert asgi_app.analyze_pool.active == 0
+    assert not (server.route_threads["/analyze"] & server.route_threads["/redact-pdf"])
+
+
+def test_when_lifespan_then_server_started_and_closed(asgi):
+    asgi_app = asgi.GuardianAsgiApp(server=ServerMock())
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        assert asgi_app.server.started == len(sent)
+        return messages[len(sent)]
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(asgi_app({"type": "lifespan"}, receive, send))
+
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert (asgi_app.server.started, asgi_app.server.closed) == (1, 1)
@@ -1,5 +1,13 @@
+import os
+from typing import Iterator
+
 import pytest
-from guardian_analyzer import RecognizerResult, BatchAnalyzerEngine, DictAnalyzerResult
+from guardian_analyzer import (
+    BatchAnalyzerEngine,
+    DictAnalyzerResult,
+    PatternRecognizer,
+    RecognizerResult,
+)
 
 
 @pytest.fixture(scope="module")
@@ -277,4 +285,96 @@ def test_batch_analyze_iterator_returns_list_of_recognizer_results(
 
     assert len(results) == len(expected_output)
     for result, expected_result in zip(results, expected_output):
-        assert result == expected_result
\ No newline at end of file
+        assert result == expected_result
+
+class CrashingRecognizer(PatternRecognizer):
+    """Kill the worker process analyzing "crash", until the flag file exists."""
+
+    def __init__(self, flag_file=None):
+        super().__init__(supported_entity="CRASH", deny_list=["crash"])
+        self.flag_file = flag_file
+
+    def analyze(self, text, entities, nlp_artifacts=None, regex_flags=None):
+        if text == "crash" and not (self.flag_file and os.path.exists(self.flag_file)):
+            if self.flag_file:
+                open(self.flag_file, "w").close()
+            os._exit(1)
+        return super().analyze(text, entities, nlp_artifacts, regex_flags)
+
+
+@pytest.fixture(scope="module")
+def multiprocess_batch_analyzer_engine(analyzer_engine_simple):
+    with BatchAnalyzerEngine(
+        analyzer_engine=analyzer_engine_simple, n_process=2, chunk_size=3
+    ) as engine:
+        yield engine
+
+
+def test_when_n_process_then_results_identical_and_in_order(
+    batch_analyzer_engine_simple, multiprocess_batch_analyzer_engine
+):
+    texts = [f"Call me at 212155{i:04d} or visit microsoft.com" for i in range(20)]
+    texts += ["", None, 2121551234, "no entities here"]
+
+    expected = batch_analyzer_engine_simple.analyze_iterator(texts, language="en")
+    results = multiprocess_batch_analyzer_engine.analyze_iterator(
+        texts, language="en"
+    )
+
+    assert results == expected
+
+
+def test_when_n_process_then_dict_results_identical(
+    batch_analyzer_engine_simple, multiprocess_batch_analyzer_engine
+):
+    d = {
+        "url": "https://microsoft.com",
+        "emp_id": "XXX",
+        "phone": "202-555-1234",
+        "number": 2025551234,
+        "empty": "",
+        "misc": ["microsoft.com or (202)-555-1234", "nothing"],
+        "nested": {"phone": "202-555-1234", "url": "microsoft.com"},
+    }
+
+    def to_list(results):
+        return [
+            (r.key, r.value, r.recognizer_results)
+            if not isinstance(r.recognizer_results, Iterator)
+            else (r.key, r.value, to_list(r.recognizer_results))
+            for r in results
+        ]
+
+    expected = to_list(batch_analyzer_engine_simple.analyze_dict(d, language="en"))
+    results = to_list(
+        multiprocess_batch_analyzer_engine.analyze_dict(d, language="en")
+    )
+
+    assert results == expected
+
+
+def test_when_worker_crashes_then_chunk_retried(analyzer_engine_simple, tmp_path):
+    recognizer = CrashingRecognizer(flag_file=str(tmp_path / "crashed"))
+    texts = ["Call me at 2121551234", "crash", "nothing"] * 3
+
+    with BatchAnalyzerEngine(
+        analyzer_engine=analyzer_engine_simple, n_process=2, chunk_size=2
+    ) as engine:
+        results = engine.analyze_iterator(
+            texts, language="en", ad_hoc_recognizers=[recognizer]
+        )
+
+    assert os.path.exists(recognizer.flag_file)
+    assert len(results) == len(texts)
+    assert [r.entity_type for r in results[1]] == ["CRASH"]
+    assert [r.entity_type for r in results[0]] == ["PHONE_NUMBER"]
+
+
+def test_when_worker_keeps_crashing_then_error(analyzer_engine_simple):
+    with BatchAnalyzerEngine(
+        analyzer_engine=analyzer_engine_simple, n_process=2, chunk_size=2
+    ) as engine:
+        with pytest.raises(RuntimeError):
+            engine.analyze_iterator(
+                ["a", "crash"], language="en", ad_hoc_recognizers=[CrashingRecognizer()]
+            )
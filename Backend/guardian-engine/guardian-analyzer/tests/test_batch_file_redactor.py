@@ -0,0 +1,205 @@
+import csv
+import json
+import os
+
+import pytest
+
+from guardian_analyzer import BatchAnalyzerEngine
+
+pytest.importorskip("presidio_anonymizer")
+
+from guardian_analyzer.batch_file_redactor import BatchFileRedactor  # noqa: E402
+
+ROWS = [
+    {"id": "1", "name": "John", "comments": "call me at 202-555-1234"},
+    {"id": "2", "name": "Jill", "comments": "see https://microsoft.com\nthanks"},
+    {"id": "3", "name": "Jack", "comments": "nothing here"},
+    {"id": "4", "name": "Jane", "comments": "202-555-9876 or 202-555-5555"},
+    {"id": "2025551234", "name": "June", "comments": ""},
+]
+
+
+class CrashingBatchAnalyzerEngine(BatchAnalyzerEngine):
+    """Raise after analyzing a number of values."""
+
+    def __init__(self, analyzer_engine, crash_after):
+        super().__init__(analyzer_engine=analyzer_engine)
+        self.crash_after = crash_after
+        self.analyzed = []
+
+    def analyze_iterator(self, texts, language, **kwargs):
+        texts = list(texts)
+        if len(self.analyzed) + len(texts) > self.crash_after:
+            raise RuntimeError("crash")
+        self.analyzed.extend(texts)
+        return super().analyze_iterator(texts, language, **kwargs)
+
+
+@pytest.fixture
+def redactor(analyzer_engine_simple):
+    return BatchFileRedactor(
+        batch_analyzer_engine=BatchAnalyzerEngine(analyzer_engine_simple),
+        batch_size=2,
+        checkpoint_interval=2,
+    )
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+
+def test_when_csv_redacted_then_selected_columns_redacted(redactor, tmp_path):
+    input_path = str(tmp_path / "input.csv")
+    output_path = str(tmp_path / "output.csv")
+    write_csv(input_path, ROWS)
+
+    rows = redactor.redact_file(input_path, output_path, skip_columns=["id"])
+
+    assert rows == len(ROWS)
+    output = read_csv(output_path)
+    assert [row["id"] for row in output] == [row["id"] for row in ROWS]
+    assert [row["comments"] for row in output] == [
+        "call me at <PHONE_NUMBER>",
+        "see <URL>\nthanks",
+        "nothing here",
+        "<PHONE_NUMBER> or <PHONE_NUMBER>",
+        "",
+    ]
+    assert not os.path.exists(output_path + ".checkpoint")
+
+
+def test_when_columns_selected_then_only_they_redacted(redactor, tmp_path):
+    input_path = str(tmp_path / "input.csv")
+    output_path = str(tmp_path / "output.csv")
+    write_csv(input_path, ROWS)
+
+    redactor.redact_file(input_path, output_path, columns=["id", "name"])
+
+    output = read_csv(output_path)
+    assert output[4]["id"] == "<PHONE_NUMBER>"
+    assert [row["comments"] for row in output] == [row["comments"] for row in ROWS]
+
+
+def test_when_csv_rows_irregular_then_written_as_read(redactor, tmp_path):
+    input_path = tmp_path / "input.csv"
+    output_path = tmp_path / "output.csv"
+    input_path.write_bytes(b"a,b\r\nshort\r\n1,202-555-1234,extra\r\n")
+
+    redactor.redact_file(str(input_path), str(output_path))
+
+    assert output_path.read_bytes() == b"a,b\r\nshort\r\n1,<PHONE_NUMBER>,extra\r\n"
+
+
+def test_when_jsonl_redacted_then_string_values_redacted(redactor, tmp_path):
+    input_path = tmp_path / "input.jsonl"
+    output_path = tmp_path / "output.jsonl"
+    lines = [
+        {"phone": "202-555-1234", "count": 2025551234, "nested": {"a": "b"}},
+        ["not", "an", "object"],
+        {"url": "see https://microsoft.com"},
+    ]
+    input_path.write_text("\n".join(json.dumps(line) for line in lines) + "\n\n")
+
+    redactor.redact_file(str(input_path), str(output_path))
+
+    output = [json.loads(line) for line in output_path.read_text().splitlines()]
+    assert output == [
+        {"phone": "<PHONE_NUMBER>", "count": 2025551234, "nested": {"a": "b"}},
+        ["not", "an", "object"],
+        {"url": "see <URL>"},
+    ]
+
+
+@pytest.mark.parametrize("file_format", ["csv", "jsonl"])
+def test_when_resumed_after_crash_then_same_output(
+    redactor, analyzer_engine_simple, tmp_path, file_format
+):
+    rows = [
+        {"id": str(i), "text": f"call {i} at 202-555-{1000 + i}"} for i in range(25)
+    ]
+    input_path = str(tmp_path / f"input.{file_format}")
+    if file_format == "csv":
+        write_csv(input_path, rows)
+    else:
+        with open(input_path, "w") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+
+    expected_path = str(tmp_path / f"expected.{file_format}")
+    redactor.redact_file(input_path, expected_path, columns=["text"])
+
+    output_path = str(tmp_path / f"output.{file_format}")
+    crashing_engine = CrashingBatchAnalyzerEngine(analyzer_engine_simple, 13)
+    crashing_redactor = BatchFileRedactor(
+        batch_analyzer_engine=crashing_engine, batch_size=2, checkpoint_interval=4
+    )
+    with pytest.raises(RuntimeError):
+        crashing_redactor.redact_file(input_path, output_path, columns=["text"])
+    assert os.path.exists(output_path + ".checkpoint")
+
+    resumed_engine = CrashingBatchAnalyzerEngine(analyzer_engine_simple, 100)
+    resumed_redactor = BatchFileRedactor(
+        batch_analyzer_engine=resumed_engine, batch_size=2, checkpoint_interval=4
+    )
+    assert resumed_redactor.redact_file(
+        input_path, output_path, columns=["text"], resume=True
+    ) == len(rows)
+
+    # Rows after the last checkpoint are analyzed again
+    assert resumed_engine.analyzed == [row["text"] for row in rows[12:]]
+    with open(output_path, "rb") as output, open(expected_path, "rb") as expected:
+        assert output.read() == expected.read()
+    assert not os.path.exists(output_path + ".checkpoint")
+
+
+def test_when_checkpoint_of_other_input_then_error(redactor, tmp_path):
+    input_path = str(tmp_path / "input.csv")
+    output_path = str(tmp_path / "output.csv")
+    write_csv(input_path, ROWS)
+    with open(output_path + ".checkpoint", "w") as f:
+        json.dump({"input_path": "other.csv", "format": "csv"}, f)
+
+    with pytest.raises(ValueError):
+        redactor.redact_file(input_path, output_path, resume=True)
+
+
+def test_when_parquet_resumed_then_same_rows(redactor, tmp_path):
+    pyarrow = pytest.importorskip("pyarrow")
+    import pyarrow.parquet
+
+    rows = [{"id": i, "text": f"call 202-555-{1000 + i}"} for i in range(10)]
+    input_path = str(tmp_path / "input.parquet")
+    pyarrow.parquet.write_table(
+        pyarrow.Table.from_pylist(rows), input_path, row_group_size=3
+    )
+    output_path = str(tmp_path / "output")
+    with open(output_path + ".checkpoint", "w") as f:
+        json.dump(
+            {
+                "input_path": os.path.abspath(input_path),
+                "format": "parquet",
+                "rows": 4,
+                "input_position": 4,
+                "output_position": 0,
+            },
+            f,
+        )
+
+    redactor.redact_file(input_path, output_path, resume=True)
+
+    output = pyarrow.parquet.read_table(output_path).to_pylist()
+    assert output == [
+        {"id": i, "text": "call <PHONE_NUMBER>"} for i in range(4, 10)
+    ]
+
+
+def test_when_unknown_extension_then_error(redactor, tmp_path):
+    with pytest.raises(ValueError):
+        redactor.redact_file(str(tmp_path / "input.txt"), str(tmp_path / "output"))
@@ -1,6 +1,50 @@
+import random
+import time
+
+import pytest
+
 from guardian_analyzer import EntityRecognizer, RecognizerResult, AnalysisExplanation
 
 
+def remove_duplicates_quadratic(results):
+    # The pairwise implementation remove_duplicates must give the same results as
+    results = list(set(results))
+    results = sorted(results, key=lambda x: (-x.score, x.start, -(x.end - x.start)))
+    filtered_results = []
+    for result in results:
+        if result.score == 0:
+            continue
+        to_keep = result not in filtered_results
+        if to_keep:
+            for filtered in filtered_results:
+                if (
+                    result.contained_in(filtered)
+                    and result.entity_type == filtered.entity_type
+                ):
+                    to_keep = False
+                    break
+        if to_keep:
+            filtered_results.append(result)
+    return filtered_results
+
+
+def random_results(count, text_length, seed=0):
+    rand = random.Random(seed)
+    results = []
+    for _ in range(count):
+        start = rand.randrange(text_length)
+        end = min(text_length, start + rand.randint(0, 20))
+        results.append(
+            RecognizerResult(
+                entity_type=rand.choice(["A", "B", "C"]),
+                start=start,
+                end=end,
+                score=rand.choice([0, 0.05, 0.3, 0.5, 0.85, 1.0]),
+            )
+        )
+    return results
+
+
 def test_when_to_dict_then_return_correct_dictionary():
     ent_recognizer = EntityRecognizer(["ENTITY"])
     entity_rec_dict = ent_recognizer.to_dict()
@@ -119,3 +163,27 @@ def test_when_remove_duplicates_contained_shorter_length_results_removed():
     ]
     results = EntityRecognizer.remove_duplicates(arr)
     assert len(results) == 1
+
+
+def test_when_remove_duplicates_then_same_results_as_pairwise_comparison():
+    for seed in range(20):
+        results = random_results(300, 200, seed=seed)
+        expected = remove_duplicates_quadratic(results)
+        actual = EntityRecognizer.remove_duplicates(results)
+        assert [id(r) for r in actual] == [id(r) for r in expected]
+
+
+@pytest.mark.slow
+def test_when_remove_duplicates_many_results_then_scales_linearly():
+    def timed(count):
+        results = random_results(count, count * 10)
+        start = time.perf_counter()
+        EntityRecognizer.remove_duplicates(results)
+        return time.perf_counter() - start
+
+    small = min(timed(10_000) for _ in range(3))
+    large = timed(100_000)
+
+    # 10 times more results: n log n is ~12-20 times slower (allowing for
+    # cache effects), pairwise comparison would be ~100 times slower
+    assert large / small < 40
@@ -0,0 +1,169 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from guardian_analyzer import (
+    AnalyzerEngine,
+    FusedPatternMatcher,
+    Pattern,
+    PatternRecognizer,
+    RecognizerRegistry,
+)
+from guardian_analyzer.predefined_recognizers import (
+    CreditCardRecognizer,
+    EmailRecognizer,
+    PhoneRecognizer,
+    UsSsnRecognizer,
+)
+from tests.mocks import NlpEngineMock
+
+
+TEXT = (
+    "My credit card is 4012888888881881 and my ssn is 078-05-1120, "
+    "my zip is 98052 and my email is john@microsoft.com. "
+    "Call me at (425) 882-9090, not at 999-99-9999 or 4012888888881882."
+)
+
+
+class ValidatingRecognizer(PatternRecognizer):
+    def validate_result(self, pattern_text):
+        return pattern_text.startswith("9")
+
+    def invalidate_result(self, pattern_text):
+        return pattern_text.endswith("0")
+
+
+@pytest.fixture(scope="module")
+def recognizers(zip_code_recognizer):
+    duplicate_zip = ValidatingRecognizer(
+        supported_entity="ZIP_VALIDATED",
+        patterns=zip_code_recognizer.patterns,
+        deny_list=["ssn", "email"],
+    )
+    return [
+        CreditCardRecognizer(),
+        UsSsnRecognizer(),
+        EmailRecognizer(),
+        zip_code_recognizer,
+        duplicate_zip,
+        PhoneRecognizer(),
+    ]
+
+
+def to_tuples(results):
+    return [
+        (
+            r.entity_type,
+            r.start,
+            r.end,
+            r.score,
+            r.analysis_explanation.pattern_name,
+            r.analysis_explanation.validation_result,
+        )
+        for r in results
+    ]
+
+
+def test_when_fused_then_results_identical_to_recognizers(recognizers):
+    fused_results = FusedPatternMatcher().analyze(text=TEXT, recognizers=recognizers)
+
+    for recognizer in recognizers:
+        if not FusedPatternMatcher.is_fusable(recognizer):
+            assert recognizer.id not in fused_results
+            continue
+        expected = recognizer.analyze(TEXT, recognizer.supported_entities)
+        assert to_tuples(fused_results[recognizer.id]) == to_tuples(expected)
+
+
+def test_when_shared_regex_then_compiled_once(recognizers):
+    matcher = FusedPatternMatcher()
+    fusable = [rec for rec in recognizers if matcher.is_fusable(rec)]
+    compiled_regexes, _, owners = matcher._get_plan(fusable)
+
+    total_patterns = sum(len(rec.patterns) for rec in fusable)
+    assert len(owners) == len(fusable)
+    assert len(compiled_regexes) < total_patterns
+    assert len(compiled_regexes) == len(
+        {(p.regex, rec.global_regex_flags) for rec in fusable for p in rec.patterns}
+    )
+
+
+def test_when_same_recognizers_then_plan_reused(recognizers):
+    matcher = FusedPatternMatcher(max_plans=1)
+    first = matcher._get_plan(recognizers[:2])
+    assert matcher._get_plan(recognizers[:2]) is first
+
+    matcher._get_plan(recognizers[2:4])
+    assert matcher._get_plan(recognizers[:2]) is not first
+    assert len(matcher._plans) == 1
+
+
+def test_when_plans_evicted_concurrently_then_no_error(recognizers):
+    matcher = FusedPatternMatcher(max_plans=1)
+    fusable = [rec for rec in recognizers if matcher.is_fusable(rec)]
+    recognizer_sets = [fusable[:2], fusable[2:4], fusable[1:3]]
+    expected = [matcher.analyze(TEXT, subset) for subset in recognizer_sets]
+
+    def analyze(i):
+        subset = i % len(recognizer_sets)
+        results = matcher.analyze(TEXT, recognizer_sets[subset])
+        return {rec_id: to_tuples(res) for rec_id, res in results.items()} == {
+            rec_id: to_tuples(res) for rec_id, res in expected[subset].items()
+        }
+
+    # Switch threads often, for them to interleave within _get_plan
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert all(executor.map(analyze, range(300)))
+    finally:
+        sys.setswitchinterval(switch_interval)
+    assert len(matcher._plans) == 1
+
+
+def test_when_analyze_overridden_then_not_fusable(recognizers):
+    class CustomRecognizer(PatternRecognizer):
+        def analyze(self, text, entities, nlp_artifacts=None, regex_flags=None):
+            return []
+
+    custom = CustomRecognizer(
+        supported_entity="CUSTOM", patterns=[Pattern("any", r"\d+", 0.5)]
+    )
+
+    assert not FusedPatternMatcher.is_fusable(custom)
+    assert FusedPatternMatcher().analyze(TEXT, [custom]) == {}
+
+
+@pytest.mark.parametrize("return_decision_process", [True, False])
+def test_when_fused_pattern_matching_then_engine_results_identical(
+    recognizers, return_decision_process
+):
+    registry = RecognizerRegistry(recognizers=recognizers)
+    nlp_engine = NlpEngineMock()
+    engine = AnalyzerEngine(registry=registry, nlp_engine=nlp_engine)
+    fused_engine = AnalyzerEngine(
+        registry=registry, nlp_engine=nlp_engine, fused_pattern_matching=True
+    )
+
+    expected = engine.analyze(
+        TEXT, language="en", return_decision_process=return_decision_process
+    )
+    actual = fused_engine.analyze(
+        TEXT, language="en", return_decision_process=return_decision_process
+    )
+
+    def to_dicts(results):
+        return [
+            {
+                **r.to_dict(),
+                "analysis_explanation": r.analysis_explanation.to_dict()
+                if r.analysis_explanation
+                else None,
+            }
+            for r in results
+        ]
+
+    assert fused_engine.pattern_matcher is not None
+    assert to_dicts(actual) == to_dicts(expected)
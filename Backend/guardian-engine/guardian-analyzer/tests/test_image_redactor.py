@@ -0,0 +1,125 @@
+import pytest
+
+pytest.importorskip("cv2")
+pytest.importorskip("pytesseract")
+
+from image_redactor import PresidioImageRedactor  # noqa: E402
+
+
+def ocr_data(*words):
+    """Build image_to_data output from (text, block, paragraph, line) words."""
+    data = {
+        key: []
+        for key in ("text", "block_num", "par_num", "line_num")
+        + ("left", "top", "width", "height")
+    }
+    for i, (text, block_num, par_num, line_num) in enumerate(words):
+        data["text"].append(text)
+        data["block_num"].append(block_num)
+        data["par_num"].append(par_num)
+        data["line_num"].append(line_num)
+        data["left"].append(10 * i)
+        data["top"].append(20 * line_num)
+        data["width"].append(len(text))
+        data["height"].append(10)
+    return data
+
+
+def entity_boxes(text, entity_text, word_starts, word_ends, word_boxes):
+    start = text.index(entity_text)
+    return PresidioImageRedactor.get_entity_boxes(
+        start, start + len(entity_text), word_starts, word_ends, word_boxes
+    )
+
+
+def test_when_ocr_words_then_text_built_with_line_and_paragraph_separators():
+    data = ocr_data(
+        ("Call", 1, 1, 1),
+        ("John", 1, 1, 1),
+        ("Smith", 1, 1, 2),
+        ("Address", 1, 2, 1),
+        ("Paris", 2, 1, 1),
+    )
+
+    text, word_starts, word_ends, word_boxes = (
+        PresidioImageRedactor.build_text_from_ocr(data)
+    )
+
+    assert text == "Call John\nSmith\n\nAddress\n\nParis"
+    assert [text[s:e] for s, e in zip(word_starts, word_ends)] == [
+        "Call",
+        "John",
+        "Smith",
+        "Address",
+        "Paris",
+    ]
+    assert word_boxes[2] == (20, 40, 5, 10)
+
+
+def test_when_empty_ocr_tokens_then_skipped():
+    data = ocr_data(
+        ("", 1, 0, 0),
+        ("Call", 1, 1, 1),
+        ("  ", 1, 1, 1),
+        (" me ", 1, 1, 1),
+        ("", 1, 1, 2),
+    )
+
+    text, word_starts, word_ends, word_boxes = (
+        PresidioImageRedactor.build_text_from_ocr(data)
+    )
+
+    assert text == "Call me"
+    assert word_starts == [0, 5]
+    assert word_ends == [4, 7]
+    assert word_boxes == [(10, 20, 4, 10), (30, 20, 4, 10)]
+
+
+def test_when_no_ocr_words_then_empty_text():
+    text, word_starts, word_ends, word_boxes = (
+        PresidioImageRedactor.build_text_from_ocr(ocr_data(("", 1, 0, 0)))
+    )
+
+    assert (text, word_starts, word_ends, word_boxes) == ("", [], [], [])
+
+
+def test_when_entity_spans_words_then_all_their_boxes_returned():
+    data = ocr_data(
+        ("Dear", 1, 1, 1),
+        ("John", 1, 1, 1),
+        ("Smith,", 1, 1, 1),
+        ("hello", 1, 1, 2),
+    )
+    text, *word_index = PresidioImageRedactor.build_text_from_ocr(data)
+    word_boxes = word_index[2]
+
+    assert entity_boxes(text, "John Smith", *word_index) == word_boxes[1:3]
+    assert entity_boxes(text, "Smith,\nhello", *word_index) == word_boxes[2:4]
+
+
+def test_when_word_contains_entity_text_then_only_entity_word_redacted():
+    data = ocr_data(
+        ("Ann", 1, 1, 1),
+        ("Annapolis", 1, 1, 1),
+        ("Joanne", 1, 1, 1),
+    )
+    text, *word_index = PresidioImageRedactor.build_text_from_ocr(data)
+    word_boxes = word_index[2]
+
+    # "Ann" is also found in the text of the other words
+    assert entity_boxes(text, "Ann", *word_index) == [word_boxes[0]]
+    # An entity within a word redacts that whole word only
+    start = text.index("oann")
+    assert PresidioImageRedactor.get_entity_boxes(
+        start, start + 4, *word_index
+    ) == [word_boxes[2]]
+
+
+def test_when_span_starts_or_ends_on_separator_then_adjacent_words_excluded():
+    data = ocr_data(("one", 1, 1, 1), ("two", 1, 1, 1), ("three", 1, 1, 1))
+    text, *word_index = PresidioImageRedactor.build_text_from_ocr(data)
+    word_boxes = word_index[2]
+
+    assert PresidioImageRedactor.get_entity_boxes(3, 8, *word_index) == [
+        word_boxes[1]
+    ]
@@ -1,4 +1,7 @@
-from guardian_analyzer import LemmaContextAwareEnhancer
+import pytest
+
+from guardian_analyzer import LemmaContextAwareEnhancer, Pattern, PatternRecognizer
+from guardian_analyzer.nlp_engine import NlpArtifacts
 
 
 def test_when_index_finding_then_succeed():
@@ -13,3 +16,97 @@ def test_when_index_finding_then_succeed():
         match, start, tokens, tokens_indices
     )
     assert index == 3
+
+
+def test_when_index_between_tokens_then_next_token_found():
+    tokens = ["my", "phone", "number", "is:(425", ")", "882", "-", "9090"]
+    tokens_indices = [0, 3, 9, 16, 23, 25, 28, 29]
+    # start index falls on the space after "phone"
+    assert (
+        LemmaContextAwareEnhancer._find_index_of_match_token(
+            "number", 8, tokens, tokens_indices
+        )
+        == 2
+    )
+    assert (
+        LemmaContextAwareEnhancer._find_index_of_match_token(
+            "my", 0, tokens, tokens_indices
+        )
+        == 0
+    )
+    assert (
+        LemmaContextAwareEnhancer._find_index_of_match_token(
+            "90", 31, tokens, tokens_indices
+        )
+        == 7
+    )
+
+
+def test_when_index_after_last_token_then_raises():
+    tokens = ["my", "phone"]
+    tokens_indices = [0, 3]
+    with pytest.raises(ValueError):
+        LemmaContextAwareEnhancer._find_index_of_match_token(
+            "x", 8, tokens, tokens_indices
+        )
+
+
+def test_when_many_results_then_context_extracted_once_per_token():
+    tokens = ["my", "phone", "is", "555", "and", "555"]
+    tokens_indices = [0, 3, 9, 12, 16, 20]
+    nlp_artifacts = NlpArtifacts([], tokens, tokens_indices, tokens, None, "en")
+    nlp_artifacts.keywords = ["my", "phone", "555"]
+    enhancer = LemmaContextAwareEnhancer(context_prefix_count=2)
+
+    context_by_token_index = {}
+    first = enhancer._extract_surrounding_words(
+        nlp_artifacts,
+        "555",
+        12,
+        lemmatized_keywords=set(nlp_artifacts.keywords),
+        context_by_token_index=context_by_token_index,
+    )
+    first.append("mutated")
+    second = enhancer._extract_surrounding_words(
+        nlp_artifacts,
+        "555",
+        12,
+        lemmatized_keywords=set(),
+        context_by_token_index=context_by_token_index,
+    )
+
+    assert list(context_by_token_index) == [3]
+    assert sorted(second) == ["555", "my", "phone"]
+
+
+def test_when_enhancing_then_only_boosted_results_copied():
+    text = "my phone is 555 and 555"
+    tokens = ["my", "phone", "is", "555", "and", "555"]
+    tokens_indices = [0, 3, 9, 12, 16, 20]
+    nlp_artifacts = NlpArtifacts([], tokens, tokens_indices, tokens, None, "en")
+    nlp_artifacts.keywords = ["my", "phone", "555"]
+    recognizer = PatternRecognizer(
+        supported_entity="PHONE",
+        patterns=[Pattern("digits", r"\d{3}", 0.3)],
+        context=["phone"],
+    )
+    other_recognizer = PatternRecognizer(
+        supported_entity="NUMBER", patterns=[Pattern("digits", r"\d{3}", 0.3)]
+    )
+    raw_results = recognizer.analyze(text, ["PHONE"]) + other_recognizer.analyze(
+        text, ["NUMBER"]
+    )
+
+    enhancer = LemmaContextAwareEnhancer(context_prefix_count=3)
+    results = enhancer.enhance_using_context(
+        text, raw_results, nlp_artifacts, [recognizer, other_recognizer]
+    )
+
+    assert [r.score for r in raw_results] == [0.3] * 4
+    assert all(
+        r.analysis_explanation.supportive_context_word == "" for r in raw_results
+    )
+    assert [r.score for r in results] == pytest.approx([0.65, 0.65, 0.3, 0.3])
+    assert results[0] is not raw_results[0]
+    assert results[0].analysis_explanation.supportive_context_word == "phone"
+    assert results[2] is raw_results[2]
@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+
+from guardian_analyzer import AnalyzerEngine, EntityRecognizer, RecognizerRegistry
+from guardian_analyzer.nlp_engine import MicroBatchingNlpEngine, NlpArtifacts
+from tests.mocks import NlpEngineMock, RecognizerRegistryMock
+
+
+class BatchRecordingNlpEngineMock(NlpEngineMock):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.batches = []
+        self.fail = fail
+
+    def process_batch(self, texts, language, **kwargs):
+        texts = list(texts)
+        self.batches.append(texts)
+        if self.fail:
+            raise ValueError("failed batch")
+        for text in texts:
+            yield text, NlpArtifacts([], [], [], [text], None, language)
+
+
+class PartialBatchRecordingNlpEngineMock(BatchRecordingNlpEngineMock):
+    def __init__(self):
+        super().__init__()
+        self.partial_batches = []
+
+    def process_batch_partially(self, texts, language, artifacts, **kwargs):
+        self.partial_batches.append((sorted(artifacts), sorted(texts)))
+        return super().process_batch(texts, language, **kwargs)
+
+
+class NerRecognizerMock(EntityRecognizer):
+    NLP_ARTIFACTS_NEEDED = frozenset({"entities"})
+
+    def load(self):
+        pass
+
+    def analyze(self, text, entities, nlp_artifacts=None):
+        return []
+
+
+def process_concurrently(nlp_engine, texts, process=None):
+    results = [None] * len(texts)
+    barrier = threading.Barrier(len(texts))
+    if process is None:
+        process = nlp_engine.process_text
+
+    def process_text(i):
+        barrier.wait()
+        results[i] = process(texts[i], "en")
+
+    threads = [
+        threading.Thread(target=process_text, args=(i,)) for i in range(len(texts))
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_when_concurrent_texts_then_processed_in_batches():
+    inner = BatchRecordingNlpEngineMock()
+    nlp_engine = MicroBatchingNlpEngine(inner, max_batch_size=8, max_wait_ms=200)
+    texts = [f"text {i}" for i in range(8)]
+
+    results = process_concurrently(nlp_engine, texts)
+
+    assert [artifacts.lemmas for artifacts in results] == [[text] for text in texts]
+    assert len(inner.batches) < len(texts)
+    assert sorted(sum(inner.batches, [])) == sorted(texts)
+    assert all(len(batch) <= 8 for batch in inner.batches)
+
+
+def test_when_batch_fails_then_error_raised_to_callers():
+    nlp_engine = MicroBatchingNlpEngine(BatchRecordingNlpEngineMock(fail=True))
+
+    with pytest.raises(ValueError):
+        nlp_engine.process_text("text", "en")
+
+
+def test_when_wrapped_then_other_calls_delegated():
+    inner = NlpEngineMock(stopwords=["the"])
+    nlp_engine = MicroBatchingNlpEngine(inner)
+
+    assert nlp_engine.is_loaded()
+    assert nlp_engine.is_stopword("the", "en")
+    assert nlp_engine.get_nlp_engine_configuration_as_dict() == {}
+
+
+def test_when_analyzer_uses_micro_batching_then_results_unchanged():
+    registry = RecognizerRegistryMock()
+    registry.load_predefined_recognizers()
+    engine = AnalyzerEngine(
+        registry=registry,
+        nlp_engine=MicroBatchingNlpEngine(BatchRecordingNlpEngineMock()),
+    )
+
+    results = engine.analyze("My phone number is (212) 555-1234", language="en")
+
+    assert [result.entity_type for result in results] == ["PHONE_NUMBER"]
+
+
+def test_when_analyzer_processes_partially_then_texts_processed_in_batches():
+    inner = BatchRecordingNlpEngineMock()
+    registry = RecognizerRegistry()
+    registry.add_recognizer(NerRecognizerMock(supported_entities=["PERSON"]))
+    engine = AnalyzerEngine(
+        registry=registry,
+        nlp_engine=MicroBatchingNlpEngine(inner, max_batch_size=8, max_wait_ms=200),
+    )
+    texts = [f"text {i}" for i in range(8)]
+
+    process_concurrently(engine, texts, process=engine.analyze)
+
+    assert len(inner.batches) < len(texts)
+    assert sorted(sum(inner.batches, [])) == sorted(texts)
+
+
+def test_when_different_artifacts_needed_then_batched_separately():
+    inner = PartialBatchRecordingNlpEngineMock()
+    nlp_engine = MicroBatchingNlpEngine(inner, max_batch_size=8, max_wait_ms=200)
+    artifacts = {
+        "entities 1": {"entities"},
+        "lemmas 1": {"lemmas"},
+        "entities 2": {"entities"},
+        "whole": None,
+        "lemmas 2": {"lemmas"},
+    }
+
+    def process(text, language):
+        if artifacts[text] is None:
+            return nlp_engine.process_text(text, language)
+        return nlp_engine.process_text_partially(text, language, artifacts[text])
+
+    results = process_concurrently(nlp_engine, list(artifacts), process=process)
+
+    assert [result.lemmas for result in results] == [[text] for text in artifacts]
+    assert sorted(inner.partial_batches) == [
+        (["entities"], ["entities 1", "entities 2"]),
+        (["lemmas"], ["lemmas 1", "lemmas 2"]),
+    ]
+    assert ["whole"] in inner.batches
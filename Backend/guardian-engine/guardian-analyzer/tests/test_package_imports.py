@@ -0,0 +1,21 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "module", ["spacy", "transformers", "stanza", "azure.ai.textanalytics", "tldextract"]
+)
+def test_when_package_imported_then_heavy_dependencies_not_imported(module):
+    code = f"import sys, guardian_analyzer; print({module!r} in sys.modules)"
+    output = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent.parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert output.strip() == "False"
@@ -0,0 +1,148 @@
+import random
+import string
+from unittest.mock import MagicMock
+
+import pytest
+import regex as re
+
+from guardian_analyzer import Pattern, PatternRecognizer
+from guardian_analyzer.pattern_prefilter import (
+    ANY_DIGIT,
+    PatternPrefilter,
+    TextFeatures,
+)
+from guardian_analyzer.predefined_recognizers import (
+    CreditCardRecognizer,
+    EmailRecognizer,
+    IpRecognizer,
+    UrlRecognizer,
+    UsSsnRecognizer,
+)
+from guardian_analyzer.predefined_recognizers.in_bank_statement_recognizer import (
+    InBankStatementRecognizer,
+)
+
+FLAGS = re.DOTALL | re.MULTILINE | re.IGNORECASE
+
+
+@pytest.mark.parametrize(
+    "regex, flags, expected",
+    [
+        (r"\b(STM|STMT|BS)[A-Z0-9]{8,12}\b", FLAGS, [{"stm", "bs"}]),
+        (r"\b(CID|CUSTID)[0-9]{6,12}\b", FLAGS, [{"id"}, {ANY_DIGIT}, {"c"}]),
+        (r"\b(CID|CUSTID)[0-9]{6,12}\b", 0, [{"ID"}, {ANY_DIGIT}, {"C"}]),
+        (r"\b\d{9,18}\b", FLAGS, [{ANY_DIGIT}]),
+        (r"[\w.]+[@]\w+", FLAGS, [{"@"}]),
+        (r"(?i:Form)-?16", 0, [{"form"}, {"16"}]),
+        (r"\b(?=.*\d)(?=.*[$!%])\w+", 0, [{ANY_DIGIT}, {"$", "!", "%"}]),
+    ],
+)
+def test_when_regex_has_requirements_then_derived(regex, flags, expected):
+    prefilter = PatternPrefilter.from_regex(regex, flags)
+
+    assert sorted(map(set, prefilter.requirements), key=str) == sorted(
+        expected, key=str
+    )
+
+
+@pytest.mark.parametrize(
+    "regex",
+    [
+        # Matches without any literal
+        r"\w+",
+        r"\d*",
+        r"abc|\w",
+        r"(?!abc)\w+",
+        # Syntax of the regex package
+        r"\p{L}+abc",
+        r"(?:abc){e<=1}",
+        r"[[:alpha:]]abc",
+    ],
+)
+def test_when_no_safe_requirement_then_no_prefilter(regex):
+    assert PatternPrefilter.from_regex(regex, FLAGS) is None
+
+
+def test_when_literals_missing_then_may_not_match():
+    prefilter = PatternPrefilter.from_regex(r"\b(TXN|REF|TR)[A-Z0-9]{10,15}\b", FLAGS)
+
+    assert prefilter.may_match(TextFeatures("payment ref ABCDEFGHIJK"))
+    assert prefilter.may_match(TextFeatures("TXN1234567890"))
+    assert not prefilter.may_match(TextFeatures("hi, see you at noon"))
+
+
+def test_when_case_sensitive_then_literal_case_checked():
+    prefilter = PatternPrefilter.from_regex(r"\bSTM\d+", 0)
+
+    assert prefilter.may_match(TextFeatures("STM1234"))
+    assert not prefilter.may_match(TextFeatures("stm1234"))
+
+
+def test_when_non_ascii_case_fold_then_may_match():
+    # The regex package matches the kelvin sign with k and dotted I with i
+    prefilter = PatternPrefilter.from_regex(r"kid\d", FLAGS)
+    text = "\u212a\u0130d1"
+
+    assert re.search(r"kid\d", text, flags=FLAGS)
+    assert prefilter.may_match(TextFeatures(text))
+
+
+def test_when_non_ascii_digit_then_may_match():
+    prefilter = PatternPrefilter.from_regex(r"\d{3}", FLAGS)
+
+    assert prefilter.may_match(TextFeatures("\u0663\u0664\u0665"))
+    assert not prefilter.may_match(TextFeatures("no numbers here"))
+
+
+def test_when_same_text_then_features_shared():
+    text = "some text"
+    features = TextFeatures.of(text)
+
+    assert TextFeatures.of(text) is features
+    assert TextFeatures.of("other text") is not features
+
+
+@pytest.mark.parametrize(
+    "recognizer_class",
+    [
+        CreditCardRecognizer,
+        EmailRecognizer,
+        InBankStatementRecognizer,
+        IpRecognizer,
+        UrlRecognizer,
+        UsSsnRecognizer,
+    ],
+)
+def test_when_prefilter_rejects_then_regex_never_matches(recognizer_class):
+    recognizer = recognizer_class()
+    rand = random.Random(42)
+    alphabet = string.ascii_letters + string.digits + " -./:@\u0130\u212a"
+
+    for pattern in recognizer.patterns:
+        prefilter = PatternPrefilter.from_regex(
+            pattern.regex, recognizer.global_regex_flags
+        )
+        if prefilter is None:
+            continue
+        compiled = re.compile(pattern.regex, flags=recognizer.global_regex_flags)
+        letters = [c for c in pattern.regex if c.isalnum()]
+        for _ in range(500):
+            text = "".join(
+                rand.choice(alphabet + "".join(letters))
+                for _ in range(rand.randint(1, 30))
+            )
+            if not prefilter.may_match(TextFeatures(text)):
+                assert compiled.search(text) is None, (pattern.name, text)
+
+
+def test_when_prefilter_not_met_then_regex_not_run():
+    pattern = Pattern("statement", r"\bSTM\d{6}\b", 0.5)
+    recognizer = PatternRecognizer(supported_entity="STATEMENT", patterns=[pattern])
+    assert len(recognizer.analyze("ref STM123456", ["STATEMENT"])) == 1
+
+    pattern.compiled_regex = MagicMock(wraps=pattern.compiled_regex)
+    assert recognizer.analyze("nothing to see here", ["STATEMENT"]) == []
+    pattern.compiled_regex.finditer.assert_not_called()
+
+    assert len(recognizer.analyze("ref stm654321", ["STATEMENT"])) == 1
+    pattern.compiled_regex.finditer.assert_called_once()
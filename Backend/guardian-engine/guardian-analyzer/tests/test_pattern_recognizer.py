@@ -219,3 +219,60 @@ def test_global_regex_flag_deny_list_returns_right_result(global_flag, expected_
 
     results = recognizer_ignore_case.analyze(text=text, entities=["TITLE"])
     assert len(results) == expected_len
+
+
+def test_when_matches_share_explanation_details_then_explanations_are_distinct():
+    patterns = [Pattern(name="test_pattern", regex="([0-9]{1,9})", score=0.5)]
+    mock_recognizer = MockRecognizer(
+        entity="TEST",
+        patterns=patterns,
+        deny_list=None,
+        name="MockRecognizer",
+        context=None,
+    )
+
+    results = mock_recognizer.analyze(text="Testing 1 2 3", entities=["TEST"])
+    explanations = [result.analysis_explanation for result in results]
+
+    assert len(results) == 3
+    assert len({id(explanation) for explanation in explanations}) == 3
+    assert all(explanation.score == 1 for explanation in explanations)
+    assert all(
+        explanation.pattern_name == "test_pattern" for explanation in explanations
+    )
+
+
+def test_when_patterns_prepared_then_analysis_uses_them():
+    pattern = Pattern(name="test_pattern", regex=r"\bSTM\d{6}\b", score=0.5)
+    recognizer = PatternRecognizer(supported_entity="STATEMENT", patterns=[pattern])
+
+    recognizer.prepare_patterns()
+    assert pattern.prefilter is not None
+    assert pattern.compiled_regex is None
+
+    recognizer.prepare_patterns(compile_regexes=True)
+    compiled_regex = pattern.compiled_regex
+    assert compiled_regex is not None
+
+    results = recognizer.analyze(text="ref STM123456", entities=["STATEMENT"])
+    assert len(results) == 1
+    assert pattern.compiled_regex is compiled_regex
+
+
+def test_when_analyzed_with_other_flags_then_patterns_unchanged():
+    pattern = Pattern(name="test_pattern", regex=r"\bSTM\d{6}\b", score=0.5)
+    recognizer = PatternRecognizer(supported_entity="STATEMENT", patterns=[pattern])
+    recognizer.prepare_patterns(compile_regexes=True)
+    compiled_regex = pattern.compiled_regex
+
+    results = recognizer.analyze(
+        text="ref stm123456", entities=["STATEMENT"], regex_flags=re.IGNORECASE
+    )
+    assert len(results) == 1
+    assert pattern.compiled_with_flags == recognizer.global_regex_flags
+    assert pattern.compiled_regex is compiled_regex
+
+    results = recognizer.analyze(
+        text="ref stm123456", entities=["STATEMENT"], concurrent=True
+    )
+    assert len(results) == 1
@@ -0,0 +1,155 @@
+import io
+import os
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from guardian_analyzer import AnalyzerEngine  # noqa: E402
+from new_pdf_redactor import (  # noqa: E402
+    GuardianPDFRedactor,
+    _detect_page_range,
+    open_pdf,
+)
+from tests.mocks import NlpEngineMock  # noqa: E402
+
+PAGES = [
+    "Call me at 202-555-{:04d} about the report",
+    "Nothing to see on this page",
+    "Mail john{}@microsoft.com or visit https://microsoft.com",
+    "Card AB{:06d} and SSN 078-05-1120",
+]
+
+
+def create_pdf(page_count):
+    doc = fitz.open()
+    for page_num in range(page_count):
+        page = doc.new_page()
+        text = PAGES[page_num % len(PAGES)].format(page_num)
+        page.insert_text((72, 72), text)
+    pdf_bytes = doc.tobytes()
+    doc.close()
+    return pdf_bytes
+
+
+def read_pages(pdf_bytes):
+    doc = open_pdf(pdf_bytes)
+    try:
+        return [page.get_text() for page in doc]
+    finally:
+        doc.close()
+
+
+def redact(redactor, pdf_source):
+    output = io.BytesIO()
+    result = redactor.redact_pdf(pdf_source, output)
+    return result["detected_entities"], read_pages(output.getvalue())
+
+
+@pytest.fixture(scope="module")
+def analyzer_engine():
+    return AnalyzerEngine(nlp_engine=NlpEngineMock())
+
+
+@pytest.fixture
+def pdf_bytes():
+    return create_pdf(9)
+
+
+def test_when_page_range_detected_then_entities_and_regex_targets_per_page(
+    analyzer_engine, pdf_bytes
+):
+    redactor = GuardianPDFRedactor(analyzer_engine=analyzer_engine)
+    doc = open_pdf(pdf_bytes)
+
+    detected_entities, page_regex_targets = _detect_page_range(
+        redactor, doc, range(2, 4), "en", None, redactor.default_regex_patterns
+    )
+    doc.close()
+
+    assert detected_entities["john2@microsoft.com"] == "EMAIL_ADDRESS"
+    assert "202-555-0000" not in detected_entities
+    assert page_regex_targets == {
+        2: ["john2@microsoft.com"],
+        3: ["AB000003", "078-05-1120"],
+    }
+
+
+@pytest.mark.parametrize("source_type", ["bytes", "path"])
+def test_when_pages_analyzed_in_workers_then_same_redaction(
+    analyzer_engine, pdf_bytes, tmp_path, source_type
+):
+    if source_type == "path":
+        pdf_source = str(tmp_path / "input.pdf")
+        with open(pdf_source, "wb") as f:
+            f.write(pdf_bytes)
+    else:
+        pdf_source = pdf_bytes
+
+    sequential_redactor = GuardianPDFRedactor(analyzer_engine=analyzer_engine)
+    expected_entities, expected_pages = redact(sequential_redactor, pdf_source)
+
+    parallel_redactor = GuardianPDFRedactor(
+        analyzer_engine=analyzer_engine, n_process=2, pages_per_chunk=2
+    )
+    parallel_redactor.start()
+    try:
+        detected_entities, pages = redact(parallel_redactor, pdf_source)
+        assert parallel_redactor._executor is not None
+    finally:
+        parallel_redactor.close()
+
+    assert "john6@microsoft.com" in expected_entities
+    assert detected_entities == expected_entities
+    assert list(detected_entities) == list(expected_entities)
+    assert pages == expected_pages
+    assert "202-555-0008" not in "".join(pages)
+
+
+class RecordingExecutor:
+    """Executor recording the PDF paths sent to the page workers."""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self.pdf_paths = []
+
+    def map(self, fn, pdf_paths, *args):
+        pdf_paths = list(pdf_paths)
+        self.pdf_paths.extend(pdf_paths)
+        assert all(os.path.exists(pdf_path) for pdf_path in pdf_paths)
+        return self.executor.map(fn, pdf_paths, *args)
+
+    def shutdown(self, *args, **kwargs):
+        self.executor.shutdown(*args, **kwargs)
+
+
+def test_when_pdf_bytes_then_workers_given_one_temporary_file(
+    analyzer_engine, pdf_bytes
+):
+    redactor = GuardianPDFRedactor(
+        analyzer_engine=analyzer_engine, n_process=2, pages_per_chunk=2
+    )
+    redactor.start()
+    try:
+        executor = redactor._executor = RecordingExecutor(redactor._executor)
+        detected_entities, _ = redact(redactor, pdf_bytes)
+    finally:
+        redactor.close()
+
+    assert "john6@microsoft.com" in detected_entities
+    assert len(executor.pdf_paths) == 5
+    assert len(set(executor.pdf_paths)) == 1
+    assert not os.path.exists(executor.pdf_paths[0])
+
+
+def test_when_workers_not_started_then_pages_analyzed_in_process(
+    analyzer_engine, pdf_bytes
+):
+    redactor = GuardianPDFRedactor(
+        analyzer_engine=analyzer_engine, n_process=2, pages_per_chunk=2
+    )
+
+    detected_entities, _ = redact(redactor, pdf_bytes)
+
+    assert redactor._executor is None
+    assert "john6@microsoft.com" in detected_entities
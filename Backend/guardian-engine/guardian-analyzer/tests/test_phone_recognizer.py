@@ -1,3 +1,4 @@
+import phonenumbers
 import pytest
 
 from guardian_analyzer.predefined_recognizers.phone_recognizer import PhoneRecognizer
@@ -135,4 +136,44 @@ def test_get_analysis_explanation():
     phone_recognizer = PhoneRecognizer()
     test_region = "US"
     explanation = phone_recognizer._get_analysis_explanation(test_region)
-    assert explanation.recognizer == "PhoneRecognizer"
\ No newline at end of file
+    assert explanation.recognizer == "PhoneRecognizer"
+
+
+@pytest.mark.parametrize("leniency", [0, 1, 2, 3])
+def test_when_regions_matched_then_same_matches_as_phonenumbers(leniency):
+    text = (
+        "Call (415) 555-0132 or 415-555-0132, in Israel 09-7625400, "
+        "+44 (20) 7123 4567, +91 4155550132 or 91-415-555-0132. "
+        "Again (415) 555-0132 and 030 1234567, 0301234567 and 12345."
+    )
+    recognizer = PhoneRecognizer(leniency=leniency)
+    expected = set()
+    for region in recognizer.supported_regions:
+        for match in phonenumbers.PhoneNumberMatcher(text, region, leniency=leniency):
+            expected.add((match.start, match.end))
+
+    results = recognizer.analyze(text, recognizer.supported_entities)
+
+    assert {(result.start, result.end) for result in results} == expected
+
+
+def test_when_national_number_after_international_then_explained_with_own_region():
+    text = "London +44 (20) 7123 4567, then New York (415) 555-0132"
+    recognizer = PhoneRecognizer()
+
+    results = sorted(
+        recognizer.analyze(text, recognizer.supported_entities),
+        key=lambda result: result.start,
+    )
+
+    assert [(result.start, result.end) for result in results] == [(7, 25), (41, 55)]
+    assert [
+        result.analysis_explanation.textual_explanation for result in results
+    ] == [
+        "Recognized as GB region phone number, using PhoneRecognizer",
+        "Recognized as US region phone number, using PhoneRecognizer",
+    ]
+
+
+def test_when_no_digits_then_no_phone_numbers(recognizer):
+    assert recognizer.analyze("Call me at home, not at work", ["PHONE_NUMBER"]) == []
@@ -244,3 +244,63 @@ def test_remove_recognizer_when_multiple_instances_exist():
     assert len([rec for rec in registry.recognizers
                 if rec.name == "SpacyRecognizer"]) == 1
 
+
+
+def test_when_add_or_remove_recognizer_then_index_is_updated(
+    mock_recognizer_registry,
+):
+    registry = mock_recognizer_registry
+    assert len(registry.get_recognizers(language="en", entities=["PERSON"])) == 1
+    assert sorted(registry.get_supported_entities(languages=["de"])) == [
+        "ADDRESS",
+        "PERSON",
+    ]
+
+    registry.add_recognizer(create_mock_pattern_recognizer("en", "PERSON", "6"))
+    registry.add_recognizer(create_mock_pattern_recognizer("de", "TITLE", "7"))
+    assert len(registry.get_recognizers(language="en", entities=["PERSON"])) == 2
+    assert "TITLE" in registry.get_supported_entities(languages=["de"])
+
+    registry.remove_recognizer("7")
+    assert "TITLE" not in registry.get_supported_entities(languages=["de"])
+
+    # recognizers appended directly to the list are picked up as well
+    registry.recognizers.append(create_mock_pattern_recognizer("en", "ZIP", "8"))
+    assert len(registry.get_recognizers(language="en", entities=["ZIP"])) == 1
+
+
+def test_when_recognizer_replaced_in_list_then_index_is_updated(
+    mock_recognizer_registry,
+):
+    registry = mock_recognizer_registry
+    assert "ZIP" not in registry.get_supported_entities(languages=["en"])
+    version = registry.version
+
+    position = registry.recognizers.index(
+        registry.get_recognizers(language="en", entities=["PERSON"])[0]
+    )
+    zip_recognizer = create_mock_pattern_recognizer("en", "ZIP", "8")
+    registry.recognizers[position] = zip_recognizer
+
+    assert registry.get_recognizers(language="en", entities=["ZIP"]) == [
+        zip_recognizer
+    ]
+    assert "PERSON" not in registry.get_supported_entities(languages=["en"])
+    assert registry.version > version
+
+
+def test_when_get_recognizers_with_ad_hoc_then_index_is_not_changed(
+    mock_recognizer_registry,
+):
+    registry = mock_recognizer_registry
+    ad_hoc = create_mock_pattern_recognizer("en", "PERSON", "ad_hoc")
+
+    recognizers = registry.get_recognizers(
+        language="en", entities=["PERSON"], ad_hoc_recognizers=[ad_hoc]
+    )
+    assert len(recognizers) == 2
+    assert ad_hoc in recognizers
+
+    recognizers = registry.get_recognizers(language="en", all_fields=True)
+    assert ad_hoc not in recognizers
+    assert len(recognizers) == 1
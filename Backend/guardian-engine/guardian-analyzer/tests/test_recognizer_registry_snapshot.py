@@ -0,0 +1,100 @@
+import pickle
+
+import pytest
+
+from guardian_analyzer import AnalyzerEngineProvider
+from guardian_analyzer.pattern_prefilter import ANY_DIGIT
+from guardian_analyzer.recognizer_registry import (
+    RecognizerRegistryProvider,
+    RecognizerRegistrySnapshot,
+)
+
+SOURCES = {"supported_languages": ["en"]}
+TEXT = "Card 4012888888881881, mail john@microsoft.com, ip 192.168.0.1"
+
+
+@pytest.fixture
+def registry():
+    return RecognizerRegistryProvider(
+        registry_configuration={"supported_languages": ["en"]}
+    ).create_recognizer_registry()
+
+
+def analyze_all(registry, text):
+    results = []
+    for recognizer in registry.get_recognizers("en", all_fields=True):
+        results.extend(recognizer.analyze(text, recognizer.supported_entities, None))
+    return sorted(results, key=lambda r: (r.start, r.end, r.entity_type))
+
+
+def test_when_snapshot_loaded_then_same_registry(registry, tmp_path):
+    snapshot = RecognizerRegistrySnapshot(tmp_path / "registry.snapshot")
+    expected = analyze_all(registry, TEXT)
+    snapshot.save(registry, SOURCES)
+
+    loaded = snapshot.load(SOURCES)
+
+    assert [r.name for r in loaded.recognizers] == [r.name for r in registry.recognizers]
+    assert sorted(loaded.get_supported_entities()) == sorted(
+        registry.get_supported_entities()
+    )
+    assert analyze_all(loaded, TEXT) == expected
+
+
+def test_when_snapshot_saved_then_patterns_prepared_not_compiled(registry, tmp_path):
+    snapshot = RecognizerRegistrySnapshot(tmp_path / "registry.snapshot")
+    snapshot.save(registry, SOURCES)
+
+    patterns = [
+        pattern
+        for recognizer in snapshot.load(SOURCES).recognizers
+        for pattern in getattr(recognizer, "patterns", [])
+    ]
+    assert patterns
+    assert all(pattern.compiled_regex is None for pattern in patterns)
+    assert all(pattern.compiled_with_flags is not None for pattern in patterns)
+    assert any(pattern.prefilter is not None for pattern in patterns)
+
+
+def test_when_sources_changed_then_snapshot_stale(registry, tmp_path):
+    snapshot = RecognizerRegistrySnapshot(tmp_path / "registry.snapshot")
+    snapshot.save(registry, SOURCES)
+
+    assert snapshot.load({"supported_languages": ["en", "es"]}) is None
+
+
+def test_when_snapshot_missing_or_corrupt_then_none(tmp_path):
+    snapshot = RecognizerRegistrySnapshot(tmp_path / "registry.snapshot")
+    assert snapshot.load(SOURCES) is None
+
+    fingerprint = RecognizerRegistrySnapshot.get_fingerprint(SOURCES)
+    snapshot.path.write_bytes(fingerprint.encode() + b"\nnot a pickle")
+    assert snapshot.load(SOURCES) is None
+
+
+def test_when_any_digit_unpickled_then_same_sentinel():
+    assert pickle.loads(pickle.dumps(ANY_DIGIT)) is ANY_DIGIT
+
+
+def test_when_provider_has_snapshot_then_registry_not_built(tmp_path, mocker):
+    snapshot_file = tmp_path / "registry.snapshot"
+    AnalyzerEngineProvider().save_recognizer_registry_snapshot(snapshot_file)
+
+    provider = AnalyzerEngineProvider(recognizer_registry_snapshot_file=snapshot_file)
+    create_registry = mocker.spy(provider, "_create_recognizer_registry")
+    registry = provider._load_recognizer_registry(["en"], nlp_engine=None)
+
+    create_registry.assert_not_called()
+    assert "CreditCardRecognizer" in [r.name for r in registry.recognizers]
+
+
+def test_when_provider_snapshot_stale_then_registry_built(tmp_path, mocker):
+    snapshot_file = tmp_path / "registry.snapshot"
+    AnalyzerEngineProvider().save_recognizer_registry_snapshot(snapshot_file)
+
+    provider = AnalyzerEngineProvider(recognizer_registry_snapshot_file=snapshot_file)
+    create_registry = mocker.spy(provider, "_create_recognizer_registry")
+    registry = provider._load_recognizer_registry(["en", "es"], nlp_engine=None)
+
+    create_registry.assert_called_once()
+    assert registry.supported_languages == ["en", "es"]
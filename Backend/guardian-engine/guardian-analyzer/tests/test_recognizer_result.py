@@ -1,6 +1,9 @@
+import copy
+import pickle
+
 import pytest
 
-from guardian_analyzer import RecognizerResult
+from guardian_analyzer import AnalysisExplanation, RecognizerResult
 
 
 @pytest.mark.parametrize(
@@ -202,6 +205,71 @@ def test_given_recognizer_result_then_one_is_not_greater_then_another(start, end
     assert not first.__gt__(second)
 
 
+def test_when_lazy_explanation_then_created_once_on_access():
+    calls = []
+
+    def build_explanation():
+        calls.append(1)
+        return AnalysisExplanation(recognizer="test", original_score=0.5)
+
+    result = RecognizerResult("TEST", 0, 5, 0.5, analysis_explanation=build_explanation)
+    assert calls == []
+
+    assert result.analysis_explanation.recognizer == "test"
+    assert result.analysis_explanation is result.analysis_explanation
+    assert calls == [1]
+
+
+def test_when_lazy_explanation_then_to_dict_copy_and_pickle_have_explanation():
+    result = RecognizerResult(
+        "TEST",
+        0,
+        5,
+        0.5,
+        analysis_explanation=lambda: AnalysisExplanation("test", 0.5),
+    )
+
+    assert isinstance(result.to_dict()["analysis_explanation"], AnalysisExplanation)
+    for result_copy in (
+        copy.copy(result),
+        copy.deepcopy(result),
+        pickle.loads(pickle.dumps(result)),
+    ):
+        assert result_copy.analysis_explanation.recognizer == "test"
+
+
+def test_when_explanation_removed_then_factory_not_called():
+    def build_explanation():
+        raise AssertionError("explanation should not be created")
+
+    result = RecognizerResult("TEST", 0, 5, 0.5, analysis_explanation=build_explanation)
+    result.analysis_explanation = None
+
+    assert result.to_dict()["analysis_explanation"] is None
+
+
 def create_recognizer_result(entity_type: str, score: float, start: int, end: int):
     data = {"entity_type": entity_type, "score": score, "start": start, "end": end}
     return RecognizerResult.from_json(data)
+
+
+def test_when_result_copied_then_lazy_explanation_kept_lazy():
+    calls = []
+
+    def build_explanation():
+        calls.append(1)
+        return AnalysisExplanation(recognizer="test", original_score=0.5)
+
+    metadata = {RecognizerResult.RECOGNIZER_NAME_KEY: "test"}
+    result = RecognizerResult(
+        "TEST", 0, 5, 0.5, build_explanation, recognition_metadata=metadata
+    )
+
+    result_copy = result.copy()
+    assert calls == []
+    assert result_copy.recognition_metadata == metadata
+    assert result_copy.recognition_metadata is not metadata
+
+    assert result_copy.analysis_explanation.recognizer == "test"
+    assert calls == [1]
+    assert result.copy().analysis_explanation is not result.analysis_explanation
@@ -0,0 +1,73 @@
+import time
+
+from guardian_analyzer.size_bounded_lru_cache import SizeBoundedLruCache
+
+
+def test_when_over_size_then_least_recently_used_evicted():
+    cache = SizeBoundedLruCache(max_size_bytes=100)
+    cache._store("a", 1, 40)
+    cache._store("b", 2, 40)
+    assert cache._lookup("a") == 1
+
+    cache._store("c", 3, 40)
+
+    assert cache._lookup("b") is None
+    assert (cache._lookup("a"), cache._lookup("c")) == (1, 3)
+    assert (len(cache), cache.size_bytes) == (2, 80)
+    assert cache.get_stats() == {
+        "hits": 3,
+        "misses": 1,
+        "entries": 2,
+        "size_bytes": 80,
+    }
+
+
+def test_when_over_max_entries_then_least_recently_used_evicted():
+    cache = SizeBoundedLruCache(max_size_bytes=100, max_entries=1)
+    cache._store("a", 1, 1)
+    cache._store("b", 2, 1)
+
+    assert cache._lookup("a") is None
+    assert cache._lookup("b") == 2
+
+
+def test_when_same_key_stored_then_size_replaced():
+    cache = SizeBoundedLruCache(max_size_bytes=100)
+    cache._store("a", 1, 40)
+    cache._store("a", 2, 30)
+
+    assert cache._lookup("a") == 2
+    assert (len(cache), cache.size_bytes) == (1, 30)
+
+
+def test_when_value_too_large_then_not_cached():
+    cache = SizeBoundedLruCache(max_size_bytes=100)
+    cache._store("a", 1, 40)
+    cache._store("b", 2, 101)
+
+    assert cache._lookup("b") is None
+    assert (len(cache), cache.size_bytes) == (1, 40)
+
+
+def test_when_ttl_expired_then_removed():
+    cache = SizeBoundedLruCache(max_size_bytes=100, ttl_seconds=0.01)
+    cache._store("a", 1, 40)
+    time.sleep(0.02)
+
+    assert cache._lookup("a") is None
+    assert (len(cache), cache.size_bytes) == (0, 0)
+
+
+def test_when_cleared_then_entries_and_counters_reset():
+    cache = SizeBoundedLruCache(max_size_bytes=100)
+    cache._store("a", 1, 40)
+    cache._lookup("a")
+
+    cache.clear()
+
+    assert cache.get_stats() == {
+        "hits": 0,
+        "misses": 0,
+        "entries": 0,
+        "size_bytes": 0,
+    }
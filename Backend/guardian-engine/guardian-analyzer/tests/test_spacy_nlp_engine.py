@@ -3,6 +3,7 @@ from typing import Iterator
 
 import pytest
 
+from guardian_analyzer import AnalyzerEngine, EntityRecognizer, RecognizerRegistry
 from guardian_analyzer.nlp_engine import SpacyNlpEngine, NerModelConfiguration
 
 
@@ -80,3 +81,173 @@ def test_get_supported_entities_doesnt_include_ignored():
     assert "A" not in entities
     assert "B" not in entities
     assert "C" in entities
+
+
+@pytest.fixture
+def blank_spacy_nlp_engine_with_cache():
+    import spacy
+
+    nlp_engine = SpacyNlpEngine(artifacts_cache_size_bytes=1024 * 1024)
+    nlp_engine.nlp = {"en": spacy.blank("en")}
+    return nlp_engine
+
+
+def test_when_same_text_processed_then_artifacts_cached(
+    blank_spacy_nlp_engine_with_cache,
+):
+    nlp_engine = blank_spacy_nlp_engine_with_cache
+    first = nlp_engine.process_text("simple text", language="en")
+    second = nlp_engine.process_text("simple text", language="en")
+    other = nlp_engine.process_text("other text", language="en")
+
+    assert first is second
+    assert other is not first
+    assert nlp_engine.artifacts_cache.hits == 1
+    assert nlp_engine.artifacts_cache.misses == 2
+
+
+def test_when_process_batch_then_cached_artifacts_reused(
+    blank_spacy_nlp_engine_with_cache,
+):
+    nlp_engine = blank_spacy_nlp_engine_with_cache
+    cached = nlp_engine.process_text("simple text", language="en")
+
+    batch = list(
+        nlp_engine.process_batch(["first", "simple text", "last"], language="en")
+    )
+
+    assert [text for text, _ in batch] == ["first", "simple text", "last"]
+    assert batch[1][1] is cached
+    assert [token.text for token in batch[2][1].tokens] == ["last"]
+    assert len(nlp_engine.artifacts_cache) == 3
+
+
+def test_when_cache_budget_exceeded_then_least_recently_used_evicted(
+    blank_spacy_nlp_engine_with_cache,
+):
+    nlp_engine = blank_spacy_nlp_engine_with_cache
+    nlp_engine.process_text("first text", language="en")
+    entry_size = nlp_engine.artifacts_cache.size_bytes
+    nlp_engine.artifacts_cache.max_size_bytes = int(entry_size * 2.5)
+
+    nlp_engine.process_text("second text", language="en")
+    nlp_engine.process_text("first text", language="en")
+    nlp_engine.process_text("third text", language="en")
+
+    assert len(nlp_engine.artifacts_cache) == 2
+    assert nlp_engine.artifacts_cache.get("second text", "en") is None
+    assert nlp_engine.artifacts_cache.get("first text", "en") is not None
+
+
+class NerRecognizerMock(EntityRecognizer):
+    NLP_ARTIFACTS_NEEDED = frozenset({"entities"})
+
+    def load(self):
+        pass
+
+    def analyze(self, text, entities, nlp_artifacts=None):
+        return []
+
+
+def test_when_same_text_analyzed_then_partial_artifacts_cached(
+    blank_spacy_nlp_engine_with_cache,
+):
+    nlp_engine = blank_spacy_nlp_engine_with_cache
+    # Disabled when only the entities are needed
+    nlp_engine.nlp["en"].add_pipe("sentencizer", name="parser")
+    registry = RecognizerRegistry()
+    registry.add_recognizer(NerRecognizerMock(supported_entities=["PERSON"]))
+    analyzer_engine = AnalyzerEngine(registry=registry, nlp_engine=nlp_engine)
+
+    analyzer_engine.analyze("simple text", language="en")
+    assert nlp_engine.artifacts_cache.hits == 0
+    analyzer_engine.analyze("simple text", language="en")
+    assert nlp_engine.artifacts_cache.hits == 1
+
+    cached = nlp_engine.artifacts_cache.get("simple text", "en", {"entities"})
+    assert not cached.tokens.has_annotation("SENT_START")
+    assert nlp_engine.artifacts_cache.get("simple text", "en") is None
+
+
+def test_when_partial_run_is_whole_pipeline_then_cached_for_whole_pipeline(
+    blank_spacy_nlp_engine_with_cache,
+):
+    nlp_engine = blank_spacy_nlp_engine_with_cache
+
+    partial = list(
+        nlp_engine.process_batch_partially(["simple text"], "en", {"entities"})
+    )
+    full = nlp_engine.process_text("simple text", language="en")
+
+    assert full is partial[0][1]
+    assert nlp_engine.process_text_partially("simple text", "en", {"lemmas"}) is full
+
+
+def test_when_cache_not_configured_then_no_cache():
+    assert SpacyNlpEngine().artifacts_cache is None
+
+
+RECORDING_COMPONENTS = [
+    "tok2vec",
+    "tagger",
+    "parser",
+    "attribute_ruler",
+    "lemmatizer",
+    "ner",
+]
+
+
+def create_recording_nlp_engine():
+    """Return an engine whose pipeline components record their runs in the doc."""
+    import spacy
+    from spacy.language import Language
+
+    if not Language.has_factory("recording_component"):
+
+        @Language.factory("recording_component")
+        def create_recording_component(nlp, name):
+            def recording_component(doc):
+                doc.user_data.setdefault("ran", []).append(name)
+                return doc
+
+            return recording_component
+
+    nlp = spacy.blank("en")
+    for name in RECORDING_COMPONENTS:
+        nlp.add_pipe("recording_component", name=name)
+    nlp_engine = SpacyNlpEngine()
+    nlp_engine.nlp = {"en": nlp}
+    return nlp_engine
+
+
+def test_when_text_processed_partially_then_only_needed_components_run():
+    nlp_engine = create_recording_nlp_engine()
+
+    lemmas = nlp_engine.process_text_partially("simple text", "en", {"lemmas"})
+    entities = nlp_engine.process_text_partially("simple text", "en", {"entities"})
+    full = nlp_engine.process_text("simple text", "en")
+
+    assert lemmas.tokens.user_data["ran"] == [
+        "tok2vec",
+        "tagger",
+        "attribute_ruler",
+        "lemmatizer",
+    ]
+    assert entities.tokens.user_data["ran"] == ["tok2vec", "ner"]
+    assert [token.text for token in entities.tokens] == ["simple", "text"]
+    assert full.tokens.user_data["ran"] == RECORDING_COMPONENTS
+
+
+def test_when_batch_processed_partially_then_only_needed_components_run():
+    nlp_engine = create_recording_nlp_engine()
+
+    batch = list(
+        nlp_engine.process_batch_partially(
+            ["simple text", "other text"], "en", {"entities"}
+        )
+    )
+
+    assert [text for text, _ in batch] == ["simple text", "other text"]
+    for text, nlp_artifacts in batch:
+        assert nlp_artifacts.tokens.user_data["ran"] == ["tok2vec", "ner"]
+        assert nlp_artifacts.tokens.text == text
@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from guardian_analyzer import TextChunker
+
+
+def random_text(seed: int, words: int) -> str:
+    rand = random.Random(seed)
+    vocabulary = ["alpha", "beta", "gamma", "delta", "epsilon", "4012888888881881"]
+    separators = [" "] * 8 + [". ", ".\n", "\n\n", "  "]
+    return "".join(
+        rand.choice(vocabulary) + rand.choice(separators) for _ in range(words)
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(100, 20), (57, 0), (500, 80)])
+def test_when_split_then_chunks_cover_text(seed, chunk_size, chunk_overlap):
+    text = random_text(seed, words=500)
+    chunks = list(TextChunker(chunk_size, chunk_overlap).split(text))
+
+    owned_start = 0
+    for offset, chunk, chunk_owned_start, owned_end in chunks:
+        assert len(chunk) <= chunk_size
+        assert text[offset : offset + len(chunk)] == chunk
+        assert chunk_owned_start == owned_start
+        assert offset <= owned_start
+        if owned_end is not None:
+            assert owned_start < owned_end <= offset + len(chunk)
+        owned_start = owned_end
+
+    assert chunks[-1][3] is None
+    assert chunks[-1][0] + len(chunks[-1][1]) == len(text)
+
+
+def test_when_text_in_parts_then_same_chunks_as_whole_text():
+    text = random_text(1, words=2000)
+    parts = [text[i : i + 37] for i in range(0, len(text), 37)] + [text[:0]]
+    chunker = TextChunker(chunk_size=300, chunk_overlap=50)
+
+    assert list(chunker.split(iter(parts))) == list(chunker.split(text))
+
+
+def test_when_paragraph_in_window_then_chunk_ends_after_it():
+    text = "a" * 60 + ". " + "b" * 10 + "\n\n" + "c" * 10 + ". " + "d" * 100
+    chunker = TextChunker(chunk_size=100, chunk_overlap=10)
+    offset, chunk, _, _ = next(chunker.split(text))
+
+    assert offset == 0
+    assert chunk.endswith("b\n\n")
+
+
+def test_when_text_shorter_than_chunk_then_single_chunk():
+    chunker = TextChunker(chunk_size=100, chunk_overlap=10)
+
+    assert list(chunker.split("short text")) == [(0, "short text", 0, None)]
+    assert list(chunker.split("")) == []
+
+
+@pytest.mark.parametrize("chunk_size, chunk_overlap", [(0, 0), (100, 50), (100, -1)])
+def test_when_invalid_sizes_then_error(chunk_size, chunk_overlap):
+    with pytest.raises(ValueError):
+        TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
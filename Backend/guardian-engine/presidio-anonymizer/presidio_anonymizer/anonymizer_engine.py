@@ -1,8 +1,11 @@
 """Handles the entire logic of the Presidio-anonymizer and text anonymizing."""
 
+import heapq
+import itertools
 import logging
 import re
-from typing import Dict, List, Optional, Type
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Type
 
 from presidio_anonymizer.core import EngineBase
 from presidio_anonymizer.entities import (
@@ -15,6 +18,9 @@ from presidio_anonymizer.operators import Operator, OperatorType
 
 DEFAULT = "replace"
 
+# Text between two entities of the same type to merge them
+WHITESPACE_PATTERN = re.compile(r"^( )+$")
+
 logger = logging.getLogger("presidio-anonymizer")
 
 
@@ -131,78 +137,21 @@ class AnonymizerEngine(EngineBase):
         2. Have the same indices as other results but with larger score.
         :return: List
         """
-        tmp_analyzer_results = []
-        # This list contains all elements which we need to check a single result
-        # against. If a result is dropped, it can also be dropped from this list
-        # since it is intersecting with another result and we selected the other one.
-        other_elements = analyzer_results.copy()
-        for result in analyzer_results:
-            other_elements.remove(result)
-
-            is_merge_same_entity_type = False
-            for other_element in other_elements:
-                if other_element.entity_type != result.entity_type:
-                    continue
-                if result.intersects(other_element) == 0:
-                    continue
-
-                other_element.start = min(result.start, other_element.start)
-                other_element.end = max(result.end, other_element.end)
-                other_element.score = max(result.score, other_element.score)
-                is_merge_same_entity_type = True
-                break
-            if not is_merge_same_entity_type:
-                other_elements.append(result)
-                tmp_analyzer_results.append(result)
-            else:
-                self.logger.debug(
-                    f"removing element {result} from " f"results list due to merge"
-                )
-
-        unique_text_metadata_elements = []
-        # This list contains all elements which we need to check a single result
-        # against. If a result is dropped, it can also be dropped from this list
-        # since it is intersecting with another result and we selected the other one.
-        other_elements = tmp_analyzer_results.copy()
-        for result in tmp_analyzer_results:
-            other_elements.remove(result)
-            result_conflicted = self.__is_result_conflicted_with_other_elements(
-                other_elements, result
-            )
-            if not result_conflicted:
-                other_elements.append(result)
-                unique_text_metadata_elements.append(result)
-            else:
-                self.logger.debug(
-                    f"removing element {result} from results list due to conflict"
-                )
+        tmp_analyzer_results = self.__merge_intersecting_same_type_results(
+            analyzer_results
+        )
+        unique_text_metadata_elements = self.__remove_conflicted_results(
+            tmp_analyzer_results
+        )
 
         # This further improves the quality of handling the conflict between the
         # various entities overlapping. This will not drop the results insted
         # it adjust the start and end positions of overlapping results and removes
         # All types of conflicts among entities as well as text.
         if conflict_resolution == ConflictResolutionStrategy.REMOVE_INTERSECTIONS:
-            unique_text_metadata_elements.sort(key=lambda element: element.start)
-            elements_length = len(unique_text_metadata_elements)
-            index = 0
-            while index < elements_length - 1:
-                current_entity = unique_text_metadata_elements[index]
-                next_entity = unique_text_metadata_elements[index + 1]
-                if current_entity.end <= next_entity.start:
-                    index += 1
-                else:
-                    if current_entity.score >= next_entity.score:
-                        next_entity.start = current_entity.end
-                    else:
-                        current_entity.end = next_entity.start
-                    unique_text_metadata_elements.sort(
-                        key=lambda element: element.start
-                    )
-            unique_text_metadata_elements = [
-                element
-                for element in unique_text_metadata_elements
-                if element.start <= element.end
-            ]
+            unique_text_metadata_elements = self.__remove_intersections(
+                unique_text_metadata_elements
+            )
         return unique_text_metadata_elements
 
     def _merge_entities_with_whitespace_between(
@@ -210,27 +159,201 @@ class AnonymizerEngine(EngineBase):
     ) -> List[RecognizerResult]:
         """Merge adjacent entities of the same type separated by whitespace."""
         merged_results = []
+        removed_indices = set()
+        # Indices in merged_results of the results not removed, by equality key
+        indices_by_key = {}
         prev_result = None
         for result in analyzer_results:
             if prev_result is not None:
                 if prev_result.entity_type == result.entity_type:
-                    if re.search(r"^( )+$", text[prev_result.end : result.start]):
-                        merged_results.remove(prev_result)
+                    if WHITESPACE_PATTERN.search(text[prev_result.end : result.start]):
+                        # Remove the first result equal to prev_result, as
+                        # list.remove would. This is prev_result itself unless
+                        # an earlier result has the same indices, type and score.
+                        removed_indices.add(
+                            indices_by_key[self.__equality_key(prev_result)].popleft()
+                        )
                         result.start = prev_result.start
+            indices_by_key.setdefault(self.__equality_key(result), deque()).append(
+                len(merged_results)
+            )
             merged_results.append(result)
             prev_result = result
-        return merged_results
+        return [
+            result
+            for index, result in enumerate(merged_results)
+            if index not in removed_indices
+        ]
 
     def get_anonymizers(self) -> List[str]:
         """Return a list of supported anonymizers."""
         names = [p for p in self.operators_factory.get_anonymizers().keys()]
         return names
 
-    @staticmethod
-    def __is_result_conflicted_with_other_elements(other_elements, result):
-        return any(
-            [result.has_conflict(other_element) for other_element in other_elements]
+    def __merge_intersecting_same_type_results(
+        self, analyzer_results: List[RecognizerResult]
+    ) -> List[RecognizerResult]:
+        """
+        Merge each result into an intersecting result of the same type, if any.
+
+        A result is merged into the first intersecting result among the results
+        after it, or else among the results kept before it. Merging only
+        happens within a group of transitively overlapping results of the same
+        type, so the results are sorted by type and start to find these groups
+        and the merging runs on each group separately.
+        :return: The results which were not merged, in their original order
+        """
+        indices_by_type = {}
+        for index, result in enumerate(analyzer_results):
+            indices_by_type.setdefault(result.entity_type, []).append(index)
+
+        merged_indices = set()
+        for indices in indices_by_type.values():
+            indices.sort(key=lambda index: analyzer_results[index].start)
+            group = []
+            group_end = 0
+            for index in indices:
+                result = analyzer_results[index]
+                if group and result.start >= group_end:
+                    merged_indices.update(
+                        self.__merge_group(analyzer_results, group)
+                    )
+                    group = []
+                group_end = max(group_end, result.end) if group else result.end
+                group.append(index)
+            merged_indices.update(self.__merge_group(analyzer_results, group))
+
+        return [
+            result
+            for index, result in enumerate(analyzer_results)
+            if index not in merged_indices
+        ]
+
+    def __merge_group(
+        self, analyzer_results: List[RecognizerResult], group: List[int]
+    ) -> List[int]:
+        if len(group) == 1:
+            return []
+
+        group.sort()
+        results = [analyzer_results[index] for index in group]
+        # Results a result can be merged into: the results after it, by order,
+        # then the results kept before it, by order
+        candidates = _IntervalIndex(
+            [(result.start, result.end) for result in results]
         )
+        for i, result in enumerate(results):
+            candidates.add(i, result.start, result.end, i)
+
+        merged_indices = []
+        for i, result in enumerate(results):
+            candidates.remove(i)
+            other = candidates.find_first_intersecting(result.start, result.end)
+            if other is None:
+                candidates.add(i, result.start, result.end, len(results) + i)
+                continue
+
+            other_element = results[other]
+            other_element.start = min(result.start, other_element.start)
+            other_element.end = max(result.end, other_element.end)
+            other_element.score = max(result.score, other_element.score)
+            candidates.update(other, other_element.start, other_element.end)
+            merged_indices.append(group[i])
+            self.logger.debug(
+                f"removing element {result} from " f"results list due to merge"
+            )
+        return merged_indices
+
+    def __remove_conflicted_results(
+        self, analyzer_results: List[RecognizerResult]
+    ) -> List[RecognizerResult]:
+        """
+        Remove results conflicting with other results.
+
+        Of results with the same indices, only the last one with the highest score
+        is kept, and results contained in results with other indices are removed.
+        :return: The remaining results, in their original order
+        """
+        best_index_by_indices = {}
+        for index, result in enumerate(analyzer_results):
+            indices = (result.start, result.end)
+            best_index = best_index_by_indices.get(indices)
+            if (
+                best_index is None
+                or result.score >= analyzer_results[best_index].score
+            ):
+                best_index_by_indices[indices] = index
+
+        # Sorted by start and then by descending end, any result containing
+        # a result comes before it
+        contained_indices = set()
+        max_end = -1
+        for start, end in sorted(
+            best_index_by_indices, key=lambda indices: (indices[0], -indices[1])
+        ):
+            if max_end >= end:
+                contained_indices.add((start, end))
+            max_end = max(max_end, end)
+
+        unique_text_metadata_elements = []
+        for index, result in enumerate(analyzer_results):
+            indices = (result.start, result.end)
+            if (
+                best_index_by_indices[indices] == index
+                and indices not in contained_indices
+            ):
+                unique_text_metadata_elements.append(result)
+            else:
+                self.logger.debug(
+                    f"removing element {result} from results list due to conflict"
+                )
+        return unique_text_metadata_elements
+
+    @staticmethod
+    def __remove_intersections(
+        analyzer_results: List[RecognizerResult],
+    ) -> List[RecognizerResult]:
+        """
+        Trim intersecting results, the result with the lower score is trimmed.
+
+        Results are handled by their start, when a result intersects the one
+        before it, either its start or the previous result's end is moved.
+        A result moved to start after the previous result's end is put back
+        in a heap and handled again when reaching its new start, before the
+        other results starting there.
+        :return: Trimmed results sorted by start, without results trimmed entirely
+        """
+        # Heap entries are (start, order, result), the order of a result pushed
+        # back is negative so it comes before the others starting at its start
+        heap = [
+            (result.start, order, result)
+            for order, result in enumerate(
+                sorted(analyzer_results, key=lambda element: element.start)
+            )
+        ]
+        trimmed_results = []
+        pushed_back = 0
+        current_entity = heapq.heappop(heap)[2] if heap else None
+        while heap:
+            next_entity = heap[0][2]
+            if current_entity.end <= next_entity.start:
+                trimmed_results.append(current_entity)
+                current_entity = heapq.heappop(heap)[2]
+            elif current_entity.score >= next_entity.score:
+                heapq.heappop(heap)
+                next_entity.start = current_entity.end
+                pushed_back += 1
+                heapq.heappush(heap, (next_entity.start, -pushed_back, next_entity))
+            else:
+                current_entity.end = next_entity.start
+        if current_entity is not None:
+            trimmed_results.append(current_entity)
+
+        return [element for element in trimmed_results if element.start <= element.end]
+
+    @staticmethod
+    def __equality_key(result: RecognizerResult) -> Tuple:
+        return result.start, result.end, result.entity_type, result.score
 
     @staticmethod
     def __check_or_add_default_operator(
@@ -242,3 +365,107 @@ class AnonymizerEngine(EngineBase):
         if not operators.get("DEFAULT"):
             operators["DEFAULT"] = default_operator
         return operators
+
+
+class _IntervalIndex:
+    """
+    Intervals with an order, finding the first one intersecting an interval.
+
+    Intervals intersect if they share at least one position, as
+    RecognizerResult.intersects. The intervals intersecting [start, end)
+    are those starting within it, found in a segment tree over the starts,
+    and those starting before it and containing start, found in a segment
+    tree of the intervals' positions. Tree nodes hold heaps of
+    (order, id, version), where entries of removed intervals are stale and
+    skipped. Adding, removing and finding take O(log^2 n).
+
+    :param intervals: Any interval added later, for its bounds
+    """
+
+    def __init__(self, intervals: List[Tuple[int, int]]):
+        positions = sorted({bound for interval in intervals for bound in interval})
+        self.position_index = {position: i for i, position in enumerate(positions)}
+        self.size = 1
+        while self.size < len(positions):
+            self.size *= 2
+        self.starts_tree = [[] for _ in range(2 * self.size)]
+        self.spans_tree = [[] for _ in range(2 * self.size)]
+        # Per id: (order, version) while added
+        self.entries = {}
+        self.versions = itertools.count()
+
+    def add(self, interval_id: int, start: int, end: int, order: int) -> None:
+        """Add an interval, found before the intervals with a greater order."""
+        entry = (order, interval_id, next(self.versions))
+        self.entries[interval_id] = entry
+        if start >= end:
+            # Empty intervals intersect nothing
+            return
+
+        node = self.position_index[start] + self.size
+        while node:
+            heapq.heappush(self.starts_tree[node], entry)
+            node //= 2
+        # The positions after start, before end
+        for node in self.__nodes(
+            self.position_index[start] + 1, self.position_index[end] - 1
+        ):
+            heapq.heappush(self.spans_tree[node], entry)
+
+    def remove(self, interval_id: int) -> None:
+        """Remove an interval."""
+        del self.entries[interval_id]
+
+    def update(self, interval_id: int, start: int, end: int) -> None:
+        """Change the bounds of an interval, keeping its order."""
+        order = self.entries[interval_id][0]
+        self.remove(interval_id)
+        self.add(interval_id, start, end, order)
+
+    def find_first_intersecting(self, start: int, end: int) -> Optional[int]:
+        """Return the id of the first interval intersecting [start, end)."""
+        if start >= end:
+            return None
+
+        start_index = self.position_index[start]
+        heaps = itertools.chain(
+            # Intervals starting within [start, end)
+            (
+                self.starts_tree[node]
+                for node in self.__nodes(start_index, self.position_index[end] - 1)
+            ),
+            # Intervals starting before start, and ending after it
+            (self.spans_tree[node] for node in self.__path(start_index)),
+        )
+        first = None
+        for heap in heaps:
+            entry = self.__first_entry(heap)
+            if entry is not None and (first is None or entry < first):
+                first = entry
+        return first[1] if first else None
+
+    def __first_entry(self, heap: List[Tuple]) -> Optional[Tuple]:
+        while heap and self.entries.get(heap[0][1]) != heap[0]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def __nodes(self, first: int, last: int):
+        """Yield the nodes covering the positions first to last."""
+        first += self.size
+        last += self.size + 1
+        while first < last:
+            if first % 2:
+                yield first
+                first += 1
+            if last % 2:
+                last -= 1
+                yield last
+            first //= 2
+            last //= 2
+
+    def __path(self, index: int):
+        """Yield the nodes covering a position, from its leaf to the root."""
+        node = index + self.size
+        while node:
+            yield node
+            node //= 2
@@ -1,20 +1,48 @@
 """Handles the original text and creates a new one according to changes requests."""
 
 import logging
+from typing import Iterator
 
 from presidio_anonymizer.entities import InvalidParamError
 
 
 class TextReplaceBuilder:
-    """Creates new text according to users request."""
+    """
+    Creates new text according to users request.
+
+    Replacements are expected from the end of the text to its start.
+    The output is kept as the untouched beginning of the text followed by a
+    list of segments (replacements and the text between them), which are
+    only joined when the output text is requested.
+    """
 
     def __init__(self, original_text: str):
         self.logger = logging.getLogger("presidio-anonymizer")
-        self.output_text = original_text
         self.original_text = original_text
         self.text_len = len(original_text)
         self.last_replacement_index = self.text_len
 
+        # The output is self._head[: self._head_end] followed by the segments,
+        # which are stored from last to first
+        self._head = original_text
+        self._head_end = self.text_len
+        self._segments = []
+        self._segments_len = 0
+
+    @property
+    def output_text(self) -> str:
+        """Return the text with all the replacements done so far."""
+        return "".join(self.get_output_segments())
+
+    def get_output_segments(self) -> Iterator[str]:
+        """
+        Return the parts of the output text by their order, without joining them.
+
+        Allows writing the output of a large text without creating it as one string.
+        """
+        yield self._head[: self._head_end]
+        yield from reversed(self._segments)
+
     def get_text_in_position(self, start: int, end: int) -> str:
         """
         Get part of the text inside the original text.
@@ -40,13 +68,23 @@ class TextReplaceBuilder:
         end_of_text_index = min(end, self.last_replacement_index)
         self.last_replacement_index = start
 
-        before_text = self.output_text[:start]
-        after_text = self.output_text[end_of_text_index:]
-        self.output_text = before_text + replacement_text + after_text
+        if start > self._head_end or end_of_text_index > self._head_end:
+            # Out of order replacement, the replaced position might be within
+            # previous replacements, so the output is joined
+            self._head = self.output_text
+            self._head_end = len(self._head)
+            self._segments = []
+            self._segments_len = 0
+
+        between_text = self._head[end_of_text_index : self._head_end]
+        self._head_end = min(start, len(self._head))
+        self._segments.append(between_text)
+        self._segments.append(replacement_text)
+        self._segments_len += len(between_text) + len(replacement_text)
 
         # The replace algorithm is replacing the text from end to start.
         # calculate and return the start point from the end.
-        return len(after_text) + len(replacement_text)
+        return self._segments_len
 
     def __validate_position_in_text(self, start: int, end: int):
         """Validate the start and end position match the text length."""
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 from presidio_anonymizer import AnonymizerEngine
@@ -163,3 +165,107 @@ def test_when_remove_intersections_conflict_selected_then_all_conflicts_handled(
 
     assert result.text == expected_result.text
     assert sorted(result.items) == sorted(expected_result.items)
+
+
+def test_when_results_of_same_type_intersect_then_merged_into_one():
+    engine = AnonymizerEngine()
+    analyzer_results = [
+        RecognizerResult("PERSON", 0, 5, 0.5),
+        RecognizerResult("PERSON", 10, 15, 0.6),
+        RecognizerResult("LOCATION", 20, 25, 0.6),
+        RecognizerResult("PERSON", 4, 11, 0.9),
+    ]
+
+    results = engine._remove_conflicts_and_get_text_manipulation_data(
+        analyzer_results, ConflictResolutionStrategy.MERGE_SIMILAR_OR_CONTAINED
+    )
+
+    assert [(r.entity_type, r.start, r.end, r.score) for r in results] == [
+        ("LOCATION", 20, 25, 0.6),
+        ("PERSON", 0, 15, 0.9),
+    ]
+
+
+def test_when_same_indices_then_last_result_with_highest_score_kept():
+    engine = AnonymizerEngine()
+    first = RecognizerResult("PERSON", 0, 5, 0.8)
+    last = RecognizerResult("NAME", 0, 5, 0.8)
+    analyzer_results = [
+        first,
+        RecognizerResult("LOCATION", 0, 5, 0.3),
+        last,
+        RecognizerResult("PHONE_NUMBER", 1, 3, 0.9),
+    ]
+
+    results = engine._remove_conflicts_and_get_text_manipulation_data(
+        analyzer_results, ConflictResolutionStrategy.MERGE_SIMILAR_OR_CONTAINED
+    )
+
+    assert len(results) == 1
+    assert results[0] is last
+
+
+def test_when_trimmed_result_intersects_next_result_then_trimmed_again():
+    engine = AnonymizerEngine()
+    analyzer_results = [
+        RecognizerResult("PERSON", 0, 10, 0.9),
+        RecognizerResult("LOCATION", 5, 20, 0.5),
+        RecognizerResult("PHONE_NUMBER", 8, 25, 0.7),
+    ]
+
+    results = engine._remove_conflicts_and_get_text_manipulation_data(
+        analyzer_results, ConflictResolutionStrategy.REMOVE_INTERSECTIONS
+    )
+
+    assert [(r.entity_type, r.start, r.end) for r in results] == [
+        ("PERSON", 0, 10),
+        ("PHONE_NUMBER", 10, 25),
+    ]
+
+
+def test_when_many_results_then_resolved_in_linear_time():
+    engine = AnonymizerEngine()
+    analyzer_results = [
+        RecognizerResult("PERSON" if i % 2 else "LOCATION", i * 10, i * 10 + 12, 0.5)
+        for i in range(10000)
+    ]
+
+    start = time.perf_counter()
+    results = engine._remove_conflicts_and_get_text_manipulation_data(
+        analyzer_results, ConflictResolutionStrategy.REMOVE_INTERSECTIONS
+    )
+    assert time.perf_counter() - start < 1
+    assert len(results) == 10000
+
+
+def test_when_results_merged_then_into_first_later_intersecting_result():
+    engine = AnonymizerEngine()
+    address = RecognizerResult("ADDRESS", 4, 12, 0.5)
+    analyzer_results = [
+        RecognizerResult("ADDRESS", 10, 15, 0.9),
+        RecognizerResult("ADDRESS", 0, 5, 0.6),
+        address,
+    ]
+
+    results = engine._remove_conflicts_and_get_text_manipulation_data(
+        analyzer_results, ConflictResolutionStrategy.MERGE_SIMILAR_OR_CONTAINED
+    )
+
+    assert results == [address]
+    assert (address.start, address.end, address.score) == (0, 15, 0.9)
+
+
+def test_when_long_chain_of_same_type_results_then_merged_in_linear_time():
+    engine = AnonymizerEngine()
+    # Tokens of a long address, each intersecting only the whole address
+    address = RecognizerResult("ADDRESS", 0, 20000, 0.5)
+    analyzer_results = [
+        RecognizerResult("ADDRESS", i * 2, i * 2 + 2, 0.5) for i in range(10000)
+    ] + [address]
+
+    start = time.perf_counter()
+    results = engine._remove_conflicts_and_get_text_manipulation_data(
+        analyzer_results, ConflictResolutionStrategy.MERGE_SIMILAR_OR_CONTAINED
+    )
+    assert time.perf_counter() - start < 1
+    assert results == [address]
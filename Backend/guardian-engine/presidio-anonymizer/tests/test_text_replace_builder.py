@@ -62,3 +62,27 @@ def test_given_text_and_bad_indices_then_we_get_fail(original_text, start, end):
     )
     with pytest.raises(InvalidParamError, match=err_msg):
         text_replace_builder.get_text_in_position(start, end)
+
+
+@pytest.mark.parametrize(
+    # fmt: off
+    "replacements,expected,expected_end_texts",
+    [
+        ([("<B>", 6, 11), ("<A>", 0, 5)], "<A> <B>", [3, 7]),
+        # overlapping replacements
+        ([("<B>", 4, 11), ("<A>", 0, 6)], "<A><B>", [3, 6]),
+        ([("<B>", 6, 11), ("", 5, 6), ("<A>", 0, 5)], "<A><B>", [3, 3, 6]),
+    ],
+    # fmt: on
+)
+def test_given_multiple_replacements_then_output_text_has_all_of_them(
+    replacements, expected, expected_end_texts
+):
+    text_replace_builder = TextReplaceBuilder("hello world")
+    end_texts = [
+        text_replace_builder.replace_text_get_insertion_index(*replacement)
+        for replacement in replacements
+    ]
+    assert text_replace_builder.output_text == expected
+    assert "".join(text_replace_builder.get_output_segments()) == expected
+    assert end_texts == expected_end_texts